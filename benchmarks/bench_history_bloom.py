@@ -0,0 +1,122 @@
+"""
+历史去重存储基准
+在 N 条历史记录（默认 100 万）下对比启动耗时、内存占用和查询吞吐：
+    json           全量加载 history.json
+    sqlite         按需查询数据库
+    sqlite+bloom   先查布隆过滤器，可能命中时才查数据库
+
+用法:
+    python benchmarks/bench_history_bloom.py               # 100 万条
+    python benchmarks/bench_history_bloom.py 200000        # 指定条数
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from dedup.bloom import BloomFilteredStore
+from dedup.history_store import JSONHistoryStore, SQLiteHistoryStore
+
+DEFAULT_ENTRIES = 1_000_000
+LOOKUPS = 20_000
+FP_RATE = 0.01
+
+
+def make_records(n: int) -> list[dict]:
+    """生成 n 条形如 NewsItem.unique_id 的记录（16 位十六进制）"""
+    rng = random.Random(42)
+    today = datetime.now()
+    sources = ["github", "hackernews", "producthunt", "devto"]
+    return [
+        {
+            "unique_id": f"{rng.getrandbits(64):016x}",
+            "date": (today - timedelta(days=i % 365)).strftime("%Y-%m-%d"),
+            "title": f"Item {i}",
+            "source": sources[i % 4],
+        }
+        for i in range(n)
+    ]
+
+
+def measure(fn):
+    """返回 (结果, 耗时秒, 峰值内存 MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def bench_lookups(store, ids: list[str]) -> float:
+    """逐条查询吞吐（次/秒）"""
+    start = time.perf_counter()
+    for uid in ids:
+        store.contains(uid)
+    return len(ids) / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    workdir = Path(tempfile.mkdtemp(prefix="bench_history_"))
+    json_path = workdir / "history.json"
+    db_path = workdir / "history.db"
+
+    print(f"生成 {n} 条记录 -> {workdir}")
+    records = make_records(n)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": 1,
+            "last_updated": None,
+            "sent_items": {r["unique_id"]: {k: r[k] for k in ("date", "title", "source")} for r in records}
+        }, f)
+    sqlite_store = SQLiteHistoryStore(db_path)
+    sqlite_store.add_many(records)
+    sqlite_store.save()
+    sqlite_store.close()
+
+    # 首次构建过滤器（之后的运行直接读取 .bloom 文件）
+    start = time.perf_counter()
+    BloomFilteredStore(SQLiteHistoryStore(db_path), FP_RATE).save()
+    build_s = time.perf_counter() - start
+
+    # 每次运行的候选大多是新条目，混入少量已发送的
+    rng = random.Random(7)
+    misses = [f"{rng.getrandbits(64):016x}" for _ in range(LOOKUPS)]
+    hits = [r["unique_id"] for r in rng.sample(records, LOOKUPS // 10)]
+    lookups = misses + hits
+    del records
+
+    print(f"布隆过滤器首次构建: {build_s:.2f}s（之后从文件加载）\n")
+    print(f"{'存储':<14} {'启动 s':>8} {'启动内存 MB':>12} {'查询 次/s':>12}")
+
+    backends = {
+        "json": lambda: JSONHistoryStore(json_path),
+        "sqlite": lambda: SQLiteHistoryStore(db_path),
+        "sqlite+bloom": lambda: BloomFilteredStore(SQLiteHistoryStore(db_path), FP_RATE),
+    }
+    for name, factory in backends.items():
+        store, load_s, load_mb = measure(factory)
+        rate = bench_lookups(store, lookups)
+        print(f"{name:<14} {load_s:>8.2f} {load_mb:>12.1f} {rate:>12.0f}")
+
+        if isinstance(store, BloomFilteredStore):
+            false_positives = sum(uid in store.bloom for uid in misses)
+            print(
+                f"\n过滤器: {store.bloom.nbytes / 1024 / 1024:.2f} MB，k={store.bloom.num_hashes}，"
+                f"实测误判率 {false_positives / len(misses):.4f}（目标 {FP_RATE}）"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
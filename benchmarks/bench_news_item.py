@@ -0,0 +1,123 @@
+"""
+NewsItem 表示基准
+对比旧版 dataclass（每次访问 unique_id 都重新规范化 URL 并计算 md5）与当前 __slots__ 实现：
+    构建    创建 N 条（默认 10 万）条目的耗时和内存
+    哈希    放入 set（__hash__ 依赖 unique_id）
+    去重    MemoryDedup 过滤（含重复 URL 变体）
+
+用法:
+    python benchmarks/bench_news_item.py             # 10 万条
+    python benchmarks/bench_news_item.py 20000       # 指定条数
+"""
+
+import hashlib
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from core.url_canonical import canonicalize_url
+from dedup.memory import MemoryDedup
+from models import NewsItem, SourceType
+
+DEFAULT_ITEMS = 100_000
+
+
+@dataclass
+class LegacyNewsItem:
+    """旧版 NewsItem（仅保留与基准相关的部分）"""
+    source: SourceType
+    title: str
+    url: str
+    description: str
+    description_cn: str = ""
+    image_url: Optional[str] = None
+    score: Optional[int] = None
+    comments: Optional[int] = None
+    author: Optional[str] = None
+    rank: Optional[int] = None
+    created_at: Optional[datetime] = None
+    readme_summary: Optional[str] = None
+    tech_stack: list[str] = field(default_factory=list)
+    recent_activity: Optional[str] = None
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def unique_id(self) -> str:
+        return hashlib.md5(canonicalize_url(self.url).encode()).hexdigest()[:16]
+
+    def __hash__(self):
+        return hash(self.unique_id)
+
+    def __eq__(self, other):
+        return self.unique_id == other.unique_id
+
+
+def make_rows(n: int) -> list[dict]:
+    """生成 n 条构造参数，约 10% 是已有 URL 的追踪参数变体"""
+    rng = random.Random(42)
+    sources = list(SourceType)
+    rows = []
+    for i in range(n):
+        if i and rng.random() < 0.1:
+            url = f"{rows[rng.randrange(i)]['url']}?utm_source=bench"
+        else:
+            url = f"https://example.com/{rng.getrandbits(48):012x}/post-{i}"
+        rows.append({
+            "source": sources[i % len(sources)],
+            "title": f"Benchmark item {i}",
+            "url": url,
+            "description": "A short description used for the benchmark " * 2,
+            "score": rng.randrange(1000),
+            "rank": i % 50 + 1,
+        })
+    return rows
+
+
+def measure(fn):
+    """返回 (结果, 耗时秒, 峰值内存 MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    rows = make_rows(n)
+    # 先预热规范化缓存，两边都只比较模型本身的开销
+    for row in rows:
+        canonicalize_url(row["url"])
+
+    print(f"{n} 条条目\n")
+    print(f"{'实现':<10} {'构建 s':>8} {'内存 MB':>9} {'set s':>8} {'去重 s':>8} {'保留':>8}")
+
+    for name, cls in (("dataclass", LegacyNewsItem), ("slots", NewsItem)):
+        items, build_s, build_mb = measure(lambda: [cls(**row) for row in rows])
+        set_s = timed(lambda: set(items))
+        # 再次放入 set（模拟同一批条目多次参与去重）
+        set_s += timed(lambda: set(items))
+
+        kept = []
+        dedup_s = timed(lambda: kept.extend(MemoryDedup().filter_duplicates(items)))
+        print(f"{name:<10} {build_s:>8.2f} {build_mb:>9.1f} {set_s:>8.2f} {dedup_s:>8.2f} {len(kept):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+GitHub Trending 解析微基准
+对比 lxml（预编译 XPath）与 BeautifulSoup(html.parser) 两条解析路径
+
+快照:
+    trending_daily_synthetic.html   合成页面（按 Trending 的结构生成，体积接近真实页面），只用于计时
+    trending_rows_real.html         按真实页面转录的条目，配有 .expected.json，用于校验选择器
+    trending_YYYYMMDD.html          --save 保存的真实页面
+
+用法:
+    python benchmarks/bench_trending_parser.py                 # 使用 benchmarks/snapshots/*.html
+    python benchmarks/bench_trending_parser.py page1.html ...  # 指定快照
+    python benchmarks/bench_trending_parser.py --save          # 抓取当前 Trending 页面保存为新快照
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sources.trending_parser import parse_trending_bs4, parse_trending_lxml
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent / "snapshots"
+LIMIT = 25
+ROUNDS = 20
+
+
+def save_snapshot() -> Path:
+    """抓取当前 Trending 页面保存为快照"""
+    from sources.github_trending import GitHubTrendingSource
+
+    source = GitHubTrendingSource()
+    html = source._fetch_page(source._build_url("", "daily"))
+    path = SNAPSHOT_DIR / f"trending_{datetime.now():%Y%m%d}.html"
+    path.write_text(html, encoding="utf-8")
+    return path
+
+
+def bench(fn, html: str) -> float:
+    """返回单次解析的最佳耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(html, LIMIT)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    args = sys.argv[1:]
+    if args == ["--save"]:
+        print(f"已保存快照: {save_snapshot()}")
+        return
+
+    paths = [Path(p) for p in args] or sorted(SNAPSHOT_DIR.glob("*.html"))
+    if not paths:
+        print(f"没有快照，请先运行 --save 或把页面保存到 {SNAPSHOT_DIR}")
+        return
+
+    print(f"{'快照':<32} {'大小':>8} {'条目':>4} {'bs4 ms':>8} {'lxml ms':>8} {'加速':>6}")
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+
+        # 两条路径的输出必须一致（有 .expected.json 时还要与之一致），否则基准没有意义
+        expected_path = path.with_suffix(".expected.json")
+        if expected_path.exists():
+            expected = json.loads(expected_path.read_text(encoding="utf-8"))[:LIMIT]
+        else:
+            expected = parse_trending_bs4(html, LIMIT)
+        mismatched = [
+            name for name, fn in (("bs4", parse_trending_bs4), ("lxml", parse_trending_lxml))
+            if fn(html, LIMIT) != expected
+        ]
+        if mismatched:
+            print(f"{path.name}: {'/'.join(mismatched)} 解析结果与预期不一致！")
+            continue
+
+        bs4_ms = bench(parse_trending_bs4, html)
+        lxml_ms = bench(parse_trending_lxml, html)
+        print(
+            f"{path.name:<32} {len(html) // 1024:>6}KB {len(expected):>4} "
+            f"{bs4_ms:>8.2f} {lxml_ms:>8.2f} {bs4_ms / lxml_ms:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ AI 模块
 """
 
 from .llm_client import LLMClient
+from .model_health import ModelHealthTracker
 from .github_profile import GitHubProfileFetcher
 from .summarizer import AISummarizer
 
-__all__ = ["LLMClient", "GitHubProfileFetcher", "AISummarizer"]
+__all__ = ["LLMClient", "ModelHealthTracker", "GitHubProfileFetcher", "AISummarizer"]
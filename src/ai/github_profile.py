@@ -3,7 +3,6 @@ GitHub 用户偏好获取
 获取用户的 Star、仓库、关注等数据用于个性化推荐
 """
 
-import requests
 from typing import Optional
 import os
 import sys
@@ -11,6 +10,8 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import UserProfile
+from core.http_cache import conditional_get
+from core.rate_limit import Priority
 
 
 class GitHubProfileFetcher:
@@ -64,7 +65,7 @@ class GitHubProfileFetcher:
         params = {"per_page": min(limit, 100), "sort": "updated"}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = conditional_get(url, headers=self.headers, params=params, timeout=15, priority=Priority.CRITICAL)
             response.raise_for_status()
             repos = response.json()
 
@@ -89,7 +90,7 @@ class GitHubProfileFetcher:
         params = {"per_page": min(limit, 100), "sort": "updated", "type": "owner"}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = conditional_get(url, headers=self.headers, params=params, timeout=15, priority=Priority.CRITICAL)
             response.raise_for_status()
             repos = response.json()
 
@@ -115,7 +116,7 @@ class GitHubProfileFetcher:
         params = {"per_page": min(limit, 100)}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = conditional_get(url, headers=self.headers, params=params, timeout=15, priority=Priority.CRITICAL)
             response.raise_for_status()
             users = response.json()
 
@@ -130,7 +131,7 @@ class GitHubProfileFetcher:
         params = {"per_page": min(limit, 100)}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = conditional_get(url, headers=self.headers, params=params, timeout=15, priority=Priority.CRITICAL)
             response.raise_for_status()
             events = response.json()
 
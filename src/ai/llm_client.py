@@ -1,14 +1,124 @@
 """
 LLM API 客户端
-支持多模型自动重试和故障转移
+支持多模型自动重试和故障转移（按模型健康记录排序和退避，可选对冲请求和流式响应），
+相同请求的响应跨运行缓存
 """
 
+import hashlib
 import json
+import math
+import re
+import socket
+import threading
 import time
 import requests
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Optional
 import os
 
+from core.http import http
+from core.disk_cache import DiskCache, DEFAULT_CACHE_DIR
+from ai.model_health import ModelHealthTracker, get_model_health, parse_retry_after, save_model_health
+from ai.stream_json import IncrementalSummaryParser
+
+
+# 响应缓存：手动重跑、模板调整、邮件失败后重试时 prompt 不变，直接复用响应
+CACHE_TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_HOURS", "24")) * 3600
+CACHE_MAX_ENTRIES = 200
+CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+_cache: Optional[DiskCache] = None
+
+
+class LLMRequestError(Exception):
+    """单次模型请求失败"""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        timeout: bool = False
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.timeout = timeout
+
+
+class PartialContent(str):
+    """流中断时由已完整解析的部分拼成的响应（不写入缓存）"""
+
+
+class _Attempt:
+    """一次对冲请求的句柄：保存响应对象，放弃该请求时关闭连接"""
+
+    def __init__(self):
+        self.response: Optional[requests.Response] = None
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def attach(self, response: requests.Response) -> bool:
+        """记录响应对象，已取消时返回 False"""
+        with self._lock:
+            self.response = response
+            return not self.cancelled
+
+    def cancel(self):
+        """取消：关闭连接，正在读取响应体的线程随即出错退出，服务端也随之停止生成"""
+        with self._lock:
+            self.cancelled = True
+            response = self.response
+        if response is None:
+            return
+        # 读取线程持有缓冲区的锁，直接 close() 会等到它读完；先 shutdown 套接字打断阻塞的 recv
+        try:
+            with socket.fromfd(response.raw.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, ValueError):
+            pass
+        response.close()
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """获取全局 LLM 响应缓存（ENABLE_LLM_CACHE=false 时返回 None）"""
+    global _cache
+    if os.environ.get("ENABLE_LLM_CACHE", "true").lower() != "true":
+        return None
+    if _cache is None:
+        _cache = DiskCache(
+            DEFAULT_CACHE_DIR / "llm_responses.json",
+            ttl_seconds=CACHE_TTL_SECONDS,
+            max_entries=CACHE_MAX_ENTRIES,
+            max_bytes=CACHE_MAX_BYTES
+        )
+    return _cache
+
+
+def save_llm_cache():
+    """保存 LLM 响应缓存和模型健康记录到磁盘"""
+    save_model_health()
+    if _cache is not None:
+        _cache.save()
+        stats = _cache.get_stats()
+        print(f"LLM 缓存: 命中 {stats['hits']} / 未命中 {stats['misses']}，共 {stats['entries']} 条")
+
+
+def normalize_prompt(text: str) -> str:
+    """规范化 prompt：统一换行，去掉行尾空白和多余空行（不影响模型理解的差异不改变缓存键）"""
+    lines = [line.rstrip() for line in (text or "").replace("\r\n", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _cache_key(models: list[str], system_prompt: Optional[str], prompt: str, temperature: float, max_tokens: int) -> str:
+    """缓存键：模型列表 + 系统提示 + 规范化 prompt 的哈希 + 采样参数"""
+    prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        [models, normalize_prompt(system_prompt or ""), prompt_hash, temperature, max_tokens],
+        ensure_ascii=False
+    )
+    return f"chat:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]}"
+
 
 class LLMClient:
     """LLM API 客户端 - 支持多模型重试"""
@@ -26,7 +136,23 @@ class LLMClient:
 
     # 重试配置
     MAX_RETRIES = 30
-    RETRY_DELAY = 30  # 秒
+    RETRY_DELAY = 30  # 秒，单个模型的退避上限
+
+    DEFAULT_MAX_TOKENS = 4096
+    REQUEST_TIMEOUT = 120  # 秒（流式响应为总时长上限）
+    CONNECT_TIMEOUT = 10   # 秒
+    STREAM_STALL_TIMEOUT = 30  # 秒，流式响应超过该时间没有新数据视为卡住
+
+    # Prompt token 预算（各模型单独配置，未列出的使用默认值）
+    DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+    PROMPT_TOKEN_BUDGETS: dict[str, int] = {}
+
+    # 对冲请求配置
+    HEDGE_PERCENTILE = 90       # 首选模型超过该延迟分位数仍无响应时发出对冲请求
+    HEDGE_DEFAULT_DELAY = 45    # 延迟样本不足时的等待时间（秒）
+    HEDGE_MIN_DELAY = 5         # 秒
+    HEDGE_MIN_SAMPLES = 5
+    MAX_IN_FLIGHT = 2           # 同时在途的请求数上限
 
     def __init__(
         self,
@@ -34,7 +160,13 @@ class LLMClient:
         api_url: Optional[str] = None,
         models: Optional[list[str]] = None,
         max_retries: int = MAX_RETRIES,
-        retry_delay: int = RETRY_DELAY
+        retry_delay: int = RETRY_DELAY,
+        bypass_cache: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        health: Optional[ModelHealthTracker] = None,
+        stream: Optional[bool] = None
     ):
         """
         初始化 LLM 客户端
@@ -44,24 +176,67 @@ class LLMClient:
             api_url: API URL
             models: 模型优先级列表
             max_retries: 最大重试次数
-            retry_delay: 重试间隔（秒）
+            retry_delay: 单个模型失败后的退避上限（秒）
+            bypass_cache: 不读取缓存（仍写入新响应），默认取 LLM_CACHE_BYPASS
+            hedge: 是否启用对冲请求，默认取 LLM_HEDGE
+            hedge_percentile: 对冲等待的延迟分位数，默认取 LLM_HEDGE_PERCENTILE
+            max_in_flight: 对冲时同时在途的请求数上限，默认取 LLM_HEDGE_MAX_IN_FLIGHT
+            health: 模型健康记录，默认使用全局记录
+            stream: 是否使用流式响应（SSE），默认取 LLM_STREAM
         """
         self.api_key = api_key or os.environ.get("LLM_API_KEY")
         self.api_url = api_url or os.environ.get("LLM_API_URL", self.DEFAULT_API_URL)
         self.models = models or self.MODEL_PRIORITY
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.health = health or get_model_health()
+        self.health.backoff_max = retry_delay
+
+        if stream is None:
+            stream = os.environ.get("LLM_STREAM", "false").lower() == "true"
+        self.stream = stream
+        self.stream_stall_timeout = float(os.environ.get("LLM_STREAM_STALL_TIMEOUT", self.STREAM_STALL_TIMEOUT))
+
+        # LLM_PROMPT_TOKEN_BUDGET: 默认预算；LLM_PROMPT_TOKEN_BUDGETS: "模型=预算,..." 按模型覆盖
+        self.default_prompt_budget = int(
+            os.environ.get("LLM_PROMPT_TOKEN_BUDGET", self.DEFAULT_PROMPT_TOKEN_BUDGET)
+        )
+        self.prompt_budgets = dict(self.PROMPT_TOKEN_BUDGETS)
+        for entry in os.environ.get("LLM_PROMPT_TOKEN_BUDGETS", "").split(","):
+            model, _, value = entry.partition("=")
+            if model.strip() and value.strip().isdigit():
+                self.prompt_budgets[model.strip()] = int(value)
+        if bypass_cache is None:
+            bypass_cache = os.environ.get("LLM_CACHE_BYPASS", "false").lower() == "true"
+        self.bypass_cache = bypass_cache
+
+        if hedge is None:
+            hedge = os.environ.get("LLM_HEDGE", "false").lower() == "true"
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile or float(
+            os.environ.get("LLM_HEDGE_PERCENTILE", self.HEDGE_PERCENTILE)
+        )
+        self.max_in_flight = max(1, max_in_flight or int(
+            os.environ.get("LLM_HEDGE_MAX_IN_FLIGHT", self.MAX_IN_FLIGHT)
+        ))
 
         if not self.api_key:
             raise ValueError("LLM_API_KEY 未设置")
 
+    def prompt_token_budget(self) -> int:
+        """本次可能使用的模型中最小的 prompt token 预算（被跳过的模型只作兜底，不计）"""
+        models = [m for m in self.models if not self.health.is_skipped(m)] or self.models
+        return min(self.prompt_budgets.get(model, self.default_prompt_budget) for model in models)
+
     def chat(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4096,
-        verbose: bool = True
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        verbose: bool = True,
+        use_cache: bool = True,
+        on_recommendation: Optional[Callable[[dict], None]] = None
     ) -> str:
         """
         发送聊天请求（带多模型重试）
@@ -72,10 +247,20 @@ class LLMClient:
             temperature: 温度参数
             max_tokens: 最大 token 数
             verbose: 是否打印详细日志
+            use_cache: 是否使用响应缓存
+            on_recommendation: 流式响应中每解析出一条完整推荐时调用（对冲模式下不调用，避免重复）
 
         Returns:
-            模型响应文本
+            模型响应文本（流中断但已有可用 summary 时为 PartialContent）
         """
+        cache = get_llm_cache() if use_cache else None
+        cache_key = _cache_key(self.models, system_prompt, prompt, temperature, max_tokens)
+        if cache is not None and not self.bypass_cache:
+            cached = cache.get(cache_key)
+            if cached:
+                print(f"  💾 使用缓存的 LLM 响应（{cached['model']}）")
+                return cached["content"]
+
         # 打印完整 Prompt（用于调试）
         if verbose:
             print("\n" + "=" * 70)
@@ -91,71 +276,318 @@ class LLMClient:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
+        payload = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if self.hedge:
+            model, content = self._chat_hedged(payload)
+        else:
+            model, content = self._chat_sequential(payload, on_recommendation)
+
+        if isinstance(content, PartialContent):
+            print(f"  ⚠️ {model} 流式响应中断，使用已解析的部分结果")
+        else:
+            print(f"  ✅ {model} 成功")
+        # 打印完整 LLM 响应
+        if verbose:
+            print("\n" + "=" * 70)
+            print("🎯 AI 思考过程 - LLM 完整响应")
+            print("=" * 70)
+            print(content)
+            print("=" * 70 + "\n")
+        if cache is not None and not isinstance(content, PartialContent):
+            cache.set(cache_key, {"model": model, "content": content})
+        return content
+
+    def _request(
+        self,
+        model: str,
+        payload: dict,
+        on_recommendation: Optional[Callable[[dict], None]] = None,
+        attempt: Optional[_Attempt] = None
+    ) -> str:
+        """
+        向单个模型发送一次请求
+
+        Args:
+            model: 模型名
+            payload: 请求体（不含 model）
+            on_recommendation: 流式解析出一条推荐时调用
+            attempt: 对冲请求的句柄；给出时总是以 stream=True 发送（非流式模式只影响响应体的读取方式），
+                     以便放弃时关闭连接
+
+        Returns:
+            响应文本
+
+        Raises:
+            LLMRequestError: 请求失败或响应为空
+        """
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        body = {"model": model, **payload}
+        if self.stream:
+            body["stream"] = True
+            # 读超时作用于每次读取，即流的停顿时间；总时长在读取过程中检查
+            timeout = (self.CONNECT_TIMEOUT, self.stream_stall_timeout)
+        else:
+            timeout = self.REQUEST_TIMEOUT
+
+        start = time.monotonic()
+        try:
+            response = http.post(
+                self.api_url,
+                headers=headers,
+                json=body,
+                timeout=timeout,
+                stream=self.stream or attempt is not None
+            )
+        except requests.exceptions.Timeout:
+            self.health.record_failure(model, timeout=True)
+            raise LLMRequestError("超时", timeout=True)
+        except requests.exceptions.RequestException as e:
+            self.health.record_failure(model)
+            raise LLMRequestError(f"网络错误: {e}")
+
+        if attempt is not None and not attempt.attach(response):
+            response.close()
+            raise LLMRequestError("已取消")
+
+        if response.status_code == 200 and self.stream:
+            return self._read_stream(model, response, start, on_recommendation, attempt)
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            except Exception as e:
+                if attempt is not None and attempt.cancelled:
+                    raise LLMRequestError("已取消")
+                content = ""
+                error_msg = f"响应解析失败: {e}"
+            else:
+                error_msg = "响应为空"
+            if content:
+                self.health.record_success(model, time.monotonic() - start)
+                return content
+            self.health.record_failure(model, status=response.status_code)
+            raise LLMRequestError(error_msg, status=response.status_code)
+
+        # 记录错误
+        error_msg = f"HTTP {response.status_code}"
+        try:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", error_msg)
+        except:
+            pass
+        if attempt is not None and attempt.cancelled:
+            raise LLMRequestError("已取消")
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        self.health.record_failure(model, status=response.status_code, retry_after=retry_after)
+        raise LLMRequestError(error_msg, status=response.status_code, retry_after=retry_after)
 
+    def _read_stream(
+        self,
+        model: str,
+        response: requests.Response,
+        start: float,
+        on_recommendation: Optional[Callable[[dict], None]] = None,
+        attempt: Optional[_Attempt] = None
+    ) -> str:
+        """
+        读取 SSE 流式响应，边读边增量解析 JSON（attempt 被取消时连接已关闭，直接报错退出）
+
+        流停顿超过 stream_stall_timeout 或总时长超过 REQUEST_TIMEOUT 时中断；
+        根对象已闭合时返回其规范 JSON；根对象未闭合（中断，或被 max_tokens 截断后正常结束）
+        但已经解析出 summary 时，返回由已完整解析部分组成、带 "partial": true 的 PartialContent；
+        不是 JSON 的响应原样返回
+        """
+        parser = IncrementalSummaryParser(on_recommendation)
+        parts = []
+        try:
+            for line in response.iter_lines():
+                if time.monotonic() - start > self.REQUEST_TIMEOUT:
+                    raise TimeoutError(f"超过总时长 {self.REQUEST_TIMEOUT} 秒")
+                # SSE：只关心 data 行，注释和 event 行忽略
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                if chunk.get("error"):
+                    error = chunk["error"]
+                    raise LLMRequestError(error.get("message", str(error)) if isinstance(error, dict) else str(error))
+                choices = chunk.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content") or ""
+                if delta:
+                    parts.append(delta)
+                    parser.feed(delta)
+        except Exception as e:
+            if attempt is not None and attempt.cancelled:
+                raise LLMRequestError("已取消")
+            if not isinstance(e, (requests.exceptions.RequestException, TimeoutError, LLMRequestError)):
+                raise
+            parsed = self._parsed_stream(parser)
+            if parsed is not None:
+                self.health.record_success(model, time.monotonic() - start)
+                return parsed
+            timeout = not isinstance(e, LLMRequestError)
+            self.health.record_failure(model, timeout=timeout)
+            raise LLMRequestError(f"流式响应中断: {e}", timeout=timeout)
+        finally:
+            response.close()
+        # 取消时 shutdown 套接字，流会像正常结束一样读到 EOF，不能算作成功
+        if attempt is not None and attempt.cancelled:
+            raise LLMRequestError("已取消")
+
+        content = "".join(parts)
+        if not content:
+            self.health.record_failure(model, status=response.status_code)
+            raise LLMRequestError("响应为空", status=response.status_code)
+        self.health.record_success(model, time.monotonic() - start)
+        parsed = self._parsed_stream(parser)
+        return content if parsed is None else parsed
+
+    @staticmethod
+    def _parsed_stream(parser: IncrementalSummaryParser) -> Optional[str]:
+        """
+        增量解析的结果：根对象已闭合时为规范 JSON（chat_json 不必再用正则提取），
+        只解析出部分时为带 "partial": true 的 PartialContent，什么都没解析出时为 None
+        """
+        if parser.done and parser.result:
+            return json.dumps(parser.result, ensure_ascii=False)
+        partial = parser.partial()
+        if partial:
+            return PartialContent(json.dumps({**partial, "partial": True}, ensure_ascii=False))
+        return None
+
+    def _wait_for_model(self, exclude: frozenset = frozenset()) -> Optional[str]:
+        """选出下一个模型，所有候选都在退避中时等待最早恢复的那个"""
+        model, wait_seconds = self.health.next_model(self.models, exclude)
+        if model and wait_seconds > 0:
+            print(f"  ⏳ {model} 退避中，等待 {wait_seconds:.1f} 秒...")
+            time.sleep(wait_seconds)
+        return model
+
+    def _announce_skipped(self):
+        """打印本次跳过的模型"""
+        skipped = self.health.skipped(self.models)
+        if skipped:
+            print(
+                f"  ⏭️ 最近 {self.health.skip_after_failed_runs} 次运行均失败的模型排到最后"
+                f"（其余模型都失败时才尝试）: {', '.join(skipped)}"
+            )
+
+    def _chat_sequential(
+        self,
+        payload: dict,
+        on_recommendation: Optional[Callable[[dict], None]] = None
+    ) -> tuple[str, str]:
+        """按健康记录逐个尝试模型，失败的模型单独退避；返回 (模型, 响应文本)"""
+        self._announce_skipped()
         total_attempts = 0
-        model_index = 0
 
         while total_attempts < self.max_retries:
-            current_model = self.models[model_index % len(self.models)]
+            current_model = self._wait_for_model()
             total_attempts += 1
 
             print(f"  🤖 尝试 {total_attempts}/{self.max_retries}: {current_model}")
 
             try:
-                response = requests.post(
-                    self.api_url,
-                    headers=headers,
-                    json={
-                        "model": current_model,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": max_tokens
-                    },
-                    timeout=120
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    if content:
-                        print(f"  ✅ {current_model} 成功")
-                        # 打印完整 LLM 响应
-                        if verbose:
-                            print("\n" + "=" * 70)
-                            print("🎯 AI 思考过程 - LLM 完整响应")
-                            print("=" * 70)
-                            print(content)
-                            print("=" * 70 + "\n")
-                        return content
-
-                # 记录错误
-                error_msg = f"HTTP {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", error_msg)
-                except:
-                    pass
-
-                print(f"  ⚠️ {current_model} 失败: {error_msg}")
-
-            except requests.exceptions.Timeout:
-                print(f"  ⚠️ {current_model} 超时")
-            except requests.exceptions.RequestException as e:
-                print(f"  ⚠️ {current_model} 网络错误: {e}")
+                return current_model, self._request(current_model, payload, on_recommendation)
+            except LLMRequestError as e:
+                print(f"  ⚠️ {current_model} 失败: {e}")
             except Exception as e:
+                self.health.record_failure(current_model)
                 print(f"  ⚠️ {current_model} 异常: {e}")
 
-            # 切换到下一个模型
-            model_index += 1
+        raise Exception(f"所有模型均失败，共尝试 {total_attempts} 次")
+
+    def hedge_delay(self, model: str) -> float:
+        """
+        对冲等待时间：该模型历史成功延迟的 hedge_percentile 分位数
+        （样本不足时用 HEDGE_DEFAULT_DELAY），限制在 [HEDGE_MIN_DELAY, REQUEST_TIMEOUT] 内
+        """
+        samples = sorted(self.health.latencies(model))
+        if len(samples) < self.HEDGE_MIN_SAMPLES:
+            delay = self.HEDGE_DEFAULT_DELAY
+        else:
+            rank = max(0, math.ceil(self.hedge_percentile / 100 * len(samples)) - 1)
+            delay = samples[rank]
+        return min(max(delay, self.HEDGE_MIN_DELAY), self.REQUEST_TIMEOUT)
+
+    def _chat_hedged(self, payload: dict) -> tuple[str, str]:
+        """
+        对冲请求：先请求首选模型，超过其延迟分位数仍无响应时并行请求下一个模型，
+        取最先返回的有效响应，其余请求关闭连接取消（还没收到响应头的请求无法关闭，
+        由请求超时兜底；请求在守护线程中执行，不会阻塞进程退出）
+
+        同时在途的请求数不超过 max_in_flight；对冲只使用当前不在退避中的模型，
+        全部失败且没有在途请求时等待最早恢复的模型
+        """
+        self._announce_skipped()
+        pending: dict[Future, tuple[str, _Attempt]] = {}
+        total_attempts = 0
+
+        def launch(model: str):
+            nonlocal total_attempts
+            total_attempts += 1
+            hedged = " (对冲)" if pending else ""
+            print(f"  🤖 尝试 {total_attempts}/{self.max_retries}: {model}{hedged}")
+            future, attempt = Future(), _Attempt()
+
+            def run():
+                future.set_running_or_notify_cancel()
+                try:
+                    future.set_result(self._request(model, payload, attempt=attempt))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            threading.Thread(target=run, name=f"llm-hedge-{total_attempts}", daemon=True).start()
+            pending[future] = (model, attempt)
+            return self.hedge_delay(model)
 
-            # 如果还有重试机会，等待后继续
-            if total_attempts < self.max_retries:
-                print(f"  ⏳ 等待 {self.retry_delay} 秒后重试...")
-                time.sleep(self.retry_delay)
+        def in_flight() -> frozenset:
+            return frozenset(model for model, _ in pending.values())
+
+        try:
+            delay = launch(self._wait_for_model())
+            while pending:
+                done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # 超过分位数仍无响应：再发一个请求
+                    if len(pending) < self.max_in_flight and total_attempts < self.max_retries:
+                        model, wait_seconds = self.health.next_model(self.models, in_flight())
+                        if model and wait_seconds <= 0:
+                            delay = launch(model)
+                    continue
+
+                for future in done:
+                    model, _ = pending.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        print(f"  ⚠️ {model} 失败: {e}")
+                        continue
+                    if pending:
+                        print(f"  ⏹️ 取消 {len(pending)} 个在途请求: {', '.join(in_flight())}")
+                    return model, content
+
+                if total_attempts >= self.max_retries:
+                    continue
+                if not pending:
+                    delay = launch(self._wait_for_model())
+        finally:
+            for _, attempt in pending.values():
+                attempt.cancel()
 
         raise Exception(f"所有模型均失败，共尝试 {total_attempts} 次")
 
@@ -163,7 +595,9 @@ class LLMClient:
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        use_cache: bool = True,
+        on_recommendation: Optional[Callable[[dict], None]] = None
     ) -> dict:
         """
         发送聊天请求并解析 JSON 响应
@@ -172,11 +606,15 @@ class LLMClient:
             prompt: 用户提示
             system_prompt: 系统提示
             temperature: 温度参数
+            use_cache: 是否使用响应缓存
+            on_recommendation: 流式响应中每解析出一条完整推荐时调用
 
         Returns:
             解析后的 JSON 字典
         """
-        response = self.chat(prompt, system_prompt, temperature)
+        response = self.chat(
+            prompt, system_prompt, temperature, use_cache=use_cache, on_recommendation=on_recommendation
+        )
 
         # 尝试提取 JSON
         try:
@@ -186,7 +624,6 @@ class LLMClient:
             pass
 
         # 尝试从 markdown 代码块中提取
-        import re
         json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
         if json_match:
             try:
@@ -202,6 +639,11 @@ class LLMClient:
             except json.JSONDecodeError:
                 pass
 
+        # 无法解析的响应不留在缓存里，下次重新请求
+        cache = get_llm_cache() if use_cache else None
+        if cache is not None:
+            cache.delete(_cache_key(self.models, system_prompt, prompt, temperature, self.DEFAULT_MAX_TOKENS))
+
         raise ValueError(f"无法解析 JSON 响应: {response[:500]}")
 
 
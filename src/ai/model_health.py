@@ -0,0 +1,299 @@
+"""
+LLM 模型健康记录
+按模型持久化最近成功率、延迟 EWMA、429/5xx/超时次数和 Retry-After，
+LLMClient 据此动态排序模型、按模型指数退避，并跳过最近多次运行都失败的模型
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.disk_cache import DEFAULT_CACHE_DIR
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelHealthTracker:
+    """各模型健康记录（JSON 持久化）"""
+
+    VERSION = 1
+
+    WINDOW = 20                 # 成功率统计的最近请求数
+    LATENCY_SAMPLES = 50        # 保留的最近成功延迟数（对冲等待时间用）
+    EWMA_ALPHA = 0.3
+
+    BACKOFF_BASE = 2            # 秒，连续失败 n 次后退避 base * 2^(n-1)，带随机抖动
+    MAX_RETRY_AFTER = 300       # 秒，Retry-After 超过该值按该值处理
+
+    SKIP_AFTER_FAILED_RUNS = 3  # 最近连续这么多次运行都失败的模型本次跳过
+    REPROBE_SECONDS = 3 * 24 * 3600   # 被跳过的模型距上次尝试超过该时间后重新尝试
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        skip_after_failed_runs: Optional[int] = None,
+        backoff_max: float = 30
+    ):
+        """
+        初始化
+
+        Args:
+            path: 记录文件路径，默认 data/cache/llm_health.json
+            skip_after_failed_runs: 连续失败多少次运行后跳过，默认取 LLM_SKIP_AFTER_FAILED_RUNS（0 表示不跳过）
+            backoff_max: 单个模型的退避上限（秒）
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / "llm_health.json"
+        if skip_after_failed_runs is None:
+            skip_after_failed_runs = int(
+                os.environ.get("LLM_SKIP_AFTER_FAILED_RUNS", self.SKIP_AFTER_FAILED_RUNS)
+            )
+        self.skip_after_failed_runs = skip_after_failed_runs
+        self.backoff_max = backoff_max
+
+        self._models: dict[str, dict] = self._load()
+        self._attempted: set[str] = set()     # 本次运行尝试过的模型
+        self._succeeded: set[str] = set()     # 本次运行成功过的模型
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> dict:
+        """加载记录文件"""
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return {}
+            return data.get("models", {})
+        except Exception as e:
+            print(f"加载模型健康记录失败: {e}")
+            return {}
+
+    def _record(self, model: str) -> dict:
+        """获取（不存在时创建）模型记录"""
+        record = self._models.get(model)
+        if record is None:
+            record = self._models[model] = {
+                "outcomes": [],              # 最近请求结果，1 成功 0 失败
+                "latency_ewma": None,        # 成功请求延迟的 EWMA（秒）
+                "latencies": [],             # 最近成功延迟（秒）
+                "count_429": 0,
+                "count_5xx": 0,
+                "count_timeout": 0,
+                "consecutive_failures": 0,
+                "available_at": 0,           # 退避 / Retry-After 结束时间
+                "failed_runs": 0,            # 连续失败的运行次数
+                "last_attempt": 0,
+            }
+        return record
+
+    def record_success(self, model: str, latency: float):
+        """记录一次成功请求"""
+        with self._lock:
+            record = self._record(model)
+            record["outcomes"] = (record["outcomes"] + [1])[-self.WINDOW:]
+            ewma = record["latency_ewma"]
+            record["latency_ewma"] = round(
+                latency if ewma is None else self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * ewma, 2
+            )
+            record["latencies"] = (record["latencies"] + [round(latency, 2)])[-self.LATENCY_SAMPLES:]
+            record["consecutive_failures"] = 0
+            record["available_at"] = 0
+            record["last_attempt"] = time.time()
+            self._attempted.add(model)
+            self._succeeded.add(model)
+            self._dirty = True
+
+    def record_failure(
+        self,
+        model: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        timeout: bool = False
+    ):
+        """
+        记录一次失败请求，并设置该模型的退避时间
+
+        Args:
+            model: 模型名
+            status: HTTP 状态码（网络错误时为 None）
+            retry_after: 服务端给出的 Retry-After（秒）
+            timeout: 是否超时
+        """
+        with self._lock:
+            record = self._record(model)
+            record["outcomes"] = (record["outcomes"] + [0])[-self.WINDOW:]
+            if status == 429:
+                record["count_429"] += 1
+            elif status is not None and status >= 500:
+                record["count_5xx"] += 1
+            if timeout:
+                record["count_timeout"] += 1
+            record["consecutive_failures"] += 1
+
+            # 指数退避 + 抖动（取 [一半, 全部] 之间的随机值，避免多个模型同时恢复）
+            backoff = min(self.backoff_max, self.BACKOFF_BASE * 2 ** (record["consecutive_failures"] - 1))
+            delay = random.uniform(backoff / 2, backoff)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.MAX_RETRY_AFTER))
+
+            now = time.time()
+            record["available_at"] = now + delay
+            record["last_attempt"] = now
+            self._attempted.add(model)
+            self._dirty = True
+
+    def success_rate(self, model: str) -> float:
+        """最近请求的成功率（拉普拉斯平滑，没有记录时为 0.5）"""
+        outcomes = self._models.get(model, {}).get("outcomes", [])
+        return (sum(outcomes) + 1) / (len(outcomes) + 2)
+
+    def latencies(self, model: str) -> list[float]:
+        """最近的成功延迟（秒）"""
+        return list(self._models.get(model, {}).get("latencies", []))
+
+    def is_skipped(self, model: str) -> bool:
+        """最近连续多次运行都失败，且距上次尝试不久"""
+        record = self._models.get(model)
+        if not record or self.skip_after_failed_runs <= 0:
+            return False
+        return (
+            record["failed_runs"] >= self.skip_after_failed_runs
+            and time.time() - record["last_attempt"] < self.REPROBE_SECONDS
+        )
+
+    def ordered(self, models: list[str]) -> list[str]:
+        """
+        按健康状况排序，被跳过的模型排在最后
+
+        排序依据：是否被跳过 > 成功率（按 0.2 分档，避免小波动打乱顺序）> 延迟 EWMA（按 15 秒分档）> 配置顺序；
+        被跳过的模型只在其余模型都在退避中（本次都已失败）时才会被 next_model 选中
+        """
+        with self._lock:
+            def key(item):
+                index, model = item
+                ewma = self._models.get(model, {}).get("latency_ewma") or 0
+                return (self.is_skipped(model), -int(self.success_rate(model) * 5), int(ewma // 15), index)
+
+            return [model for _, model in sorted(enumerate(models), key=key)]
+
+    def next_model(self, models: list[str], exclude: frozenset = frozenset()) -> tuple[Optional[str], float]:
+        """
+        选择下一个要尝试的模型
+
+        Args:
+            models: 配置的模型列表
+            exclude: 不选择的模型（如正在请求中的）
+
+        Returns:
+            (模型, 需要等待的秒数)；优先返回当前可用的最健康模型，
+            都在退避中时返回最早恢复的模型；没有可选模型时返回 (None, 0)
+        """
+        with self._lock:
+            now = time.time()
+            candidates = [m for m in self.ordered(models) if m not in exclude]
+            if not candidates:
+                return None, 0.0
+            for model in candidates:
+                if self._models.get(model, {}).get("available_at", 0) <= now:
+                    return model, 0.0
+            model = min(candidates, key=lambda m: self._models[m]["available_at"])
+            return model, self._models[model]["available_at"] - now
+
+    def skipped(self, models: list[str]) -> list[str]:
+        """本次被跳过（排到最后）的模型"""
+        with self._lock:
+            if all(self.is_skipped(m) for m in models):
+                return []
+            return [m for m in models if self.is_skipped(m)]
+
+    def finish_run(self):
+        """结束本次运行：尝试过但从未成功的模型连续失败运行数 +1，成功的清零"""
+        with self._lock:
+            for model in self._attempted:
+                record = self._record(model)
+                record["failed_runs"] = 0 if model in self._succeeded else record["failed_runs"] + 1
+            if self._attempted:
+                self._dirty = True
+            self._attempted.clear()
+            self._succeeded.clear()
+
+    def save(self):
+        """结束本次运行并保存到文件（无改动时跳过）"""
+        with self._lock:
+            self.finish_run()
+            if not self._dirty:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.VERSION, "models": self._models}, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                print(f"保存模型健康记录失败: {e}")
+
+    def report(self, models: Optional[list[str]] = None) -> list[str]:
+        """每个模型一行的健康摘要"""
+        lines = []
+        for model in models or list(self._models):
+            record = self._models.get(model)
+            if not record:
+                lines.append(f"{model}: 无记录")
+                continue
+            ewma = f"{record['latency_ewma']:.1f}s" if record["latency_ewma"] is not None else "-"
+            status = "跳过" if self.is_skipped(model) else "可用"
+            lines.append(
+                f"{model}: 成功率 {sum(record['outcomes'])}/{len(record['outcomes'])}，延迟 {ewma}，"
+                f"429×{record['count_429']} 5xx×{record['count_5xx']} 超时×{record['count_timeout']}，"
+                f"连续失败运行 {record['failed_runs']}，{status}"
+            )
+        return lines
+
+
+_tracker: Optional[ModelHealthTracker] = None
+
+
+def get_model_health() -> ModelHealthTracker:
+    """获取全局模型健康记录"""
+    global _tracker
+    if _tracker is None:
+        _tracker = ModelHealthTracker()
+    return _tracker
+
+
+def save_model_health():
+    """保存全局模型健康记录"""
+    if _tracker is not None:
+        _tracker.save()
+
+
+if __name__ == "__main__":
+    # 查看模型健康记录：python ai/model_health.py
+    tracker = ModelHealthTracker()
+    for line in tracker.report() or ["暂无记录"]:
+        print(line)
@@ -0,0 +1,149 @@
+"""
+增量 JSON 解析
+流式响应逐块送入，summary 字符串一结束就可用，recommendations 中的每个对象一闭合就回调，
+流中断时保留已经完整解析的部分
+"""
+
+import json
+from typing import Callable, Optional
+
+
+class IncrementalSummaryParser:
+    """
+    {"summary": "...", "recommendations": [{...}, ...]} 的增量解析器
+
+    只跟踪字符串、括号嵌套和顶层键，不做完整的 JSON 语法校验；
+    根对象之前的文字（如 ```json 代码块标记）会被忽略
+    """
+
+    def __init__(self, on_recommendation: Optional[Callable[[dict], None]] = None):
+        """
+        初始化
+
+        Args:
+            on_recommendation: 每解析出一条完整推荐时调用
+        """
+        self.on_recommendation = on_recommendation
+        self.summary: Optional[str] = None
+        self.recommendations: list[dict] = []
+        self.result: Optional[dict] = None      # 根对象完整闭合后的解析结果
+
+        self._text = ""                # 已送入的全部文本
+        self._root_start: Optional[int] = None
+        self._stack: list[str] = []    # 容器栈 "{" / "["
+        self._expect_key = False       # 当前对象中下一个字符串是否为键
+        self._root_key: Optional[str] = None
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._item_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        """根对象是否已经闭合"""
+        return self.result is not None
+
+    def feed(self, chunk: str):
+        """送入一段文本"""
+        if self.done or not chunk:
+            return
+
+        base = len(self._text)
+        self._text += chunk
+        text = self._text
+
+        for offset, ch in enumerate(chunk):
+            pos = base + offset
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string(text[self._string_start:pos + 1])
+                continue
+
+            if self._root_start is None:
+                if ch == "{":
+                    self._root_start = pos
+                    self._stack.append("{")
+                    self._expect_key = True
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch in "{[":
+                if ch == "{" and self._in_recommendations():
+                    self._item_start = pos
+                self._stack.append(ch)
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                self._stack.pop()
+                if ch == "}" and self._item_start is not None and self._in_recommendations():
+                    self._on_item(text[self._item_start:pos + 1])
+                    self._item_start = None
+                if not self._stack:
+                    self._on_root(text[self._root_start:pos + 1])
+                    break
+            elif ch == ",":
+                self._expect_key = self._stack[-1] == "{"
+            elif ch == ":":
+                self._expect_key = False
+
+    def _in_recommendations(self) -> bool:
+        """当前是否直接位于根对象的 recommendations 数组中"""
+        return self._stack == ["{", "["] and self._root_key == "recommendations"
+
+    def _on_string(self, literal: str):
+        """一个字符串结束"""
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError:
+            return
+        if len(self._stack) != 1:
+            return
+        if self._expect_key:
+            self._root_key = value
+        elif self._root_key == "summary":
+            self.summary = value
+
+    def _on_item(self, literal: str):
+        """recommendations 中的一个对象结束"""
+        try:
+            item = json.loads(literal)
+        except json.JSONDecodeError:
+            return
+        self.recommendations.append(item)
+        if self.on_recommendation:
+            self.on_recommendation(item)
+
+    def _on_root(self, literal: str):
+        """根对象结束"""
+        try:
+            self.result = json.loads(literal)
+        except json.JSONDecodeError:
+            self.result = self.partial() or {}
+
+    def partial(self) -> Optional[dict]:
+        """已解析的部分（还没有 summary 时返回 None）"""
+        if self.result is not None:
+            return self.result
+        if not self.summary:
+            return None
+        return {"summary": self.summary, "recommendations": list(self.recommendations)}
+
+
+if __name__ == "__main__":
+    # 测试：按 7 个字符一块送入
+    text = '```json\n{"summary": "今日 \\"AI\\" 热点 {很多}", "recommendations": [' \
+           '{"title": "A", "url": "https://a"}, {"title": "B [x]", "reason": "因为, 所以"}'
+    parser = IncrementalSummaryParser(on_recommendation=lambda r: print(f"推荐: {r}"))
+    for i in range(0, len(text), 7):
+        parser.feed(text[i:i + 7])
+    print(f"summary: {parser.summary}")
+    print(f"中断时的部分结果: {parser.partial()}")
+    parser.feed("]}\n```")
+    print(f"完整: {parser.done} {parser.result}")
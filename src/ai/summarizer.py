@@ -3,7 +3,9 @@ AI 智能总结生成器
 根据用户偏好 + 热度综合分析，生成个性化的技术日报总结
 """
 
+import hashlib
 import json
+from pathlib import Path
 from typing import Optional
 import sys
 import os
@@ -11,13 +13,28 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceResult, AISummary, UserProfile, SourceType
-from ai.llm_client import LLMClient
+from ai.llm_client import LLMClient, get_llm_cache
 from ai.github_profile import GitHubProfileFetcher
+from ai.tokens import estimate_tokens
+
+# prompt 模板和条目格式都在本文件中：源码改动后，缓存的总结全部失效
+_PROMPT_SOURCE_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
 
 
 class AISummarizer:
     """AI 智能总结生成器"""
 
+    MAX_ITEMS_PER_SOURCE = 15
+    MIN_ITEMS_PER_SOURCE = 3   # 压缩时每个数据源至少保留的条目数
+
+    # Prompt 压缩级别：超出 token 预算时依次收紧，最后一级仍超出则按排名移除条目
+    COMPACTION_LEVELS = [
+        {"desc_chars": 120, "readme_chars": 100, "tech_count": 5, "profile_repos": 8},
+        {"desc_chars": 120, "readme_chars": 60, "tech_count": 3, "profile_repos": 8},
+        {"desc_chars": 80, "readme_chars": 0, "tech_count": 3, "profile_repos": 5},
+        {"desc_chars": 60, "readme_chars": 0, "tech_count": 0, "profile_repos": 3},
+    ]
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
         """
         初始化
@@ -27,13 +44,64 @@ class AISummarizer:
         """
         self.llm_client = llm_client or LLMClient()
 
+    def fingerprint(self, results: list[SourceResult], username: Optional[str] = None) -> str:
+        """
+        总结指纹：参与生成 prompt 的条目字段 + 用户名 + prompt 模板 + 模型列表和 token 预算，
+        相同时可以直接复用上次的总结（用户偏好内容由 cached_summary 的 prompt 校验覆盖）
+
+        Args:
+            results: 各数据源的结果列表
+            username: 用户偏好对应的 GitHub 用户名（没有偏好数据时为 None）
+        """
+        rows = [
+            _PROMPT_SOURCE_HASH,
+            list(self.llm_client.models),
+            self.llm_client.prompt_token_budget(),
+            username,
+        ]
+        for result in results:
+            if not (result.success and result.items):
+                continue
+            rows.append(result.source.value)
+            rows.extend(
+                [
+                    item.unique_id, item.title, item.description_cn or item.description, item.score,
+                    item.extra.get("stars_today"), item.readme_summary, item.tech_stack,
+                ]
+                for item in result.items
+            )
+        payload = json.dumps(rows, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def cached_summary(self, fingerprint: str, prompt: Optional[str] = None) -> Optional[AISummary]:
+        """
+        读取缓存的总结（缓存关闭或 LLM_CACHE_BYPASS 时返回 None）
+
+        Args:
+            fingerprint: 总结指纹
+            prompt: 本次渲染出的 prompt；给出时还要求与生成缓存时的 prompt 一致（覆盖用户偏好内容的变化）
+        """
+        cache = get_llm_cache()
+        if cache is None or self.llm_client.bypass_cache:
+            return None
+        data = cache.get(f"summary:{fingerprint}")
+        if not data:
+            return None
+        if prompt is not None and data.get("prompt_hash") != self._prompt_hash(prompt):
+            return None
+        return AISummary.from_dict(data)
+
+    @staticmethod
+    def _prompt_hash(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+
     def generate_summary(
         self,
         results: list[SourceResult],
         user_profile: Optional[UserProfile] = None
     ) -> AISummary:
         """
-        生成智能总结
+        生成智能总结（条目与上次相同时直接复用缓存的总结）
 
         Args:
             results: 各数据源的结果列表
@@ -42,13 +110,32 @@ class AISummarizer:
         Returns:
             AISummary 对象
         """
-        # 构建 prompt
-        prompt = self._build_prompt(results, user_profile)
+        # 构建 prompt（按首选模型们中最小的 token 预算压缩）
+        prompt = self._build_prompt(results, user_profile, budget=self.llm_client.prompt_token_budget())
+
+        fingerprint = self.fingerprint(results, user_profile.username if user_profile else None)
+        cached = self.cached_summary(fingerprint, prompt)
+        if cached:
+            print("  💾 条目与上次相同，使用缓存的总结")
+            return cached
 
         # 调用 LLM
         try:
-            response = self.llm_client.chat_json(prompt, temperature=0.7)
-            return AISummary.from_dict(response)
+            response = self.llm_client.chat_json(
+                prompt,
+                temperature=0.7,
+                on_recommendation=lambda rec: print(f"  ✨ 推荐: {rec.get('title', '')}")
+            )
+            summary = AISummary.from_dict(response)
+            cache = get_llm_cache()
+            # 流式响应中断得到的部分结果不缓存，下次重新生成
+            if cache is not None and summary.summary and not response.get("partial"):
+                cache.set(f"summary:{fingerprint}", {
+                    "summary": summary.summary,
+                    "recommendations": summary.recommendations,
+                    "prompt_hash": self._prompt_hash(prompt),
+                })
+            return summary
         except Exception as e:
             print(f"AI 总结生成失败: {e}")
             # 返回默认总结
@@ -60,9 +147,84 @@ class AISummarizer:
     def _build_prompt(
         self,
         results: list[SourceResult],
-        user_profile: Optional[UserProfile] = None
+        user_profile: Optional[UserProfile] = None,
+        budget: Optional[int] = None
+    ) -> str:
+        """
+        构建 LLM Prompt，超出 token 预算时压缩
+
+        先按 COMPACTION_LEVELS 逐级截短描述、README 摘要、技术栈和用户仓库列表，
+        仍超出时按排名从低到高移除条目（每个数据源至少保留 MIN_ITEMS_PER_SOURCE 条）
+
+        Args:
+            results: 各数据源的结果列表
+            user_profile: 用户偏好数据（可选）
+            budget: prompt token 预算，None 表示不压缩
+        """
+        selection = {
+            i: result.items[:self.MAX_ITEMS_PER_SOURCE]
+            for i, result in enumerate(results)
+            if result.success and result.items
+        }
+
+        prompt = self._render_prompt(results, user_profile, selection, self.COMPACTION_LEVELS[0])
+        full_tokens = tokens = estimate_tokens(prompt)
+        if budget is None or tokens <= budget:
+            print(f"  📏 Prompt 约 {tokens} tokens" + (f"（预算 {budget}）" if budget else ""))
+            return prompt
+
+        level_index = 0
+        for level_index, level in enumerate(self.COMPACTION_LEVELS[1:], 1):
+            prompt = self._render_prompt(results, user_profile, selection, level)
+            tokens = estimate_tokens(prompt)
+            if tokens <= budget:
+                break
+
+        # 按排名移除条目
+        dropped = 0
+        level = self.COMPACTION_LEVELS[level_index]
+        for index, item in self._rank_items(selection):
+            if tokens <= budget:
+                break
+            if len(selection[index]) <= self.MIN_ITEMS_PER_SOURCE:
+                continue
+            selection[index] = [i for i in selection[index] if i is not item]
+            dropped += 1
+            prompt = self._render_prompt(results, user_profile, selection, level)
+            tokens = estimate_tokens(prompt)
+
+        print(
+            f"  📏 Prompt 压缩: 约 {full_tokens} → {tokens} tokens（预算 {budget}，"
+            f"级别 {level_index}，移除 {dropped} 条）"
+        )
+        if tokens > budget:
+            print(f"  ⚠️ 已压缩到最小仍超出预算 {tokens - budget} tokens")
+        return prompt
+
+    def _rank_items(self, selection: dict[int, list[NewsItem]]) -> list[tuple[int, NewsItem]]:
+        """
+        按价值从低到高排列条目：来源内热度占比（70%）+ 来源内原始排名（30%）
+
+        Returns:
+            [(结果下标, 条目)]
+        """
+        ranked = []
+        for index, items in selection.items():
+            max_score = max((item.score or 0 for item in items), default=0) or 1
+            for position, item in enumerate(items):
+                value = 0.7 * (item.score or 0) / max_score + 0.3 * (1 - position / len(items))
+                ranked.append((value, index, item))
+        ranked.sort(key=lambda x: x[0])
+        return [(index, item) for _, index, item in ranked]
+
+    def _render_prompt(
+        self,
+        results: list[SourceResult],
+        user_profile: Optional[UserProfile],
+        selection: dict[int, list[NewsItem]],
+        level: dict
     ) -> str:
-        """构建 LLM Prompt - 平衡个性化与热度"""
+        """按条目选择和压缩级别生成 prompt - 平衡个性化与热度"""
 
         # 用户偏好部分
         user_section = ""
@@ -78,20 +240,19 @@ class AISummarizer:
 - **自己的仓库数**: {len(user_profile.own_repos)}
 
 ### 用户自己的仓库（代表技术栈和专长）:
-{self._format_own_repos(user_profile.own_repos[:8])}
+{self._format_own_repos(user_profile.own_repos[:level["profile_repos"]])}
 
 ### 最近 Star 的仓库（代表兴趣方向）:
-{self._format_starred_repos(user_profile.starred_repos[:8])}
+{self._format_starred_repos(user_profile.starred_repos[:level["profile_repos"]])}
 
 ⚠️ **重要提示**: 用户背景仅作为参考之一。如果有非常火爆或具有重大影响力的项目/文章，即使与用户背景无关，也应该推荐！
 """
 
         # 资讯内容部分 - 包含热度信息
         content_sections = []
-        for result in results:
-            if result.success and result.items:
-                section = self._format_source_items_with_score(result)
-                content_sections.append(section)
+        for index, items in selection.items():
+            section = self._format_source_items_with_score(results[index], items, level)
+            content_sections.append(section)
 
         content_section = "\n\n".join(content_sections)
 
@@ -211,8 +372,23 @@ class AISummarizer:
 
         return "\n".join(lines)
 
-    def _format_source_items_with_score(self, result: SourceResult) -> str:
-        """格式化单个数据源的内容 - 包含热度分数"""
+    def _format_source_items_with_score(
+        self,
+        result: SourceResult,
+        items: Optional[list[NewsItem]] = None,
+        level: Optional[dict] = None
+    ) -> str:
+        """
+        格式化单个数据源的内容 - 包含热度分数
+
+        Args:
+            result: 数据源结果
+            items: 要包含的条目，默认前 MAX_ITEMS_PER_SOURCE 条
+            level: 压缩级别（字段截断长度），默认不压缩
+        """
+        items = result.items[:self.MAX_ITEMS_PER_SOURCE] if items is None else items
+        level = level or self.COMPACTION_LEVELS[0]
+        desc_chars = level["desc_chars"]
         source_names = {
             SourceType.GITHUB: "GitHub Trending",
             SourceType.HACKERNEWS: "Hacker News",
@@ -221,12 +397,12 @@ class AISummarizer:
         }
 
         name = source_names.get(result.source, str(result.source))
-        lines = [f"### {name} ({len(result.items)} 条)"]
+        lines = [f"### {name} ({len(items)} 条)"]
 
-        for i, item in enumerate(result.items[:15], 1):
+        for i, item in enumerate(items, 1):
             title = item.title
             desc = item.description_cn or item.description
-            desc = desc[:120] + "..." if len(desc) > 120 else desc
+            desc = desc[:desc_chars] + "..." if len(desc) > desc_chars else desc
             url = item.url
 
             # 热度指标
@@ -246,10 +422,10 @@ class AISummarizer:
 
             # 深度信息
             depth_info = ""
-            if item.readme_summary:
-                depth_info += f"\n   📖 README: {item.readme_summary[:100]}..."
-            if item.tech_stack:
-                depth_info += f"\n   🛠️ 技术栈: {', '.join(item.tech_stack[:5])}"
+            if item.readme_summary and level["readme_chars"]:
+                depth_info += f"\n   📖 README: {item.readme_summary[:level['readme_chars']]}..."
+            if item.tech_stack and level["tech_count"]:
+                depth_info += f"\n   🛠️ 技术栈: {', '.join(item.tech_stack[:level['tech_count']])}"
 
             lines.append(f"{i}. **{title}** {score_str}")
             lines.append(f"   {desc}")
@@ -280,6 +456,14 @@ def generate_ai_summary(
     """
     # 初始化 LLM 客户端
     llm_client = LLMClient(api_key=llm_api_key)
+    summarizer = AISummarizer(llm_client)
+
+    # 条目、prompt 模板和模型列表都与上次相同时直接复用总结，不再获取用户偏好
+    # （偏好内容的变化要等缓存过期才体现，偏好本身变化很慢）
+    cached = summarizer.cached_summary(summarizer.fingerprint(results, username or None))
+    if cached:
+        print("  💾 条目与上次相同，使用缓存的总结")
+        return cached
 
     # 获取用户偏好
     user_profile = None
@@ -293,7 +477,6 @@ def generate_ai_summary(
             print(f"  ⚠️ 获取用户偏好失败: {e}")
 
     # 生成总结
-    summarizer = AISummarizer(llm_client)
     return summarizer.generate_summary(results, user_profile)
 
 
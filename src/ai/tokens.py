@@ -0,0 +1,30 @@
+"""
+Token 估算
+不依赖具体模型的分词器：ASCII 文本约 4 字符/token，
+非 ASCII 字符（中文约 1 token/字，emoji、符号等可能更多）统一按 1 token/字估计
+"""
+
+import re
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+ASCII_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本的 token 数（偏保守，宁多勿少）"""
+    if not text:
+        return 0
+    non_ascii = len(_NON_ASCII.findall(text))
+    ascii_chars = len(text) - non_ascii
+    return non_ascii + -(-ascii_chars // ASCII_CHARS_PER_TOKEN)
+
+
+if __name__ == "__main__":
+    # 测试
+    for sample in [
+        "Hello, world! This is a short English sentence.",
+        "今日技术圈总结：AI 编程工具继续火爆。",
+        "🔥 爆款 ⭐ 12345 (今日 +678)",
+    ]:
+        print(f"{estimate_tokens(sample):>4}  {sample}")
@@ -3,5 +3,10 @@ Core 模块 - 基础设施
 """
 
 from .logger import logger, setup_logger
+from .http import http, HTTPTransport
+from .rate_limit import github_rate_limiter, GitHubRateLimiter, Priority, RateLimitExceeded
 
-__all__ = ['logger', 'setup_logger']
+__all__ = [
+    'logger', 'setup_logger', 'http', 'HTTPTransport',
+    'github_rate_limiter', 'GitHubRateLimiter', 'Priority', 'RateLimitExceeded'
+]
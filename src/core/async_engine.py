@@ -0,0 +1,135 @@
+"""
+异步抓取引擎
+在单个事件循环上调度数据源抓取、单条目抓取和深度信息获取，
+用全局并发上限 + 按主机并发上限取代层层嵌套的线程池
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+
+class AsyncFetchEngine:
+    """异步抓取引擎"""
+
+    DEFAULT_MAX_CONCURRENCY = 16   # 全局同时在途的请求数
+    DEFAULT_HOST_LIMIT = 6         # 未单独配置的主机
+
+    # 按主机并发上限
+    HOST_LIMITS = {
+        "hacker-news.firebaseio.com": 10,
+        "api.github.com": 8,
+        "github.com": 4,
+        "translate.googleapis.com": 4,
+    }
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        host_limits: Optional[dict[str, int]] = None,
+        default_host_limit: int = DEFAULT_HOST_LIMIT
+    ):
+        """
+        初始化
+
+        Args:
+            max_concurrency: 全局并发上限
+            host_limits: 按主机并发上限（覆盖默认配置）
+            default_host_limit: 未配置主机的并发上限
+        """
+        self.max_concurrency = max_concurrency
+        self.default_host_limit = default_host_limit
+        self.host_limits = dict(self.HOST_LIMITS)
+        if host_limits:
+            self.host_limits.update(host_limits)
+
+        # 信号量必须在事件循环内创建，见 run()
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def run(self, main: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        在新的事件循环上运行协程函数
+
+        阻塞式 HTTP 调用在大小等于全局上限的线程池中执行，
+        所以线程数始终受 max_concurrency 约束
+
+        Args:
+            main: 无参协程函数
+
+        Returns:
+            协程返回值
+        """
+        async def runner():
+            self._global = asyncio.Semaphore(self.max_concurrency)
+            self._hosts = {}
+            asyncio.get_running_loop().set_default_executor(self._executor)
+            return await main()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="fetch"
+        )
+        try:
+            return asyncio.run(runner())
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def call(self, host: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        在全局和主机并发限制下执行一个阻塞调用
+
+        调用必须是“叶子”操作（内部不再向引擎提交任务），否则可能占满名额导致死锁
+
+        Args:
+            host: 目标主机名或 URL
+            fn: 阻塞函数
+            *args, **kwargs: 函数参数
+
+        Returns:
+            函数返回值
+        """
+        # 先占主机名额再占全局名额：繁忙主机上排队的调用不占全局名额，不会饿死其他主机
+        host_sem = self._host_semaphore(host)
+        async with host_sem:
+            async with self._global:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def map(
+        self,
+        host: str,
+        fn: Callable,
+        iterable: Iterable,
+        return_exceptions: bool = True
+    ) -> list:
+        """
+        对每个参数并发执行 fn，结果顺序与输入一致
+
+        Args:
+            host: 目标主机名或 URL
+            fn: 单参数阻塞函数
+            iterable: 参数序列
+            return_exceptions: 是否把异常作为结果返回（而不是抛出）
+
+        Returns:
+            结果列表
+        """
+        return await asyncio.gather(
+            *(self.call(host, fn, arg) for arg in iterable),
+            return_exceptions=return_exceptions
+        )
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """获取主机信号量"""
+        if "://" in host:
+            host = urlsplit(host).hostname or ""
+        host = host.lower()
+
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.host_limits.get(host, self.default_host_limit))
+            self._hosts[host] = sem
+        return sem
@@ -0,0 +1,213 @@
+"""
+磁盘缓存 - JSON 持久化的 TTL + LRU 缓存
+翻译、LLM 响应等跨运行复用的结果共用此实现
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+# 默认缓存目录：项目根目录/data/cache
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "cache"
+
+
+class DiskCache:
+    """带过期时间和容量上限的 LRU 磁盘缓存"""
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        初始化（文件在首次访问时加载）
+
+        Args:
+            path: 缓存文件路径
+            ttl_seconds: 条目有效期（秒），None 表示永不过期
+            max_entries: 最大条目数
+            max_bytes: 条目值的总大小上限（按 JSON 序列化长度估算），None 表示不限
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: Optional[OrderedDict] = None
+        self._total_bytes = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+            default: 未命中时的返回值
+
+        Returns:
+            缓存值
+        """
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+
+            entries.move_to_end(key)
+            entry["a"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            return entry["v"]
+
+    def set(self, key: str, value: Any):
+        """
+        写入缓存（超出容量时淘汰最久未使用的条目）
+
+        Args:
+            key: 缓存键
+            value: 可 JSON 序列化的值
+        """
+        with self._lock:
+            entries = self._load()
+            if key in entries:
+                self._remove(key)
+
+            now = time.time()
+            size = self._size_of(value)
+            entries[key] = {"v": value, "t": now, "a": now, "s": size}
+            self._total_bytes += size
+            self._dirty = True
+            self._evict()
+
+    def delete(self, key: str):
+        """删除条目"""
+        with self._lock:
+            if key in self._load():
+                self._remove(key)
+                self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._load().get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def save(self):
+        """保存到文件（原子替换，无改动时跳过）"""
+        with self._lock:
+            if self._entries is None or not self._dirty:
+                return
+
+            self._purge_expired()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": self.VERSION, "entries": self._entries},
+                        f,
+                        ensure_ascii=False,
+                        separators=(",", ":")
+                    )
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                print(f"保存缓存失败 ({self.path.name}): {e}")
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+            self._dirty = True
+
+    def get_stats(self) -> dict:
+        """获取统计信息"""
+        with self._lock:
+            return {
+                "entries": len(self._load()),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _load(self) -> OrderedDict:
+        """按最近访问时间顺序加载条目"""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        if not self.path.exists():
+            return self._entries
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return self._entries
+
+            entries = sorted(data.get("entries", {}).items(), key=lambda kv: kv[1].get("a", 0))
+            for key, entry in entries:
+                if self._is_expired(entry):
+                    continue
+                entry.setdefault("s", self._size_of(entry.get("v")))
+                self._entries[key] = entry
+                self._total_bytes += entry["s"]
+        except Exception as e:
+            print(f"加载缓存失败 ({self.path.name}): {e}")
+
+        return self._entries
+
+    def _is_expired(self, entry: dict) -> bool:
+        """条目是否已过期"""
+        if self.ttl_seconds is None:
+            return False
+        return time.time() - entry.get("t", 0) > self.ttl_seconds
+
+    def _remove(self, key: str):
+        """移除条目并更新大小统计"""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.get("s", 0)
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到满足容量限制"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+
+    def _purge_expired(self):
+        """清理过期条目"""
+        for key in [k for k, e in self._entries.items() if self._is_expired(e)]:
+            self._remove(key)
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        """估算值的序列化大小"""
+        if isinstance(value, str):
+            return len(value.encode("utf-8")) + 2
+        return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
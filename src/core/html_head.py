@@ -0,0 +1,158 @@
+"""
+HTML <head> 元数据读取器
+流式读取网页并增量解析，读到 </head>（或字节上限）即断开，
+用于只需要 OpenGraph / Twitter Card / canonical 等元数据的场景
+"""
+
+import codecs
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable, Optional
+
+from core.http import http
+
+
+DEFAULT_MAX_BYTES = 128 * 1024   # <head> 很少超过这个大小
+CHUNK_SIZE = 8 * 1024
+
+
+@dataclass
+class PageMetadata:
+    """网页元数据"""
+    url: str
+    opengraph: dict[str, str] = field(default_factory=dict)   # og:* 字段
+    twitter: dict[str, str] = field(default_factory=dict)     # twitter:* 字段
+    canonical_url: Optional[str] = None
+    title: Optional[str] = None
+    bytes_read: int = 0
+    complete: bool = False    # 是否读到了 </head>
+
+    @property
+    def image(self) -> Optional[str]:
+        """封面图（优先 og:image）"""
+        return self.opengraph.get("og:image") or self.twitter.get("twitter:image") or None
+
+    @property
+    def description(self) -> Optional[str]:
+        """描述（优先 og:description）"""
+        return self.opengraph.get("og:description") or self.twitter.get("twitter:description") or None
+
+
+class HeadMetadataParser(HTMLParser):
+    """增量解析 <head>，遇到 </head> 或 <body> 时标记完成"""
+
+    def __init__(self, metadata: PageMetadata):
+        super().__init__(convert_charrefs=True)
+        self.metadata = metadata
+        self.done = False
+        self._in_title = False
+        self._title_parts: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+            return
+
+        attrs = {k.lower(): (v or "") for k, v in attrs}
+        if tag == "meta":
+            self._handle_meta(attrs)
+        elif tag == "link" and "canonical" in attrs.get("rel", "").lower().split():
+            if attrs.get("href") and not self.metadata.canonical_url:
+                self.metadata.canonical_url = attrs["href"].strip()
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+            self.metadata.complete = True
+        elif tag == "title":
+            self._in_title = False
+            title = "".join(self._title_parts).strip()
+            if title and not self.metadata.title:
+                self.metadata.title = title
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def _handle_meta(self, attrs: dict):
+        """记录 og:* / twitter:* 字段（同名字段保留第一个）"""
+        key = (attrs.get("property") or attrs.get("name") or "").strip().lower()
+        content = attrs.get("content", "").strip()
+        if not key or not content:
+            return
+
+        if key.startswith("og:"):
+            self.metadata.opengraph.setdefault(key, content)
+        elif key.startswith("twitter:"):
+            self.metadata.twitter.setdefault(key, content)
+
+
+def parse_head_metadata(html: str, url: str = "") -> PageMetadata:
+    """
+    从已下载的 HTML 中解析元数据（只解析到 </head>）
+
+    Args:
+        html: HTML 文本
+        url: 页面 URL
+
+    Returns:
+        PageMetadata
+    """
+    metadata = PageMetadata(url=url, bytes_read=len(html.encode("utf-8")))
+    parser = HeadMetadataParser(metadata)
+
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        if parser.done:
+            break
+
+    return metadata
+
+
+def fetch_head_metadata(
+    url: str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    timeout: float = 10,
+    headers: Optional[dict] = None,
+    stop_when: Optional[Callable[[PageMetadata], bool]] = None
+) -> Optional[PageMetadata]:
+    """
+    流式获取网页元数据，读到 </head> 或 max_bytes 即停止下载
+
+    Args:
+        url: 网页 URL
+        max_bytes: 最多读取的字节数
+        timeout: 超时（秒）
+        headers: 额外请求头
+        stop_when: 每解析一块后调用，返回 True 时提前停止（如只需要 og:image 时读到即停）
+
+    Returns:
+        PageMetadata，请求失败返回 None
+    """
+    try:
+        with http.get(url, timeout=timeout, stream=True, headers=headers) as response:
+            if response.status_code != 200:
+                return None
+
+            metadata = PageMetadata(url=response.url or url)
+            parser = HeadMetadataParser(metadata)
+            # 未声明编码的 text/html 被 requests 视为 ISO-8859-1，实际几乎都是 UTF-8
+            encoding = response.encoding if "charset" in response.headers.get("Content-Type", "") else "utf-8"
+            decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                metadata.bytes_read += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if parser.done or metadata.bytes_read >= max_bytes:
+                    break
+                if stop_when is not None and stop_when(metadata):
+                    break
+
+            return metadata
+    except Exception:
+        return None
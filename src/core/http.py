@@ -0,0 +1,174 @@
+"""
+HTTP 传输层 - 按主机复用连接池
+所有数据源、深度获取器和 API 客户端共用，避免每次请求都重新建立 TCP+TLS 连接
+"""
+
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession(requests.Session):
+    """带默认超时的 Session（requests 本身没有全局超时配置）"""
+
+    def __init__(self, default_timeout: float):
+        super().__init__()
+        self.default_timeout = default_timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+class HTTPTransport:
+    """按主机分配的 keep-alive 连接池"""
+
+    DEFAULT_TIMEOUT = 10      # 秒
+    DEFAULT_POOL_SIZE = 10    # 每个主机的最大空闲连接数
+
+    # 高并发主机的连接池大小（与各模块的并发数保持一致）
+    HOST_POOL_SIZES = {
+        "hacker-news.firebaseio.com": 20,
+        "api.github.com": 16,
+        "translate.googleapis.com": 8,
+        "github.com": 16,
+    }
+
+    # 主机默认超时（调用方显式传入 timeout 时以调用方为准）
+    HOST_TIMEOUTS = {
+        "github.com": 30,
+        "www.producthunt.com": 30,
+    }
+
+    def __init__(
+        self,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        default_pool_size: int = DEFAULT_POOL_SIZE
+    ):
+        """
+        初始化
+
+        Args:
+            default_timeout: 默认超时（秒）
+            default_pool_size: 默认每主机连接池大小
+        """
+        self.default_timeout = default_timeout
+        self.default_pool_size = default_pool_size
+        self._pool_sizes = dict(self.HOST_POOL_SIZES)
+        self._timeouts = dict(self.HOST_TIMEOUTS)
+        self._sessions: dict[str, PooledSession] = {}
+        self._hooks: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def configure_host(
+        self,
+        host: str,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        调整某个主机的连接池大小和默认超时
+        已创建的 Session 会被关闭并在下次请求时重建
+
+        Args:
+            host: 主机名
+            pool_size: 连接池大小
+            timeout: 默认超时（秒）
+        """
+        host = host.lower()
+        with self._lock:
+            if pool_size is not None:
+                self._pool_sizes[host] = pool_size
+            if timeout is not None:
+                self._timeouts[host] = timeout
+            session = self._sessions.pop(host, None)
+        if session:
+            session.close()
+
+    def add_response_hook(self, host: str, hook):
+        """
+        为某个主机的所有响应注册钩子（requests 的 response hook）
+
+        Args:
+            host: 主机名
+            hook: hook(response, *args, **kwargs)
+        """
+        host = host.lower()
+        with self._lock:
+            self._hooks.setdefault(host, []).append(hook)
+            session = self._sessions.get(host)
+            if session is not None:
+                session.hooks["response"].append(hook)
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        获取 URL 所属主机的 Session
+
+        Args:
+            url: 请求 URL（或主机名）
+
+        Returns:
+            该主机共享的 Session
+        """
+        host = self._host_of(url)
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session(host)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求（参数与 requests.request 相同）"""
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET 请求"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST 请求"""
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """关闭所有连接池"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @property
+    def hosts(self) -> list[str]:
+        """已建立连接池的主机"""
+        return list(self._sessions)
+
+    def _create_session(self, host: str) -> PooledSession:
+        """创建主机专属 Session"""
+        pool_size = self._pool_sizes.get(host, self.default_pool_size)
+        session = PooledSession(self._timeouts.get(host, self.default_timeout))
+
+        # 每个 Session 只服务一个主机，所以 pool_connections=1 即可
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].extend(self._hooks.get(host, []))
+        return session
+
+    @staticmethod
+    def _host_of(url: str) -> str:
+        """提取主机名"""
+        if "://" not in url:
+            return url.lower()
+        return (urlsplit(url).hostname or "").lower()
+
+
+# 全局传输实例
+http = HTTPTransport()
@@ -0,0 +1,150 @@
+"""
+条件请求 HTTP 缓存（ETag / Last-Modified）
+持久化保存响应体和校验信息，下次请求带上 If-None-Match / If-Modified-Since，
+服务器返回 304 时直接使用缓存内容（GitHub 的 304 不计入 API 限额）
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+from urllib.parse import urlencode
+
+import requests
+
+from core.http import http
+from core.rate_limit import github_rate_limiter, Priority, RateLimitExceeded
+from core.disk_cache import DiskCache, DEFAULT_CACHE_DIR
+
+
+class ConditionalHTTPCache:
+    """条件请求缓存（只缓存带校验信息的 GET 200 响应）"""
+
+    DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+    DEFAULT_MAX_ENTRIES = 5000
+    DEFAULT_TTL_SECONDS = 14 * 24 * 3600   # 两周没有再请求过的资源直接丢弃
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS
+    ):
+        """
+        初始化
+
+        Args:
+            path: 缓存文件路径
+            max_bytes: 响应体总大小上限（超出时按 LRU 淘汰）
+            max_entries: 最大条目数
+            ttl_seconds: 条目有效期（每次 304 重新验证后刷新）
+        """
+        self._cache = DiskCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries, max_bytes=max_bytes)
+        self.revalidated = 0   # 304 命中次数
+        self.fetched = 0       # 完整下载次数
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+        发送条件 GET 请求（参数与 requests.get 相同）
+
+        304 时返回的 Response 状态码被改写为 200，内容为缓存的响应体，并带有 from_cache=True
+        """
+        key = self._key(url, params, headers)
+        entry = self._cache.get(key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = http.get(url, params=params, headers=request_headers, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and entry:
+            response.status_code = 200
+            response._content = entry["body"].encode("utf-8")
+            response.encoding = "utf-8"
+            response.from_cache = True
+            self.revalidated += 1
+            # 刷新有效期和 LRU 顺序
+            self._cache.set(key, entry)
+            return response
+
+        if response.status_code == 200:
+            self.fetched += 1
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._cache.set(key, {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "body": response.text,
+                })
+
+        return response
+
+    def save(self):
+        """保存到磁盘"""
+        self._cache.save()
+
+    def get_stats(self) -> dict:
+        """获取统计信息"""
+        stats = self._cache.get_stats()
+        return {
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+            "entries": stats["entries"],
+            "bytes": stats["bytes"],
+        }
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict], headers: Optional[dict]) -> str:
+        """缓存键：完整 URL + 影响响应内容的请求头（不同 Token 可见的内容可能不同）"""
+        full_url = f"{url}?{urlencode(sorted((params or {}).items()))}" if params else url
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        vary = json.dumps([headers.get("accept"), headers.get("authorization")])
+        return hashlib.sha256(f"{full_url}\n{vary}".encode("utf-8")).hexdigest()[:32]
+
+
+_github_cache: Optional[ConditionalHTTPCache] = None
+
+
+def get_github_cache() -> Optional[ConditionalHTTPCache]:
+    """获取 GitHub API 的全局条件请求缓存（ENABLE_HTTP_CACHE=false 时返回 None）"""
+    global _github_cache
+    if os.environ.get("ENABLE_HTTP_CACHE", "true").lower() != "true":
+        return None
+    if _github_cache is None:
+        _github_cache = ConditionalHTTPCache(DEFAULT_CACHE_DIR / "github_http.json")
+    return _github_cache
+
+
+def conditional_get(url: str, priority: Priority = Priority.HIGH, **kwargs) -> requests.Response:
+    """
+    走 GitHub 条件请求缓存的 GET（缓存关闭时等同于 http.get）
+
+    Raises:
+        RateLimitExceeded: 该优先级的额度已用完，请求未发送
+    """
+    if not github_rate_limiter.acquire(priority):
+        raise RateLimitExceeded(f"GitHub 限额不足，跳过 {priority.name} 请求")
+
+    try:
+        cache = get_github_cache()
+        if cache is None:
+            return http.get(url, **kwargs)
+        return cache.get(url, **kwargs)
+    finally:
+        # 响应钩子已按响应头更新额度（304 和出错不消耗），归还预留
+        github_rate_limiter.release()
+
+
+def save_http_cache():
+    """保存 GitHub 条件请求缓存"""
+    if _github_cache is not None:
+        _github_cache.save()
+        stats = _github_cache.get_stats()
+        print(f"GitHub HTTP 缓存: 304 命中 {stats['revalidated']} / 完整下载 {stats['fetched']}，共 {stats['entries']} 条")
@@ -0,0 +1,234 @@
+"""
+GitHub API 限额调度
+从 api.github.com 响应头读取 X-RateLimit-*，按优先级决定请求是否放行：
+用户偏好 > 排名靠前的仓库 > 其余仓库，额度不足时先放弃低优先级的深度信息
+"""
+
+import threading
+import time
+from enum import IntEnum
+from typing import Optional
+
+import requests
+
+from core.http import http
+
+
+class Priority(IntEnum):
+    """请求优先级（数值越小越重要）"""
+    CRITICAL = 0   # 用户偏好（AI 推荐依赖）
+    HIGH = 1       # 排名靠前的仓库
+    LOW = 2        # 其余仓库的深度信息
+
+
+class RateLimitExceeded(Exception):
+    """剩余额度不足，请求未发送"""
+
+
+class GitHubRateLimiter:
+    """GitHub API 限额调度器（按 core / graphql 等资源分别计数）"""
+
+    RATE_LIMIT_URL = "https://api.github.com/rate_limit"
+
+    # 保留额度：HIGH 请求至少给 CRITICAL 留这么多次
+    CRITICAL_RESERVE = 10
+    # LOW 请求至少给更高优先级留总额度的这个比例
+    LOW_RESERVE_RATIO = 0.2
+
+    # 额度耗尽时 CRITICAL 请求最多等待重置的时间（秒），再长就直接失败
+    MAX_WAIT_SECONDS = 60
+
+    def __init__(
+        self,
+        critical_reserve: int = CRITICAL_RESERVE,
+        low_reserve_ratio: float = LOW_RESERVE_RATIO
+    ):
+        """
+        初始化
+
+        Args:
+            critical_reserve: 为 CRITICAL 保留的请求数
+            low_reserve_ratio: LOW 请求需要保留的额度比例
+        """
+        self.critical_reserve = critical_reserve
+        self.low_reserve_ratio = low_reserve_ratio
+
+        # resource -> {"limit", "remaining", "reset"}，remaining 为服务端响应头给出的值
+        self._quota: dict[str, dict] = {}
+        # resource -> 已放行但还没有 release 的预留额度
+        self._outstanding: dict[str, int] = {}
+        self._blocked_until = 0.0     # 触发次级限流（Retry-After）后的恢复时间
+        self._used: dict[str, int] = {}
+        self._dropped: dict[Priority, int] = {p: 0 for p in Priority}
+        self._lock = threading.Lock()
+
+    def probe(self, token: Optional[str] = None) -> bool:
+        """
+        查询当前额度（/rate_limit 不消耗额度）
+
+        Args:
+            token: GitHub Token，需要与实际请求使用的一致
+
+        Returns:
+            是否查询成功
+        """
+        headers = {"Accept": "application/vnd.github.v3+json", "User-Agent": "TechDigest/1.0"}
+        if token:
+            headers["Authorization"] = f"token {token}"
+
+        try:
+            response = http.get(self.RATE_LIMIT_URL, headers=headers, timeout=5)
+            if response.status_code != 200:
+                return False
+            resources = response.json().get("resources", {})
+        except Exception as e:
+            print(f"查询 GitHub 限额失败: {e}")
+            return False
+
+        with self._lock:
+            for name, data in resources.items():
+                self._quota[name] = {
+                    "limit": data.get("limit", 0),
+                    "remaining": data.get("remaining", 0),
+                    "reset": data.get("reset", 0),
+                }
+        return True
+
+    def acquire(self, priority: Priority, resource: str = "core", cost: int = 1) -> bool:
+        """
+        申请发送一次请求
+
+        放行时记一笔预留（避免并发请求一起越过保留线），可用额度 = 响应头剩余 - 预留；
+        请求结束后（无论 200、304 还是出错）必须调用 release 归还预留，
+        实际消耗以之后的响应头为准
+
+        Args:
+            priority: 请求优先级
+            resource: 限额资源（core / graphql）
+            cost: 预计消耗
+
+        Returns:
+            是否放行
+        """
+        while True:
+            with self._lock:
+                wait = self._blocked_until - time.time()
+                if wait <= 0:
+                    quota = self._quota.get(resource)
+                    if quota is not None and time.time() >= quota["reset"]:
+                        # 已过重置时间，等下一个响应头校正
+                        quota["remaining"] = quota["limit"]
+                    available = None if quota is None else quota["remaining"] - self._outstanding.get(resource, 0)
+                    if available is None or available - cost >= self._reserve(priority, quota["limit"]):
+                        self._outstanding[resource] = self._outstanding.get(resource, 0) + cost
+                        return True
+                    wait = self._reset_in(quota) if quota["remaining"] < cost else None
+
+                if priority != Priority.CRITICAL or wait is None or wait > self.MAX_WAIT_SECONDS:
+                    self._dropped[priority] += 1
+                    return False
+
+            print(f"GitHub 限额耗尽，等待 {wait:.0f} 秒后重置")
+            time.sleep(wait)
+
+    def release(self, resource: str = "core", cost: int = 1) -> None:
+        """
+        归还 acquire 的预留额度
+
+        在请求结束后调用：正常响应的消耗已体现在响应头里，304 和出错的请求不消耗额度
+        """
+        with self._lock:
+            self._outstanding[resource] = max(0, self._outstanding.get(resource, 0) - cost)
+
+    def observe(self, response: requests.Response, *args, **kwargs) -> None:
+        """
+        响应钩子：根据响应头更新额度
+
+        注册在 api.github.com 的 Session 上，所有 GitHub API 请求都会经过
+        """
+        headers = response.headers
+        now = time.time()
+
+        with self._lock:
+            retry_after = headers.get("Retry-After")
+            if retry_after and response.status_code in (403, 429):
+                try:
+                    self._blocked_until = max(self._blocked_until, now + float(retry_after))
+                except ValueError:
+                    pass
+
+            if "X-RateLimit-Remaining" not in headers:
+                return
+
+            resource = headers.get("X-RateLimit-Resource", "core")
+            if response.url.startswith(self.RATE_LIMIT_URL):
+                return
+
+            # 带校验信息的 304 不计入额度
+            if response.status_code != 304:
+                self._used[resource] = self._used.get(resource, 0) + 1
+
+            try:
+                limit = int(headers["X-RateLimit-Limit"])
+                remaining = int(headers["X-RateLimit-Remaining"])
+                reset = int(headers["X-RateLimit-Reset"])
+            except (KeyError, ValueError):
+                return
+
+            quota = self._quota.get(resource)
+            if quota is None or reset > quota["reset"]:
+                # 新的计数窗口
+                self._quota[resource] = {"limit": limit, "remaining": remaining, "reset": reset}
+            else:
+                # 并发响应可能乱序到达，同一窗口内服务端的剩余只减不增，取最小值
+                quota["limit"] = limit
+                quota["remaining"] = min(quota["remaining"], remaining)
+
+    def remaining(self, resource: str = "core") -> Optional[int]:
+        """可用额度：响应头剩余减去进行中的预留（未知时返回 None）"""
+        with self._lock:
+            quota = self._quota.get(resource)
+            return quota["remaining"] - self._outstanding.get(resource, 0) if quota else None
+
+    def get_stats(self) -> dict:
+        """获取统计信息"""
+        with self._lock:
+            return {
+                "used": dict(self._used),
+                "remaining": {name: dict(quota) for name, quota in self._quota.items()},
+                "dropped": {p.name.lower(): n for p, n in self._dropped.items() if n},
+            }
+
+    def report(self):
+        """打印本次运行的额度使用情况"""
+        stats = self.get_stats()
+        if not stats["used"] and not stats["dropped"]:
+            return
+
+        parts = []
+        for name, used in sorted(stats["used"].items()):
+            quota = stats["remaining"].get(name)
+            left = f"，剩余 {quota['remaining']}/{quota['limit']}" if quota else ""
+            parts.append(f"{name} 使用 {used}{left}")
+        if stats["dropped"]:
+            dropped = " / ".join(f"{name} {n}" for name, n in stats["dropped"].items())
+            parts.append(f"因额度不足跳过 {dropped}")
+        print(f"GitHub API 限额: {'；'.join(parts)}")
+
+    def _reserve(self, priority: Priority, limit: int) -> int:
+        """该优先级需要保留给更高优先级的额度"""
+        if priority == Priority.CRITICAL:
+            return 0
+        if priority == Priority.HIGH:
+            return min(self.critical_reserve, limit // 10)
+        return max(self.critical_reserve, int(limit * self.low_reserve_ratio))
+
+    @staticmethod
+    def _reset_in(quota: dict) -> float:
+        """距离额度重置的秒数"""
+        return max(0.0, quota["reset"] - time.time()) + 1
+
+
+# 全局调度器，挂在 api.github.com 的连接池上
+github_rate_limiter = GitHubRateLimiter()
+http.add_response_hook("api.github.com", github_rate_limiter.observe)
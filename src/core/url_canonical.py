@@ -0,0 +1,163 @@
+"""
+URL 规范化
+为去重生成稳定的 URL 键：同一内容的 http/https、www.、锚点、追踪参数、参数顺序等变体得到同一个结果
+（结果只用作去重键，不保证可以直接访问）
+"""
+
+import os
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# 默认移除的追踪参数（精确匹配，不区分大小写）
+DEFAULT_TRACKING_PARAMS = frozenset({
+    "ref", "ref_src", "ref_url", "referrer",
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "twclid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok", "spm",
+})
+
+# 默认移除的追踪参数前缀
+DEFAULT_TRACKING_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# dev.to 文章 slug 末尾的 ID（标题修改后 slug 前半部分会变，ID 不变）：4 位 base36，跟在标题 slug 之后
+_DEVTO_SLUG_ID = re.compile(r"^.+-([a-z0-9]{4})$")
+# 只有一段数字的末尾词（web3、vue3、2024、100x）像单词 + 版本号或年份，不当作 ID，避免同一作者的不同文章合并
+_WORD_WITH_NUMBER = re.compile(r"^[a-z]*[0-9]+[a-z]*$")
+
+
+class URLCanonicalizer:
+    """URL 规范化器"""
+
+    CACHE_SIZE = 65536
+
+    def __init__(
+        self,
+        tracking_params: frozenset = DEFAULT_TRACKING_PARAMS,
+        tracking_prefixes: tuple = DEFAULT_TRACKING_PREFIXES
+    ):
+        """
+        初始化
+
+        Args:
+            tracking_params: 要移除的查询参数名
+            tracking_prefixes: 要移除的查询参数名前缀
+        """
+        self.tracking_params = frozenset(p.lower() for p in tracking_params)
+        self.tracking_prefixes = tuple(p.lower() for p in tracking_prefixes)
+        # 每个实例单独记忆（参数集合不同结果也不同）
+        self.canonicalize = lru_cache(maxsize=self.CACHE_SIZE)(self._canonicalize)
+
+        # 按主机的特殊规则
+        self._host_rules = {
+            "github.com": self._github_path,
+            "dev.to": self._devto_path,
+        }
+
+    def _canonicalize(self, url: str) -> str:
+        """规范化（未记忆版本）"""
+        url = (url or "").strip()
+        if not url:
+            return ""
+        if "://" not in url:
+            url = "https://" + url.lstrip("/")
+
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            return url
+        host = (parts.hostname or "").lower().rstrip(".")
+        if host.startswith("www."):
+            host = host[4:]
+        netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+
+        # 合并重复斜杠，去掉末尾斜杠；路径大小写保留（多数网站区分大小写）
+        path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+
+        query = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not self._is_tracking(key)
+        ]
+
+        rule = self._host_rules.get(host)
+        if rule:
+            path, query = rule(path, query)
+        elif host == "news.ycombinator.com":
+            query = [(k, v) for k, v in query if k == "id"]
+
+        # 统一为 https，不含锚点，参数排序
+        return urlunsplit(("https", netloc, path, urlencode(sorted(query)), ""))
+
+    def _is_tracking(self, key: str) -> bool:
+        """是否为追踪参数"""
+        key = key.lower()
+        return key in self.tracking_params or key.startswith(self.tracking_prefixes)
+
+    @staticmethod
+    def _github_path(path: str, query: list) -> tuple[str, list]:
+        """
+        github.com：owner/repo 不区分大小写，去掉 .git 后缀；
+        仓库首页的查询参数（如 ?tab=readme-ov-file）不影响内容，全部移除
+        """
+        segments = path.split("/")   # ["", owner, repo, ...]
+        if len(segments) < 3:
+            return path.lower(), query
+
+        owner, repo = segments[1].lower(), segments[2].lower()
+        if repo.endswith(".git"):
+            repo = repo[:-4]
+        rest = segments[3:]
+        if not rest:
+            return f"/{owner}/{repo}", []
+        return "/".join(["", owner, repo, *rest]), query
+
+    @staticmethod
+    def _devto_path(path: str, query: list) -> tuple[str, list]:
+        """
+        dev.to：用户名不区分大小写；slug 末尾是明确的文章 ID（字母和数字交错出现，如 4kd3、1b2k）时以 ID 为准，
+        否则保留完整 slug（宁可漏掉改标题的同一文章，也不把不同文章当成重复）
+        """
+        segments = path.lower().split("/")   # ["", user, slug]
+        if len(segments) == 3:
+            match = _DEVTO_SLUG_ID.match(segments[2])
+            if match and not _WORD_WITH_NUMBER.match(match.group(1)) and not match.group(1).isalpha():
+                return f"/{segments[1]}/{match.group(1)}", []
+        return "/".join(segments), query
+
+
+def _from_env() -> URLCanonicalizer:
+    """默认规范化器；URL_TRACKING_PARAMS（逗号分隔）可追加要移除的参数"""
+    extra = {p.strip() for p in os.environ.get("URL_TRACKING_PARAMS", "").split(",") if p.strip()}
+    return URLCanonicalizer(tracking_params=DEFAULT_TRACKING_PARAMS | extra)
+
+
+_default = _from_env()
+
+
+def canonicalize_url(url: str) -> str:
+    """用默认规范化器规范化 URL（结果带缓存）"""
+    return _default.canonicalize(url)
+
+
+if __name__ == "__main__":
+    # 测试
+    for url in [
+        "http://www.Example.com/Path/?utm_source=hn&b=2&a=1#section",
+        "https://github.com/Microsoft/VSCode.git",
+        "https://github.com/microsoft/vscode?tab=readme-ov-file",
+        "https://github.com/microsoft/vscode/issues/1?ref=trending",
+        "https://dev.to/Ben/my-first-post-4kd3?ref=feed",
+        "https://dev.to/ben/my-edited-title-4kd3",
+        "https://dev.to/ben/top-tips-2024",
+        "https://dev.to/ben/intro-to-web3",
+        "https://news.ycombinator.com/item?id=123&p=2",
+    ]:
+        print(f"{url}\n  -> {canonicalize_url(url)}")
@@ -5,5 +5,13 @@
 
 from .memory import MemoryDedup
 from .history import HistoryDedup
+from .history_store import (
+    HistoryStore, JSONHistoryStore, SQLiteHistoryStore, NDJSONHistoryStore, create_history_store
+)
+from .bloom import BloomFilter, BloomFilteredStore
 
-__all__ = ["MemoryDedup", "HistoryDedup"]
+__all__ = [
+    "MemoryDedup", "HistoryDedup",
+    "HistoryStore", "JSONHistoryStore", "SQLiteHistoryStore", "NDJSONHistoryStore", "create_history_store",
+    "BloomFilter", "BloomFilteredStore"
+]
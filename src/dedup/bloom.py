@@ -0,0 +1,229 @@
+"""
+布隆过滤器
+历史记录的概率成员预筛：判定"不存在"一定准确，判定"可能存在"时再查精确存储
+"""
+
+import hashlib
+import math
+import os
+import struct
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Optional
+
+from dedup.history_store import HistoryStore
+
+
+class BloomFilter:
+    """定长位数组布隆过滤器（双重哈希生成 k 个位置）"""
+
+    MAGIC = b"BLM2"
+    HEADER = struct.Struct("<QQQIdQ")   # num_bits, capacity, count, num_hashes, fp_rate, synced_day
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        """
+        初始化
+
+        Args:
+            capacity: 预计元素数（超过后误判率会上升）
+            fp_rate: 目标误判率
+        """
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0           # 累计加入次数（不支持删除，只增不减）
+        self.synced_day = 0      # 最后一次与数据源同步的日期（date.toordinal()），由调用方设置
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        """k 个位下标：h1 + i * h2（Kirsch-Mitzenmacher）"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        """加入元素"""
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]):
+        """批量加入"""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        # 大多数查询是新条目，逐位检查遇到 0 立即返回
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self._bits
+        m = self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """位数组大小（字节）"""
+        return len(self._bits)
+
+    def save(self, path: str | Path):
+        """写入文件（原子替换）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.HEADER.pack(
+                self.num_bits, self.capacity, self.count, self.num_hashes, self.fp_rate, self.synced_day
+            ))
+            f.write(self._bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["BloomFilter"]:
+        """从文件读取，文件不存在或损坏时返回 None"""
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                    return None
+                num_bits, capacity, count, num_hashes, fp_rate, synced_day = cls.HEADER.unpack(
+                    f.read(cls.HEADER.size)
+                )
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+
+        if len(bits) != (num_bits + 7) // 8:
+            return None
+
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.fp_rate = fp_rate
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom.synced_day = synced_day
+        bloom._bits = bits
+        return bloom
+
+
+class BloomFilteredStore(HistoryStore):
+    """
+    带布隆过滤器预筛的历史记录存储
+
+    过滤器保存在存储文件旁（<文件名>.bloom），只有可能命中的 ID 才查询精确存储；
+    过期记录删除后不重建（残留的旧 ID 只会抬高误判率，不影响正确性），
+    只在过滤器缺失、误判率参数变化、与存储不同步或累计加入数超过容量时从存储重建
+    """
+
+    MIN_CAPACITY = 10000
+    GROWTH_FACTOR = 2   # 重建时按当前记录数的倍数预留容量
+
+    def __init__(self, inner: HistoryStore, fp_rate: float = 0.01, path: Optional[str | Path] = None):
+        """
+        初始化
+
+        Args:
+            inner: 精确存储
+            fp_rate: 目标误判率
+            path: 过滤器文件路径，默认为存储文件路径加 .bloom
+        """
+        self.inner = inner
+        self.fp_rate = fp_rate
+        self.path = Path(path) if path else Path(f"{inner.path}.bloom")
+
+        self.prefiltered = 0   # 被过滤器直接排除、没有查精确存储的次数
+
+        self.bloom = BloomFilter.load(self.path)
+        self._dirty = False
+        if (
+            self.bloom is None
+            or self.bloom.fp_rate != fp_rate
+            or self.bloom.count > self.bloom.capacity
+            or not self._in_sync()
+        ):
+            self._rebuild()
+
+    def _in_sync(self) -> bool:
+        """
+        过滤器是否包含存储中的全部 ID
+
+        存储只会在过滤器之外被追加（如缓存的过滤器比提交的历史文件旧），
+        新记录的日期不早于过滤器上次保存的日期，只需检查这部分记录
+        """
+        if len(self.inner) > self.bloom.count or not self.bloom.synced_day:
+            return False
+        since = date.fromordinal(self.bloom.synced_day).strftime("%Y-%m-%d")
+        return all(record["unique_id"] in self.bloom for record in self.inner.iter_records(since))
+
+    def _rebuild(self):
+        """从精确存储重建过滤器"""
+        capacity = max(self.MIN_CAPACITY, len(self.inner) * self.GROWTH_FACTOR)
+        self.bloom = BloomFilter(capacity, self.fp_rate)
+        self.bloom.update(record["unique_id"] for record in self.inner.iter_records())
+        self._dirty = True
+
+    def contains(self, unique_id: str) -> bool:
+        if unique_id not in self.bloom:
+            self.prefiltered += 1
+            return False
+        return self.inner.contains(unique_id)
+
+    def contains_many(self, unique_ids: Iterable[str]) -> set[str]:
+        unique_ids = list(unique_ids)
+        candidates = [uid for uid in unique_ids if uid in self.bloom]
+        self.prefiltered += len(unique_ids) - len(candidates)
+        return self.inner.contains_many(candidates) if candidates else set()
+
+    def add_many(self, records: list[dict]) -> int:
+        # 已存在的 ID 不会新增，只把新 ID 计入过滤器（保持 count 与存储一致）
+        existing = self.contains_many(record["unique_id"] for record in records)
+        new_ids = {record["unique_id"] for record in records} - existing
+
+        added = self.inner.add_many(records)
+        if new_ids:
+            self.bloom.update(new_ids)
+            self._dirty = True
+        return added
+
+    def cleanup(self, cutoff_date: str) -> int:
+        # 布隆过滤器不支持删除：过期 ID 留在过滤器里（只抬高误判率），命中后由精确存储否定
+        return self.inner.cleanup(cutoff_date)
+
+    def save(self):
+        self.inner.save()
+        if self.bloom.count > self.bloom.capacity:
+            # 累计加入数（含已删除的旧 ID）超过容量，误判率开始明显上升
+            self._rebuild()
+        today = date.today().toordinal()
+        if self._dirty or self.bloom.synced_day != today:
+            self.bloom.synced_day = today
+            self.bloom.save(self.path)
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.inner)
+
+    def iter_records(self, since: Optional[str] = None) -> Iterable[dict]:
+        return self.inner.iter_records(since)
+
+    def get_stats(self) -> dict:
+        return self.inner.get_stats()
+
+    def close(self):
+        self.inner.close()
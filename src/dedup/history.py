@@ -3,16 +3,17 @@
 持久化存储已发送的内容，避免重复推送
 """
 
-import json
 import os
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Optional
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem
+from dedup.history_store import HistoryStore, create_history_store
+from dedup.bloom import BloomFilteredStore
+from dedup.near_duplicate import EXACT_IDENTITY_SOURCES, NearDuplicateIndex, normalize_text
 
 
 class HistoryDedup:
@@ -20,43 +21,43 @@ class HistoryDedup:
 
     DEFAULT_RETENTION_DAYS = 30
 
-    def __init__(self, history_file: Optional[str] = None, retention_days: int = DEFAULT_RETENTION_DAYS):
+    # 近似重复只与最近 N 天发送过的标题比较（历史只保存标题）
+    NEAR_DUPLICATE_DAYS = 14
+
+    def __init__(
+        self,
+        history_file: Optional[str] = None,
+        retention_days: Optional[int] = None,
+        backend: Optional[str] = None,
+        store: Optional[HistoryStore] = None,
+        bloom_fp_rate: Optional[float] = None,
+        near_duplicate_threshold: Optional[float] = None
+    ):
         """
         初始化历史去重器
 
         Args:
-            history_file: 历史数据文件路径
-            retention_days: 数据保留天数
+            history_file: 历史数据文件路径，默认 data/history.json（sqlite 为 data/history.db）
+            retention_days: 数据保留天数，默认读取 HISTORY_RETENTION_DAYS
+            backend: 存储后端 json/sqlite，默认读取 HISTORY_BACKEND
+            store: 直接指定存储实例（忽略 history_file 和 backend）
+            bloom_fp_rate: 启用布隆过滤器预筛并指定误判率，None 表示不启用
+            near_duplicate_threshold: 与近期已发送标题的近似重复阈值，None 表示只做精确匹配
         """
-        if history_file:
-            self.history_file = Path(history_file)
-        else:
-            # 默认路径：项目根目录/data/history.json
-            project_root = Path(__file__).parent.parent.parent
-            self.history_file = project_root / "data" / "history.json"
-
+        if retention_days is None:
+            retention_days = int(os.environ.get("HISTORY_RETENTION_DAYS", self.DEFAULT_RETENTION_DAYS))
         self.retention_days = retention_days
-        self._history = self._load_history()
-
-    def _load_history(self) -> dict:
-        """加载历史数据"""
-        if not self.history_file.exists():
-            return {
-                "version": 1,
-                "last_updated": None,
-                "sent_items": {}
-            }
 
-        try:
-            with open(self.history_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"加载历史数据失败: {e}")
-            return {
-                "version": 1,
-                "last_updated": None,
-                "sent_items": {}
-            }
+        if store is None:
+            backend = backend or os.environ.get("HISTORY_BACKEND", "json")
+            store = create_history_store(backend, history_file)
+        if bloom_fp_rate:
+            store = BloomFilteredStore(store, bloom_fp_rate)
+        self.store = store
+
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._near_index: Optional[NearDuplicateIndex] = None
+        self.near_duplicate_count = 0
 
     def is_sent_before(self, item: NewsItem) -> bool:
         """
@@ -68,7 +69,7 @@ class HistoryDedup:
         Returns:
             True 如果已发送过
         """
-        return item.unique_id in self._history["sent_items"]
+        return self.store.contains(item.unique_id) or self.store.contains(item.legacy_unique_id)
 
     def mark_sent(self, items: list[NewsItem]):
         """
@@ -78,12 +79,15 @@ class HistoryDedup:
             items: 已发送的新闻项列表
         """
         today = datetime.now().strftime("%Y-%m-%d")
-        for item in items:
-            self._history["sent_items"][item.unique_id] = {
+        self.store.add_many([
+            {
+                "unique_id": item.unique_id,
                 "date": today,
                 "title": item.title[:100],  # 只保存标题前100字符
                 "source": item.source.value
             }
+            for item in items
+        ])
 
     def filter_sent(self, items: list[NewsItem]) -> list[NewsItem]:
         """
@@ -95,69 +99,68 @@ class HistoryDedup:
         Returns:
             过滤后的列表（只包含未发送过的）
         """
-        return [item for item in items if not self.is_sent_before(item)]
+        # 过渡期：URL 规范化之前写入的记录以原始 URL 的哈希为 ID，两种 ID 都查
+        # （保留期过后可以只查 unique_id）
+        sent = self.store.contains_many(
+            uid for item in items for uid in (item.unique_id, item.legacy_unique_id)
+        )
+        remaining = [
+            item for item in items
+            if item.unique_id not in sent and item.legacy_unique_id not in sent
+        ]
+
+        if not self.near_duplicate_threshold:
+            return remaining
+
+        index = self._get_near_index()
+        unique_items = []
+        for item in remaining:
+            if item.source.value in EXACT_IDENTITY_SOURCES:
+                unique_items.append(item)
+            elif index.query(index.signature(normalize_text(item.title[:100]))):
+                self.near_duplicate_count += 1
+            else:
+                unique_items.append(item)
+        return unique_items
+
+    def _get_near_index(self) -> NearDuplicateIndex:
+        """用最近 NEAR_DUPLICATE_DAYS 天的已发送标题构建近似重复索引（首次使用时构建，跳过只做精确去重的来源）"""
+        if self._near_index is None:
+            since = (datetime.now() - timedelta(days=self.NEAR_DUPLICATE_DAYS)).strftime("%Y-%m-%d")
+            index = NearDuplicateIndex(self.near_duplicate_threshold)
+            for record in self.store.iter_records(since):
+                if record.get("title") and record.get("source") not in EXACT_IDENTITY_SOURCES:
+                    index.add(record["unique_id"], index.signature(normalize_text(record["title"])))
+            self._near_index = index
+        return self._near_index
 
     def cleanup_old(self):
         """清理过期数据"""
         cutoff_date = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
 
-        old_count = len(self._history["sent_items"])
-
-        self._history["sent_items"] = {
-            k: v for k, v in self._history["sent_items"].items()
-            if isinstance(v, dict) and v.get("date", "2000-01-01") >= cutoff_date
-        }
-
-        new_count = len(self._history["sent_items"])
-        if old_count > new_count:
-            print(f"清理了 {old_count - new_count} 条过期历史记录")
+        removed = self.store.cleanup(cutoff_date)
+        if removed:
+            print(f"清理了 {removed} 条过期历史记录")
 
     def save(self):
         """保存到文件"""
         # 清理过期数据
         self.cleanup_old()
 
-        # 确保目录存在
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # 更新时间戳
-        self._history["last_updated"] = datetime.now().isoformat()
-
         try:
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump(self._history, f, ensure_ascii=False, indent=2)
-            print(f"历史数据已保存: {len(self._history['sent_items'])} 条记录")
+            self.store.save()
+            print(f"历史数据已保存: {len(self.store)} 条记录")
         except Exception as e:
             print(f"保存历史数据失败: {e}")
 
     @property
     def total_sent(self) -> int:
         """已发送的总数"""
-        return len(self._history["sent_items"])
+        return len(self.store)
 
     def get_stats(self) -> dict:
         """获取统计信息"""
-        items = self._history["sent_items"]
-
-        # 按来源统计
-        by_source = {}
-        for item in items.values():
-            if isinstance(item, dict):
-                source = item.get("source", "unknown")
-                by_source[source] = by_source.get(source, 0) + 1
-
-        # 按日期统计（最近7天）
-        by_date = {}
-        for item in items.values():
-            if isinstance(item, dict):
-                date = item.get("date", "unknown")
-                by_date[date] = by_date.get(date, 0) + 1
-
-        return {
-            "total": len(items),
-            "by_source": by_source,
-            "by_date": dict(sorted(by_date.items(), reverse=True)[:7])
-        }
+        return self.store.get_stats()
 
 
 if __name__ == "__main__":
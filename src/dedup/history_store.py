@@ -0,0 +1,425 @@
+"""
+历史记录存储后端
+HistoryDedup 通过统一接口读写已发送记录，可选 JSON 文件、SQLite 数据库或追加写日志
+"""
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+# 默认数据目录：项目根目录/data
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+class HistoryStore(ABC):
+    """
+    历史记录存储接口
+
+    每条记录: {"unique_id", "date"(YYYY-MM-DD), "title", "source"}
+    """
+
+    @abstractmethod
+    def contains(self, unique_id: str) -> bool:
+        """是否已记录"""
+
+    def contains_many(self, unique_ids: Iterable[str]) -> set[str]:
+        """批量查询，返回其中已记录的 ID"""
+        return {uid for uid in unique_ids if self.contains(uid)}
+
+    @abstractmethod
+    def add_many(self, records: list[dict]) -> int:
+        """
+        批量写入记录（已存在的 ID 保留原记录）
+
+        Returns:
+            新增的记录数
+        """
+
+    @abstractmethod
+    def cleanup(self, cutoff_date: str) -> int:
+        """
+        删除早于 cutoff_date 的记录
+
+        Returns:
+            删除的记录数
+        """
+
+    @abstractmethod
+    def save(self):
+        """持久化"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """记录总数"""
+
+    @abstractmethod
+    def iter_records(self, since: Optional[str] = None) -> Iterable[dict]:
+        """
+        遍历记录
+
+        Args:
+            since: 只返回 date >= since 的记录（YYYY-MM-DD），None 表示全部
+        """
+
+    def get_stats(self) -> dict:
+        """按来源和日期统计"""
+        by_source = {}
+        by_date = {}
+        for record in self.iter_records():
+            source = record.get("source") or "unknown"
+            date = record.get("date") or "unknown"
+            by_source[source] = by_source.get(source, 0) + 1
+            by_date[date] = by_date.get(date, 0) + 1
+
+        return {
+            "total": len(self),
+            "by_source": by_source,
+            "by_date": dict(sorted(by_date.items(), reverse=True)[:7])
+        }
+
+    def close(self):
+        """释放资源"""
+
+
+class JSONHistoryStore(HistoryStore):
+    """JSON 文件存储（启动时全量加载，保存时全量重写）"""
+
+    def __init__(self, path: str | Path):
+        """
+        初始化
+
+        Args:
+            path: history.json 路径
+        """
+        self.path = Path(path)
+        self._history = self._load()
+
+    def _load(self) -> dict:
+        """加载历史数据"""
+        empty = {"version": 1, "last_updated": None, "sent_items": {}}
+        if not self.path.exists():
+            return empty
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"加载历史数据失败: {e}")
+            return empty
+
+    def contains(self, unique_id: str) -> bool:
+        return unique_id in self._history["sent_items"]
+
+    def add_many(self, records: list[dict]) -> int:
+        sent_items = self._history["sent_items"]
+        added = 0
+        for record in records:
+            if record["unique_id"] in sent_items:
+                continue
+            sent_items[record["unique_id"]] = {
+                "date": record["date"],
+                "title": record["title"],
+                "source": record["source"]
+            }
+            added += 1
+        return added
+
+    def cleanup(self, cutoff_date: str) -> int:
+        sent_items = self._history["sent_items"]
+        old_count = len(sent_items)
+        self._history["sent_items"] = {
+            k: v for k, v in sent_items.items()
+            if isinstance(v, dict) and v.get("date", "2000-01-01") >= cutoff_date
+        }
+        return old_count - len(self._history["sent_items"])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._history["last_updated"] = datetime.now().isoformat()
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._history, f, ensure_ascii=False, indent=2)
+
+    def __len__(self) -> int:
+        return len(self._history["sent_items"])
+
+    def iter_records(self, since: Optional[str] = None) -> Iterable[dict]:
+        for unique_id, value in self._history["sent_items"].items():
+            if isinstance(value, dict) and (since is None or value.get("date", "") >= since):
+                yield {"unique_id": unique_id, **value}
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """
+    SQLite 存储
+
+    unique_id 为主键，date 单独建索引；写入用批量 INSERT OR IGNORE，过期清理直接在 SQL 中完成，
+    启动时不加载任何记录
+    """
+
+    # SQLite 单条语句的参数上限较低，批量查询按此切分
+    QUERY_CHUNK_SIZE = 500
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sent_items (
+            unique_id TEXT PRIMARY KEY,
+            date TEXT NOT NULL,
+            title TEXT,
+            source TEXT
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_sent_items_date ON sent_items(date);
+    """
+
+    def __init__(self, path: str | Path, import_from: Optional[str | Path] = None):
+        """
+        初始化
+
+        Args:
+            path: 数据库文件路径
+            import_from: 数据库为空时从该 history.json 导入旧记录
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(self.SCHEMA)
+
+        if import_from and len(self) == 0:
+            self._import_json(Path(import_from))
+
+    def _import_json(self, json_path: Path):
+        """从 JSON 历史文件导入（只在数据库为空时执行一次）"""
+        if not json_path.exists():
+            return
+
+        imported = self.add_many(list(JSONHistoryStore(json_path).iter_records()))
+        self._conn.commit()
+        if imported:
+            print(f"已从 {json_path.name} 导入 {imported} 条历史记录")
+
+    def contains(self, unique_id: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM sent_items WHERE unique_id = ?", (unique_id,)
+        ).fetchone()
+        return row is not None
+
+    def contains_many(self, unique_ids: Iterable[str]) -> set[str]:
+        unique_ids = list(unique_ids)
+        found = set()
+        for start in range(0, len(unique_ids), self.QUERY_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT unique_id FROM sent_items WHERE unique_id IN ({placeholders})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def add_many(self, records: list[dict]) -> int:
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO sent_items (unique_id, date, title, source) VALUES (?, ?, ?, ?)",
+            [(r["unique_id"], r["date"], r.get("title"), r.get("source")) for r in records]
+        )
+        return self._conn.total_changes - before
+
+    def cleanup(self, cutoff_date: str) -> int:
+        cursor = self._conn.execute("DELETE FROM sent_items WHERE date < ?", (cutoff_date,))
+        return cursor.rowcount
+
+    def save(self):
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM sent_items").fetchone()[0]
+
+    def iter_records(self, since: Optional[str] = None) -> Iterable[dict]:
+        rows = self._conn.execute(
+            "SELECT unique_id, date, title, source FROM sent_items WHERE date >= ?", (since or "",)
+        )
+        for unique_id, date, title, source in rows:
+            yield {"unique_id": unique_id, "date": date, "title": title, "source": source}
+
+    def get_stats(self) -> dict:
+        by_source = dict(self._conn.execute(
+            "SELECT COALESCE(source, 'unknown'), COUNT(*) FROM sent_items GROUP BY 1"
+        ).fetchall())
+        by_date = dict(self._conn.execute(
+            "SELECT date, COUNT(*) FROM sent_items GROUP BY date ORDER BY date DESC LIMIT 7"
+        ).fetchall())
+        return {"total": len(self), "by_source": by_source, "by_date": by_date}
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class NDJSONHistoryStore(HistoryStore):
+    """
+    追加写日志存储（每行一条 JSON 记录）
+
+    每次保存只追加本次新发送的记录，git 提交的 diff 只有新增行；
+    过期记录只在内存中删除，失效行占比超过阈值时才整体重写（压缩）
+    """
+
+    DEFAULT_COMPACT_THRESHOLD = 0.3
+
+    def __init__(
+        self,
+        path: str | Path,
+        import_from: Optional[str | Path] = None,
+        compact_threshold: float = DEFAULT_COMPACT_THRESHOLD
+    ):
+        """
+        初始化
+
+        Args:
+            path: 日志文件路径
+            import_from: 日志不存在时从该 history.json 导入旧记录
+            compact_threshold: 失效行（过期、重复、损坏）占比超过该值时压缩
+        """
+        self.path = Path(path)
+        self.compact_threshold = compact_threshold
+
+        self._records: dict[str, dict] = {}
+        self._pending: list[dict] = []   # 尚未写入文件的新记录
+        self._file_lines = 0             # 文件中的行数（含失效行）
+        self._load()
+
+        if import_from and not self.path.exists():
+            json_path = Path(import_from)
+            if json_path.exists():
+                imported = self.add_many(list(JSONHistoryStore(json_path).iter_records()))
+                if imported:
+                    print(f"已从 {json_path.name} 导入 {imported} 条历史记录")
+
+    def _load(self):
+        """逐行读取日志（中断写入导致的损坏行直接跳过，下次压缩时清除）"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._file_lines += 1
+                try:
+                    record = json.loads(line)
+                    self._records.setdefault(record["unique_id"], record)
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def contains(self, unique_id: str) -> bool:
+        return unique_id in self._records
+
+    def add_many(self, records: list[dict]) -> int:
+        added = 0
+        for record in records:
+            if record["unique_id"] in self._records:
+                continue
+            record = {
+                "unique_id": record["unique_id"],
+                "date": record["date"],
+                "title": record.get("title"),
+                "source": record.get("source")
+            }
+            self._records[record["unique_id"]] = record
+            self._pending.append(record)
+            added += 1
+        return added
+
+    def cleanup(self, cutoff_date: str) -> int:
+        expired = [uid for uid, r in self._records.items() if (r.get("date") or "2000-01-01") < cutoff_date]
+        for uid in expired:
+            del self._records[uid]
+        if expired:
+            # 尚未落盘的过期记录不需要再写
+            self._pending = [r for r in self._pending if r["unique_id"] in self._records]
+        return len(expired)
+
+    @property
+    def dead_fraction(self) -> float:
+        """文件中失效行的占比"""
+        if not self._file_lines:
+            return 0.0
+        live_in_file = len(self._records) - len(self._pending)
+        return 1 - live_in_file / self._file_lines
+
+    def save(self):
+        if self.dead_fraction > self.compact_threshold:
+            self.compact()
+            return
+        if not self._pending:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            # 上次运行写到一半中断时文件不以换行结尾，先补换行，避免新记录接在残行后面一起损坏
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write("".join(self._dump(record) for record in self._pending).encode("utf-8"))
+        self._file_lines += len(self._pending)
+        self._pending = []
+
+    def compact(self):
+        """重写日志，只保留当前有效记录（按日期排序）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records = sorted(self._records.values(), key=lambda r: r.get("date") or "")
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(self._dump(record) for record in records)
+        os.replace(tmp_path, self.path)
+
+        print(f"历史日志已压缩: {self._file_lines} 行 -> {len(records)} 行")
+        self._file_lines = len(records)
+        self._pending = []
+
+    @staticmethod
+    def _dump(record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def iter_records(self, since: Optional[str] = None) -> Iterable[dict]:
+        if since is None:
+            return iter(self._records.values())
+        return (r for r in self._records.values() if (r.get("date") or "") >= since)
+
+
+# 后端名 -> (类, 默认文件名)
+HISTORY_BACKENDS = {
+    "json": (JSONHistoryStore, "history.json"),
+    "sqlite": (SQLiteHistoryStore, "history.db"),
+    "ndjson": (NDJSONHistoryStore, "history.ndjson"),
+}
+
+
+def create_history_store(backend: str = "json", path: Optional[str | Path] = None) -> HistoryStore:
+    """
+    创建历史记录存储
+
+    Args:
+        backend: json / sqlite / ndjson
+        path: 存储文件路径，默认 data/ 下的 history.json / history.db / history.ndjson
+
+    Returns:
+        HistoryStore 实例
+    """
+    backend = backend.lower()
+    if backend not in HISTORY_BACKENDS:
+        raise ValueError(f"未知的历史记录后端: {backend}（可选: {', '.join(HISTORY_BACKENDS)}）")
+
+    store_cls, filename = HISTORY_BACKENDS[backend]
+    path = Path(path) if path else DEFAULT_DATA_DIR / filename
+
+    if store_cls is JSONHistoryStore:
+        return store_cls(path)
+    # 从 JSON 后端迁移：新存储为空时自动导入同目录下的 history.json
+    return store_cls(path, import_from=path.parent / "history.json")
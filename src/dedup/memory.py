@@ -8,52 +8,86 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from typing import Optional
+
 from models import NewsItem
+from dedup.near_duplicate import EXACT_IDENTITY_SOURCES, NearDuplicateIndex, Signature, normalize_text
 
 
 class MemoryDedup:
     """内存去重器"""
 
-    def __init__(self):
+    def __init__(self, near_duplicate: Optional[NearDuplicateIndex] = None):
+        """
+        初始化
+
+        Args:
+            near_duplicate: 近似重复索引（标题 + 描述相似度），None 时只做精确匹配
+        """
         self._seen_ids: set[str] = set()
-        self._seen_urls: set[str] = set()
         self._seen_titles: set[str] = set()
+        self.near_duplicate = near_duplicate
+        self.near_duplicate_count = 0
 
-    def is_duplicate(self, item: NewsItem) -> bool:
+    def is_duplicate(self, item: NewsItem, signatures: Optional[list[Signature]] = None) -> bool:
         """
         检查是否重复
 
         Args:
             item: 要检查的新闻项
+            signatures: 预先计算的 MinHash 签名（避免与 mark_seen 重复计算）
 
         Returns:
             True 如果是重复的
         """
-        # 精确匹配：URL hash
+        # 精确匹配：规范化 URL 的哈希（已覆盖 http/https、www.、锚点、追踪参数等变体）
         if item.unique_id in self._seen_ids:
             return True
 
-        # URL 匹配
-        normalized_url = self._normalize_url(item.url)
-        if normalized_url in self._seen_urls:
-            return True
-
         # 标题模糊匹配
         normalized_title = self._normalize_title(item.title)
         if normalized_title and normalized_title in self._seen_titles:
             return True
 
+        # 近似匹配：同一内容在不同来源的改写标题
+        if self.near_duplicate is not None:
+            if signatures is None:
+                signatures = self.signatures_of(item)
+            if any(self.near_duplicate.query(sig) for sig in signatures):
+                self.near_duplicate_count += 1
+                return True
+
         return False
 
-    def mark_seen(self, item: NewsItem):
+    def mark_seen(self, item: NewsItem, signatures: Optional[list[Signature]] = None):
         """标记为已处理"""
         self._seen_ids.add(item.unique_id)
-        self._seen_urls.add(self._normalize_url(item.url))
 
         normalized_title = self._normalize_title(item.title)
         if normalized_title:
             self._seen_titles.add(normalized_title)
 
+        if self.near_duplicate is not None:
+            if signatures is None:
+                signatures = self.signatures_of(item)
+            for kind, sig in enumerate(signatures):
+                self.near_duplicate.add((item.unique_id, kind), sig)
+
+    def signatures_of(self, item: NewsItem) -> list[Signature]:
+        """
+        条目的 MinHash 签名：只含标题的一份，有描述时再加一份标题 + 描述开头
+
+        不同来源的描述差异很大（HN 通常没有描述），只看标题+描述会漏掉改写标题的同一内容；
+        EXACT_IDENTITY_SOURCES 中的来源没有签名（只按 URL 精确去重）
+        """
+        if item.source.value in EXACT_IDENTITY_SOURCES:
+            return []
+        index = self.near_duplicate
+        signatures = [index.signature(normalize_text(item.title))]
+        if item.description:
+            signatures.append(index.signature(normalize_text(item.title, item.description)))
+        return [sig for sig in signatures if sig is not None]
+
     def filter_duplicates(self, items: list[NewsItem]) -> list[NewsItem]:
         """
         过滤重复项
@@ -66,21 +100,12 @@ class MemoryDedup:
         """
         unique_items = []
         for item in items:
-            if not self.is_duplicate(item):
-                self.mark_seen(item)
+            signatures = self.signatures_of(item) if self.near_duplicate is not None else None
+            if not self.is_duplicate(item, signatures):
+                self.mark_seen(item, signatures)
                 unique_items.append(item)
         return unique_items
 
-    def _normalize_url(self, url: str) -> str:
-        """URL 标准化"""
-        url = url.lower().strip()
-        # 移除常见的追踪参数
-        for suffix in ['?ref=', '?utm_', '&ref=', '&utm_']:
-            if suffix in url:
-                url = url.split(suffix)[0]
-        # 移除末尾斜杠
-        return url.rstrip('/')
-
     def _normalize_title(self, title: str) -> str:
         """标题标准化（用于模糊去重）"""
         if not title:
@@ -96,8 +121,9 @@ class MemoryDedup:
     def reset(self):
         """重置状态"""
         self._seen_ids.clear()
-        self._seen_urls.clear()
         self._seen_titles.clear()
+        if self.near_duplicate is not None:
+            self.near_duplicate.clear()
 
     @property
     def seen_count(self) -> int:
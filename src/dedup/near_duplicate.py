@@ -0,0 +1,208 @@
+"""
+近似重复检测
+MinHash 签名 + LSH 分桶：同一个故事经 HN / Dev.to / Product Hunt 以不同标题和链接出现时，
+按标题（+ 描述开头）的字符 shingle 相似度识别；查询只比较同桶候选，不随已见条目数线性增长
+"""
+
+import re
+from typing import Hashable, NamedTuple, Optional
+
+# 签名前移除的常见前缀（与 MemoryDedup._normalize_title 一致）
+_TITLE_PREFIXES = ("show hn:", "ask hn:", "tell hn:", "launch hn:", "[p]", "[d]")
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_NUMBER = re.compile(r"\d+")
+
+_MASK64 = (1 << 64) - 1
+_MAX_HASH = (1 << 32) - 1
+_DENSIFY_OFFSET = 1 << 32          # 借来的值都大于任何真实值
+_EMPTY = 1 << 63
+
+# 以 URL 为身份的来源（SourceType 的值）：只做精确去重，不参与近似比较。
+# GitHub 仓库标题只有 "owner / repo"，microsoft / typescript-go 与 microsoft / typescript 相似度很高却是不同项目
+EXACT_IDENTITY_SOURCES = frozenset({"github"})
+
+
+def normalize_text(title: str, description: Optional[str] = None, description_chars: int = 160) -> str:
+    """
+    构造签名文本：小写标题（去掉 Show HN 等前缀）+ 截断的描述，标点统一为空格
+
+    Args:
+        title: 标题
+        description: 描述（可选）
+        description_chars: 描述最多取的字符数
+    """
+    title = (title or "").lower().strip()
+    for prefix in _TITLE_PREFIXES:
+        if title.startswith(prefix):
+            title = title[len(prefix):].strip()
+
+    text = title
+    if description:
+        text = f"{title} {description[:description_chars].lower()}"
+    return _NON_WORD.sub(" ", text).strip()
+
+
+class Signature(NamedTuple):
+    """条目签名"""
+    minhash: tuple[int, ...]
+    numbers: frozenset   # 文本中的数字（版本号等），不同则不视为重复
+
+
+class NearDuplicateIndex:
+    """MinHash LSH 近似重复索引"""
+
+    DEFAULT_THRESHOLD = 0.7
+    DEFAULT_NUM_PERM = 64
+    SHINGLE_SIZE = 3   # 字符 3-gram（对中英文都适用）
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM
+    ):
+        """
+        初始化
+
+        Args:
+            threshold: Jaccard 相似度阈值（估计值 >= 阈值视为重复）
+            num_perm: MinHash 签名长度（越长越准，桶越稀疏）
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        self._signatures: dict[Hashable, Signature] = {}
+        self._buckets: list[dict[tuple, list]] = [{} for _ in range(self.bands)]
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+        """
+        选择分桶参数 (bands, rows)
+
+        LSH 的 S 曲线拐点约为 (1/b)^(1/r)；取拐点不高于阈值的最大者，
+        漏检少，多出的候选由签名比较过滤
+        """
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            if (1 / bands) ** (1 / rows) <= threshold:
+                best = (bands, rows)
+        return best
+
+    def signature(self, text: str) -> Optional[Signature]:
+        """
+        计算 MinHash 签名，空文本返回 None
+
+        使用单次哈希 MinHash（one permutation hashing）：每个 shingle 只哈希一次，
+        按哈希值分到 num_perm 个桶中各取最小值，空桶按旋转规则从右侧最近的非空桶借值；
+        与 num_perm 个独立哈希函数相比估计精度接近，但计算量与 shingle 数成正比
+        """
+        if not text:
+            return None
+
+        size = self.SHINGLE_SIZE
+        if len(text) < size:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+
+        k = self.num_perm
+        sig = [_EMPTY] * k
+        # 进程内使用，内置 hash 足够（不持久化）
+        for shingle in shingles:
+            h = hash(shingle) & _MASK64
+            bin_index = h % k
+            value = (h // k) & _MAX_HASH
+            if value < sig[bin_index]:
+                sig[bin_index] = value
+
+        # 旋转填充空桶（距离 t 的借值加上 t * 偏移，避免不同空桶取到同一个值）
+        for i in range(k):
+            if sig[i] != _EMPTY:
+                continue
+            for t in range(1, k):
+                value = sig[(i + t) % k]
+                if value != _EMPTY and value <= _MAX_HASH:
+                    sig[i] = value + t * _DENSIFY_OFFSET
+                    break
+        return Signature(tuple(sig), frozenset(_NUMBER.findall(text)))
+
+    def similarity(self, sig_a: Signature, sig_b: Signature) -> float:
+        """估计 Jaccard 相似度"""
+        return sum(x == y for x, y in zip(sig_a.minhash, sig_b.minhash)) / self.num_perm
+
+    def add(self, key: Hashable, signature: Optional[Signature]):
+        """
+        加入索引
+
+        Args:
+            key: 条目标识（如 unique_id）
+            signature: signature() 的结果（None 时忽略）
+        """
+        if signature is None or key in self._signatures:
+            return
+
+        self._signatures[key] = signature
+        for band, bucket in enumerate(self._bucket_keys(signature)):
+            self._buckets[band].setdefault(bucket, []).append(key)
+
+    def query(self, signature: Optional[Signature]) -> Optional[tuple[Hashable, float]]:
+        """
+        查找最相似的已索引条目
+
+        "Rust 1.80 released" 与 "Rust 1.81 released" 字符相似度很高，
+        所以两边都含数字且数字不同时不算重复
+
+        Returns:
+            (key, 相似度)，没有达到阈值的条目时返回 None
+        """
+        if signature is None:
+            return None
+
+        candidates = set()
+        for band, bucket in enumerate(self._bucket_keys(signature)):
+            candidates.update(self._buckets[band].get(bucket, ()))
+
+        best = None
+        for key in candidates:
+            other = self._signatures[key]
+            if signature.numbers and other.numbers and signature.numbers != other.numbers:
+                continue
+            score = self.similarity(signature, other)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def _bucket_keys(self, signature: Signature) -> list[tuple]:
+        """每个 band 的桶键"""
+        rows = self.rows
+        minhash = signature.minhash
+        return [minhash[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    def clear(self):
+        """清空索引"""
+        self._signatures.clear()
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+
+if __name__ == "__main__":
+    # 测试
+    index = NearDuplicateIndex()
+    index.add("hn", index.signature(normalize_text("Show HN: Zed – a high-performance, multiplayer code editor")))
+    index.add("other", index.signature(normalize_text("Rust 1.80 released")))
+
+    for title in [
+        "Zed: A high-performance multiplayer code editor",
+        "Zed, a high performance, multiplayer code editor from the creators of Atom",
+        "Python 3.13 released",
+    ]:
+        print(f"{title} -> {index.query(index.signature(normalize_text(title)))}")
+    print(f"bands={index.bands}, rows={index.rows}")
@@ -3,6 +3,7 @@ Tech Digest Daily - 主程序
 多源技术资讯聚合 + AI 智能总结
 """
 
+import asyncio
 import os
 import sys
 from datetime import datetime
@@ -19,20 +20,33 @@ from sources.devto import DevToSource
 
 # 去重
 from dedup.memory import MemoryDedup
+from dedup.near_duplicate import NearDuplicateIndex
 from dedup.history import HistoryDedup
 
 # AI 总结
 from ai.summarizer import generate_ai_summary
+from ai.llm_client import save_llm_cache
 
 # 深度信息获取
-from sources.depth_fetcher import enrich_results
+from sources.depth_fetcher import enrich_results, enrich_results_async
 
 # 邮件发送
 from email_sender import send_digest_email
 
+# 翻译缓存 / GitHub 条件请求缓存与限额调度
+from translator import save_translation_cache
+from core.http_cache import save_http_cache
+from core.rate_limit import github_rate_limiter
+
+# 抓取结果快照
+from snapshot import write_snapshot
+
 # 日志系统
 from core.logger import logger
 
+# 异步抓取引擎
+from core.async_engine import AsyncFetchEngine
+
 
 def get_config() -> dict:
     """获取配置"""
@@ -59,12 +73,27 @@ def get_config() -> dict:
 
         # 去重开关
         "enable_history_dedup": os.environ.get("ENABLE_HISTORY_DEDUP", "true").lower() == "true",
+        "history_backend": os.environ.get("HISTORY_BACKEND", "json").lower(),
+        "history_retention_days": int(os.environ.get("HISTORY_RETENTION_DAYS", "30")),
+        # 近似重复阈值（MinHash 相似度，0 表示关闭）
+        "near_dedup_threshold": float(os.environ.get("NEAR_DEDUP_THRESHOLD", "0.7")),
+        "history_bloom_fp_rate": (
+            float(os.environ.get("HISTORY_BLOOM_FP_RATE", "0.01"))
+            if os.environ.get("HISTORY_BLOOM", "false").lower() == "true" else None
+        ),
+
+        # 抓取引擎 (threads/async) 与异步引擎全局并发上限
+        "fetch_engine": os.environ.get("FETCH_ENGINE", "threads").lower(),
+        "max_concurrency": int(os.environ.get("MAX_CONCURRENCY", "16")),
+
+        # 抓取结果快照（data/snapshots/<日期>.zip）
+        "enable_snapshot": os.environ.get("ENABLE_SNAPSHOT", "false").lower() == "true",
+        "snapshot_compression": os.environ.get("SNAPSHOT_COMPRESSION", "lzma").lower(),
     }
 
 
-def fetch_all_sources(config: dict) -> list[SourceResult]:
-    """并发获取所有数据源"""
-    results = []
+def build_sources(config: dict) -> list[tuple]:
+    """根据配置构建数据源列表 [(名称, 数据源, 数量)]"""
     sources = []
 
     if config["enable_github"]:
@@ -75,6 +104,12 @@ def fetch_all_sources(config: dict) -> list[SourceResult]:
         sources.append(("Product Hunt", ProductHuntSource(), config["producthunt_limit"]))
     if config["enable_devto"]:
         sources.append(("Dev.to", DevToSource(), config["devto_limit"]))
+    return sources
+
+
+def fetch_all_sources(sources: list[tuple]) -> list[SourceResult]:
+    """并发获取所有数据源"""
+    results = []
 
     logger.section(f"📡 正在获取 {len(sources)} 个数据源...")
 
@@ -100,15 +135,98 @@ def fetch_all_sources(config: dict) -> list[SourceResult]:
     return results
 
 
+async def fetch_all_sources_async(engine: AsyncFetchEngine, sources: list[tuple]) -> list[SourceResult]:
+    """在异步引擎上获取所有数据源"""
+
+    logger.section(f"📡 正在获取 {len(sources)} 个数据源（异步引擎）...")
+
+    outcomes = await asyncio.gather(
+        *(source.fetch_async(engine, limit) for _, source, limit in sources),
+        return_exceptions=True
+    )
+
+    results = []
+    for (name, _, _), outcome in zip(sources, outcomes):
+        if isinstance(outcome, Exception):
+            logger.source_result(name, False, error=str(outcome))
+            continue
+        results.append(outcome)
+        logger.source_result(
+            name,
+            outcome.success,
+            outcome.count if outcome.success else 0
+        )
+
+    return results
+
+
+def translate_results(results: list[SourceResult], sources: list[tuple]):
+    """
+    翻译阶段：只翻译去重后保留下来的条目
+
+    Args:
+        results: 去重后的结果列表（原地填充翻译）
+        sources: build_sources 返回的数据源列表
+    """
+    source_by_type = {source.source_type: source for _, source, _ in sources}
+
+    translated = 0
+    for result in results:
+        source = source_by_type.get(result.source)
+        if result.success and result.items and source:
+            source.translate_items(result.items)
+            translated += len(result.items)
+
+    save_translation_cache()
+    logger.info(f"🌏 翻译完成: {translated} 条")
+
+
+def enrich_and_translate(results: list[SourceResult], sources: list[tuple], config: dict):
+    """深度信息获取与翻译并行执行（两者修改的是条目的不同字段）"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(enrich_results, results, config["github_token"]): "深度信息获取",
+            executor.submit(translate_results, results, sources): "翻译",
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f"{futures[future]}失败: {e}")
+
+
+async def enrich_and_translate_async(
+    engine: AsyncFetchEngine,
+    results: list[SourceResult],
+    sources: list[tuple],
+    config: dict
+):
+    """在异步引擎上并行执行深度信息获取与翻译"""
+    outcomes = await asyncio.gather(
+        enrich_results_async(engine, results, config["github_token"]),
+        engine.call("translate.googleapis.com", translate_results, results, sources),
+        return_exceptions=True
+    )
+    for stage, outcome in zip(("深度信息获取", "翻译"), outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning(f"{stage}失败: {outcome}")
+
+
 def apply_dedup(results: list[SourceResult], config: dict) -> list[SourceResult]:
     """应用去重逻辑"""
-    # 内存去重（同一封邮件内）
-    memory_dedup = MemoryDedup()
+    # 内存去重（同一封邮件内，跨数据源识别近似重复）
+    near_threshold = config["near_dedup_threshold"] or None
+    memory_dedup = MemoryDedup(NearDuplicateIndex(near_threshold) if near_threshold else None)
 
     # 历史去重
     history_dedup = None
     if config["enable_history_dedup"]:
-        history_dedup = HistoryDedup()
+        history_dedup = HistoryDedup(
+            retention_days=config["history_retention_days"],
+            backend=config["history_backend"],
+            bloom_fp_rate=config["history_bloom_fp_rate"],
+            near_duplicate_threshold=near_threshold
+        )
 
     deduped_results = []
 
@@ -120,7 +238,14 @@ def apply_dedup(results: list[SourceResult], config: dict) -> list[SourceResult]
         items = result.items
 
         # 应用内存去重
+        before_count = len(items)
+        near_before = memory_dedup.near_duplicate_count
         items = memory_dedup.filter_duplicates(items)
+        if memory_dedup.near_duplicate_count > near_before:
+            logger.info(
+                f"🔄 {result.source.value}: 内存去重 {before_count - len(items)} 条"
+                f"（近似重复 {memory_dedup.near_duplicate_count - near_before} 条）"
+            )
 
         # 应用历史去重
         if history_dedup:
@@ -138,6 +263,17 @@ def apply_dedup(results: list[SourceResult], config: dict) -> list[SourceResult]
     return deduped_results, history_dedup
 
 
+def save_snapshot(results: list[SourceResult], config: dict):
+    """保存本次抓取结果的快照（失败不影响发送）"""
+    if not config["enable_snapshot"]:
+        return
+    try:
+        path = write_snapshot(results, compression=config["snapshot_compression"])
+        logger.info(f"💾 快照已保存: {path.name}（{sum(r.count for r in results)} 条）")
+    except Exception as e:
+        logger.warning(f"快照保存失败: {e}")
+
+
 def main():
     """主函数"""
     logger.header(f"Tech Digest Daily - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -154,15 +290,23 @@ def main():
     logger.info(f"👤 GitHub 用户: {config['github_username'] or '未设置'}")
     logger.info(f"🤖 AI 总结: {'启用' if config['enable_ai_summary'] and config['llm_api_key'] else '禁用'}")
 
+    use_async = config["fetch_engine"] == "async"
+    engine = AsyncFetchEngine(max_concurrency=config["max_concurrency"]) if use_async else None
+
     # 获取所有数据源
-    results = fetch_all_sources(config)
+    sources = build_sources(config)
+    if use_async:
+        results = engine.run(lambda: fetch_all_sources_async(engine, sources))
+    else:
+        results = fetch_all_sources(sources)
 
     if not any(r.success for r in results):
         logger.fail("所有数据源获取失败")
         sys.exit(1)
 
-    # 应用去重
+    # 应用去重（快照保存去重前的完整结果）
     logger.section("🔄 正在去重...")
+    fetched_results = results
     results, history_dedup = apply_dedup(results, config)
 
     # 统计
@@ -171,14 +315,19 @@ def main():
 
     if total_items == 0:
         logger.warning("去重后无新内容，跳过发送")
+        save_snapshot(fetched_results, config)
         sys.exit(0)
 
-    # 深度信息获取（进入仓库详情页）
-    logger.section("🔍 正在获取深度信息...")
-    try:
-        enrich_results(results, config["github_token"])
-    except Exception as e:
-        logger.warning(f"深度信息获取失败: {e}")
+    # 深度信息获取（进入仓库详情页）+ 翻译，两者并行
+    logger.section("🔍 正在获取深度信息并翻译...")
+    github_rate_limiter.probe(config["github_token"])
+    if use_async:
+        engine.run(lambda: enrich_and_translate_async(engine, results, sources, config))
+    else:
+        enrich_and_translate(results, sources, config)
+
+    # 深度信息和翻译直接写在条目上，去重前的结果中保留下来的条目同样带有这些字段
+    save_snapshot(fetched_results, config)
 
     # 生成 AI 总结
     ai_summary = None
@@ -196,6 +345,10 @@ def main():
         except Exception as e:
             logger.warning(f"AI 总结生成失败: {e}")
 
+    save_http_cache()
+    save_llm_cache()
+    github_rate_limiter.report()
+
     # 发送邮件
     logger.section("📤 正在发送邮件...")
     success = send_digest_email(results, config["to_email"], ai_summary)
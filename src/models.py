@@ -9,6 +9,8 @@ from datetime import datetime
 from enum import Enum
 import hashlib
 
+from core.url_canonical import canonicalize_url
+
 
 class SourceType(Enum):
     """数据源类型"""
@@ -64,31 +66,126 @@ SOURCE_DISPLAY = {
 }
 
 
-@dataclass
+def _sparse_field(name: str, factory=None, doc: str = ""):
+    """
+    稀疏字段：只有被赋值（或可变默认值被访问）后才在 _sparse 字典中占用空间
+
+    Args:
+        name: 字段名
+        factory: 可变默认值的工厂（list/dict），访问时创建并保存，保证原地修改生效
+        doc: 字段说明
+    """
+    def getter(self):
+        sparse = self._sparse
+        if sparse is not None and name in sparse:
+            return sparse[name]
+        if factory is None:
+            return None
+        value = factory()
+        self._set_sparse(name, value)
+        return value
+
+    def setter(self, value):
+        if value is None:
+            if self._sparse:
+                self._sparse.pop(name, None)
+            return
+        self._set_sparse(name, value)
+
+    return property(getter, setter, doc=doc)
+
+
 class NewsItem:
-    """统一的资讯项数据模型"""
-    # 核心字段
-    source: SourceType          # 数据源
-    title: str                  # 标题
-    url: str                    # 链接
-    description: str            # 英文描述
-
-    # 可选字段
-    description_cn: str = ""    # 中文描述
-    image_url: Optional[str] = None  # 封面图
-    score: Optional[int] = None      # 热度分数（stars/points/votes）
-    comments: Optional[int] = None   # 评论数
-    author: Optional[str] = None     # 作者
-    rank: Optional[int] = None       # 排名
-    created_at: Optional[datetime] = None
+    """
+    统一的资讯项数据模型
+
+    使用 __slots__ 降低单条内存；unique_id 首次访问时计算并缓存，只在 url 被修改时失效；
+    深度信息和 extra 等不常用字段稀疏存储
+    """
+
+    __slots__ = (
+        # 核心字段
+        "source",          # 数据源 SourceType
+        "title",           # 标题
+        "_url",            # 链接（通过 url 属性读写）
+        "description",     # 英文描述
+        # 可选字段
+        "description_cn",  # 中文描述
+        "image_url",       # 封面图
+        "score",           # 热度分数（stars/points/votes）
+        "comments",        # 评论数
+        "author",          # 作者
+        "rank",            # 排名
+        "created_at",
+        # 内部状态
+        "_unique_id",      # 缓存的 unique_id
+        "_sparse",         # 稀疏字段（深度信息、数据源特有字段），未使用时为 None
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        source: SourceType,
+        title: str,
+        url: str,
+        description: str,
+        description_cn: str = "",
+        image_url: Optional[str] = None,
+        score: Optional[int] = None,
+        comments: Optional[int] = None,
+        author: Optional[str] = None,
+        rank: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        readme_summary: Optional[str] = None,
+        tech_stack: Optional[list[str]] = None,
+        recent_activity: Optional[str] = None,
+        extra: Optional[dict] = None
+    ):
+        self.source = source
+        self.title = title
+        self._url = url
+        self._unique_id = None
+        self.description = description
+        self.description_cn = description_cn
+        self.image_url = image_url
+        self.score = score
+        self.comments = comments
+        self.author = author
+        self.rank = rank
+        self.created_at = created_at
+
+        self._sparse = None
+        if readme_summary is not None:
+            self._set_sparse("readme_summary", readme_summary)
+        if tech_stack:
+            self._set_sparse("tech_stack", tech_stack)
+        if recent_activity is not None:
+            self._set_sparse("recent_activity", recent_activity)
+        if extra:
+            self._set_sparse("extra", extra)
+
+    def _set_sparse(self, name: str, value):
+        if self._sparse is None:
+            self._sparse = {}
+        self._sparse[name] = value
+
+    @property
+    def url(self) -> str:
+        """链接"""
+        return self._url
+
+    @url.setter
+    def url(self, value: str):
+        self._url = value
+        self._unique_id = None
 
     # 深度信息（从详情页获取）
-    readme_summary: Optional[str] = None      # README 摘要
-    tech_stack: list[str] = field(default_factory=list)  # 技术栈
-    recent_activity: Optional[str] = None     # 最近活动
+    readme_summary = _sparse_field("readme_summary", doc="README 摘要")
+    tech_stack = _sparse_field("tech_stack", list, doc="技术栈")
+    recent_activity = _sparse_field("recent_activity", doc="最近活动")
 
     # 数据源特有字段
-    extra: dict = field(default_factory=dict)
+    extra = _sparse_field("extra", dict, doc="数据源特有字段")
 
     @property
     def content_type(self) -> ContentType:
@@ -102,9 +199,20 @@ class NewsItem:
 
     @property
     def unique_id(self) -> str:
-        """基于 URL 生成唯一 ID，用于去重"""
+        """基于规范化 URL 生成唯一 ID，用于去重（缓存，url 修改后重新计算）"""
+        uid = self._unique_id
+        if uid is None:
+            uid = self._unique_id = hashlib.md5(canonicalize_url(self._url).encode()).hexdigest()[:16]
+        return uid
+
+    @property
+    def legacy_unique_id(self) -> str:
+        """旧版 ID（原始 URL 的哈希），历史记录过渡期内仍需识别"""
         return hashlib.md5(self.url.encode()).hexdigest()[:16]
 
+    def __repr__(self) -> str:
+        return f"NewsItem(source={self.source!r}, title={self.title!r}, url={self._url!r})"
+
     def __hash__(self):
         return hash(self.unique_id)
 
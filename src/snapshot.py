@@ -0,0 +1,326 @@
+"""
+抓取结果快照
+把每次运行的 SourceResult 列表按列存储为一个 zip 文件，之后可以重新去重、排序或渲染而不必重新抓取
+
+文件结构（每列一个成员，单独压缩，读取时按需解压）:
+    meta.json              版本、行数、各 SourceResult 的来源/状态/条数、列编码
+    columns/<字段名>        列数据，编码见 COLUMNS
+
+列编码:
+    int       int64 小端数组，None 存为 NULL_INT
+    float     float64 小端数组，None 存为 NaN（created_at 存时间戳）
+    text      JSON 字符串数组
+    category  字符串表 + int32 下标数组（-1 表示 None），用于重复值多的列
+    tags      字符串表 + 每行起始偏移 + 下标数组，用于 tech_stack 这样的字符串列表
+    json      JSON 数组（每行一个对象或 null）
+"""
+
+import array
+import json
+import math
+import os
+import struct
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from models import NewsItem, SourceResult, SourceType
+
+
+SNAPSHOT_VERSION = 1
+
+# 默认快照目录：项目根目录/data/snapshots
+DEFAULT_SNAPSHOT_DIR = Path(__file__).parent.parent / "data" / "snapshots"
+
+# 字段 -> 列编码（顺序即写入顺序）
+COLUMNS = {
+    "source": "category",
+    "title": "text",
+    "url": "text",
+    "description": "text",
+    "description_cn": "text",
+    "image_url": "text",
+    "score": "int",
+    "comments": "int",
+    "author": "category",
+    "rank": "int",
+    "created_at": "float",
+    "readme_summary": "text",
+    "tech_stack": "tags",
+    "recent_activity": "text",
+    "extra": "json",
+}
+
+# 构造 NewsItem 必需的列，按列读取时总会加载
+REQUIRED_COLUMNS = ("source", "title", "url", "description")
+
+COMPRESSION = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+DEFAULT_COMPRESSION = "lzma"
+
+NULL_INT = -(1 << 63)
+
+_TABLE_HEADER = struct.Struct("<II")   # 字符串表 JSON 长度，偏移数组长度（category 为 0）
+
+
+def _to_bytes(values: array.array) -> bytes:
+    """数组转小端字节"""
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array.array:
+    """小端字节转数组"""
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _intern(values: Iterable[Optional[str]], table: dict) -> list[int]:
+    """字符串转字符串表下标（None 为 -1）"""
+    return [-1 if v is None else table.setdefault(v, len(table)) for v in values]
+
+
+def _encode_column(kind: str, values: list) -> bytes:
+    """把一列值编码为字节"""
+    if kind == "int":
+        return _to_bytes(array.array("q", (NULL_INT if v is None else int(v) for v in values)))
+
+    if kind == "float":
+        return _to_bytes(array.array("d", (math.nan if v is None else v for v in values)))
+
+    if kind in ("text", "json"):
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    table: dict[str, int] = {}
+    if kind == "category":
+        codes = array.array("i", _intern(values, table))
+        offsets = array.array("I")
+    elif kind == "tags":
+        offsets = array.array("I", [0])
+        codes = array.array("i")
+        for tags in values:
+            codes.extend(_intern(tags or (), table))
+            offsets.append(len(codes))
+    else:
+        raise ValueError(f"未知列编码: {kind}")
+
+    table_bytes = json.dumps(list(table), ensure_ascii=False).encode("utf-8")
+    return b"".join([
+        _TABLE_HEADER.pack(len(table_bytes), len(offsets)),
+        table_bytes,
+        _to_bytes(offsets),
+        _to_bytes(codes),
+    ])
+
+
+def _decode_column(kind: str, data: bytes) -> list:
+    """把字节解码为一列值"""
+    if kind == "int":
+        return [None if v == NULL_INT else v for v in _from_bytes("q", data)]
+
+    if kind == "float":
+        return [None if math.isnan(v) else v for v in _from_bytes("d", data)]
+
+    if kind in ("text", "json"):
+        return json.loads(data.decode("utf-8"))
+
+    table_len, offsets_len = _TABLE_HEADER.unpack_from(data)
+    pos = _TABLE_HEADER.size
+    table = json.loads(data[pos:pos + table_len].decode("utf-8"))
+    pos += table_len
+    offsets = _from_bytes("I", data[pos:pos + offsets_len * 4])
+    codes = _from_bytes("i", data[pos + offsets_len * 4:])
+
+    if kind == "category":
+        return [None if c < 0 else table[c] for c in codes]
+    if kind == "tags":
+        return [[table[c] for c in codes[offsets[i]:offsets[i + 1]]] for i in range(len(offsets) - 1)]
+    raise ValueError(f"未知列编码: {kind}")
+
+
+def _column_values(name: str, items: list[NewsItem]) -> list:
+    """从条目取出一列"""
+    if name == "source":
+        return [item.source.value for item in items]
+    if name == "created_at":
+        return [item.created_at.timestamp() if item.created_at else None for item in items]
+    if name in ("tech_stack", "extra"):
+        return [getattr(item, name) or None for item in items]
+    return [getattr(item, name) for item in items]
+
+
+def write_snapshot(
+    results: list[SourceResult],
+    path: Optional[str | Path] = None,
+    compression: str = DEFAULT_COMPRESSION
+) -> Path:
+    """
+    写入快照
+
+    Args:
+        results: 本次运行的结果列表
+        path: 快照文件路径，默认 data/snapshots/<日期>.zip（同一天多次运行会覆盖）
+        compression: stored/deflate/bzip2/lzma
+
+    Returns:
+        快照文件路径
+    """
+    if compression not in COMPRESSION:
+        raise ValueError(f"未知压缩方式: {compression}（可选: {', '.join(COMPRESSION)}）")
+
+    path = Path(path) if path else DEFAULT_SNAPSHOT_DIR / f"{datetime.now().strftime('%Y-%m-%d')}.zip"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    items = [item for result in results for item in result.items]
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "rows": len(items),
+        "results": [
+            {
+                "source": result.source.value,
+                "success": result.success,
+                "error_message": result.error_message,
+                "count": len(result.items),
+            }
+            for result in results
+        ],
+        "columns": COLUMNS,
+    }
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with zipfile.ZipFile(tmp_path, "w", compression=COMPRESSION[compression]) as zf:
+        zf.writestr("meta.json", json.dumps(meta, ensure_ascii=False, indent=2))
+        for name, kind in COLUMNS.items():
+            zf.writestr(f"columns/{name}", _encode_column(kind, _column_values(name, items)))
+    os.replace(tmp_path, path)
+    return path
+
+
+class Snapshot:
+    """
+    快照读取器
+
+    打开时只读取 meta.json，各列在第一次访问时才解压解码
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        初始化
+
+        Args:
+            path: 快照文件路径
+        """
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self.meta = json.loads(self._zip.read("meta.json"))
+        if self.meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照版本: {self.meta.get('version')}")
+        self._columns: dict[str, list] = {}
+
+    @property
+    def column_names(self) -> list[str]:
+        """快照中的列"""
+        return list(self.meta["columns"])
+
+    def column(self, name: str) -> list:
+        """读取一列（带缓存）"""
+        if name not in self._columns:
+            kind = self.meta["columns"].get(name)
+            if kind is None:
+                raise KeyError(f"快照中没有列: {name}")
+            self._columns[name] = _decode_column(kind, self._zip.read(f"columns/{name}"))
+        return self._columns[name]
+
+    def items(self, columns: Optional[Iterable[str]] = None) -> list[NewsItem]:
+        """
+        还原条目
+
+        Args:
+            columns: 只加载这些列（必需列总会加载），其余字段为默认值；None 表示全部
+        """
+        names = self.column_names if columns is None else list(dict.fromkeys([*REQUIRED_COLUMNS, *columns]))
+        data = {name: self.column(name) for name in names}
+
+        items = []
+        for i in range(len(self)):
+            kwargs = {name: values[i] for name, values in data.items()}
+            kwargs["source"] = SourceType(kwargs["source"])
+            if kwargs.get("created_at") is not None:
+                kwargs["created_at"] = datetime.fromtimestamp(kwargs["created_at"])
+            if kwargs.get("description_cn") is None:
+                kwargs.pop("description_cn", None)
+            items.append(NewsItem(**kwargs))
+        return items
+
+    def results(self, columns: Optional[Iterable[str]] = None) -> list[SourceResult]:
+        """还原为 SourceResult 列表（与写入时的分组和顺序一致）"""
+        items = self.items(columns)
+        results = []
+        pos = 0
+        for entry in self.meta["results"]:
+            results.append(SourceResult(
+                source=SourceType(entry["source"]),
+                items=items[pos:pos + entry["count"]],
+                success=entry["success"],
+                error_message=entry["error_message"],
+            ))
+            pos += entry["count"]
+        return results
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def list_snapshots(directory: str | Path = DEFAULT_SNAPSHOT_DIR) -> list[Path]:
+    """按日期升序列出快照文件"""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return sorted(directory.glob("*.zip"))
+
+
+if __name__ == "__main__":
+    # 查看快照：python snapshot.py [快照路径]，默认最新一个
+    if len(sys.argv) > 1:
+        snapshot_path = Path(sys.argv[1])
+    else:
+        snapshots = list_snapshots()
+        if not snapshots:
+            print(f"{DEFAULT_SNAPSHOT_DIR} 下没有快照")
+            sys.exit(0)
+        snapshot_path = snapshots[-1]
+
+    with Snapshot(snapshot_path) as snapshot:
+        print(f"{snapshot_path}: {len(snapshot)} 条，生成于 {snapshot.meta['created_at']}")
+        for entry in snapshot.meta["results"]:
+            status = "✓" if entry["success"] else f"✗ {entry['error_message']}"
+            print(f"  {entry['source']:<12} {entry['count']:>4} 条 {status}")
+
+        with zipfile.ZipFile(snapshot_path) as zf:
+            for info in zf.infolist():
+                print(f"  {info.filename:<28} {info.file_size:>9} -> {info.compress_size:>8} 字节")
+
+        for result in snapshot.results(columns=["score"]):
+            for item in result.items[:3]:
+                print(f"  [{result.source.value}] {item.title} ({item.score})")
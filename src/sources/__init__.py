@@ -8,7 +8,7 @@ from .github_trending import GitHubTrendingSource
 from .hackernews import HackerNewsSource
 from .producthunt import ProductHuntSource
 from .devto import DevToSource
-from .depth_fetcher import DepthFetcher, enrich_results
+from .depth_fetcher import DepthFetcher, enrich_results, enrich_results_async
 
 __all__ = [
     "BaseSource",
@@ -17,5 +17,6 @@ __all__ = [
     "ProductHuntSource",
     "DevToSource",
     "DepthFetcher",
-    "enrich_results"
+    "enrich_results",
+    "enrich_results_async"
 ]
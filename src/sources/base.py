@@ -7,11 +7,13 @@ from abc import ABC, abstractmethod
 from typing import Optional
 import sys
 import os
+from urllib.parse import urlsplit
 
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceType, SourceResult
+from translator import translate_batch
 
 
 class BaseSource(ABC):
@@ -58,6 +60,41 @@ class BaseSource(ABC):
         """
         pass
 
+    def translate_items(self, items: list[NewsItem]):
+        """
+        批量翻译条目（原地填充 description_cn）
+
+        由 main.py 的翻译阶段在去重之后调用，只翻译最终会发送的条目；
+        所有待翻译文本一次性交给 translate_batch，数据源需要翻译其他字段时重写此方法
+
+        Args:
+            items: 新闻项列表
+        """
+        translated = translate_batch([item.description for item in items])
+        for item, description_cn in zip(items, translated):
+            item.description_cn = description_cn or ""
+
+    async def fetch_async(self, engine, limit: int = 10) -> SourceResult:
+        """
+        异步获取数据（供 AsyncFetchEngine 使用）
+
+        默认把整个 fetch 作为一次阻塞调用交给引擎；
+        需要逐条请求的数据源应重写此方法，把单条请求直接提交给引擎
+
+        Args:
+            engine: AsyncFetchEngine 实例
+            limit: 获取项目数量
+
+        Returns:
+            SourceResult 包含获取结果
+        """
+        return await engine.call(self.host, self.fetch, limit)
+
+    @property
+    def host(self) -> str:
+        """数据源主机名（用于按主机限流）"""
+        return urlsplit(getattr(self, "BASE_URL", "")).hostname or ""
+
     def _create_success_result(self, items: list[NewsItem]) -> SourceResult:
         """创建成功的结果"""
         return SourceResult(
@@ -3,25 +3,47 @@
 进入仓库/文章详情页获取更丰富的信息
 """
 
-import requests
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import base64
 import re
 import os
 
+from core.http_cache import conditional_get
+from core.rate_limit import github_rate_limiter, Priority
+from sources.enrichment_store import EnrichmentStore
+from sources.github_graphql import GitHubGraphQLEnricher
+
 
 class DepthFetcher:
     """深度信息获取器"""
 
     GITHUB_API = "https://api.github.com"
 
-    def __init__(self, github_token: Optional[str] = None):
+    # REST 每个仓库 3 次请求，只处理前 N 个（避免太慢）；GraphQL 默认不限
+    REST_MAX_ITEMS = 10
+
+    # 排名前 N 的条目按 HIGH 优先级申请 API 额度，其余为 LOW（额度紧张时先放弃）
+    HIGH_PRIORITY_ITEMS = 5
+
+    def __init__(
+        self,
+        github_token: Optional[str] = None,
+        backend: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        store: Optional[EnrichmentStore] = None
+    ):
         """
         初始化
 
         Args:
             github_token: GitHub Token（提高 API 限额）
+            backend: auto/graphql/rest，默认读取 DEPTH_BACKEND；auto 时有 Token 用 GraphQL
+            batch_size: GraphQL 每次查询的仓库数，默认读取 DEPTH_BATCH_SIZE
+            max_items: 每个数据源最多处理的条目数，默认读取 DEPTH_MAX_ITEMS
+            store: 深度信息存储，默认按 ENABLE_ENRICHMENT_STORE 创建（关闭时每次全量获取）
         """
         self.github_token = github_token or os.environ.get("GITHUB_TOKEN")
         self.headers = {
@@ -31,39 +53,65 @@ class DepthFetcher:
         if self.github_token:
             self.headers["Authorization"] = f"token {self.github_token}"
 
-    def enrich_github_item(self, item) -> None:
+        backend = (backend or os.environ.get("DEPTH_BACKEND", "auto")).lower()
+        if backend == "auto":
+            backend = "graphql" if self.github_token else "rest"
+        if backend == "graphql" and not self.github_token:
+            print("  ⚠️ GraphQL 需要 GitHub Token，改用 REST")
+            backend = "rest"
+        self.backend = backend
+
+        batch_size = batch_size or int(os.environ.get("DEPTH_BATCH_SIZE", GitHubGraphQLEnricher.DEFAULT_BATCH_SIZE))
+        self._graphql = GitHubGraphQLEnricher(self.github_token, batch_size) if backend == "graphql" else None
+
+        if max_items is None and os.environ.get("DEPTH_MAX_ITEMS"):
+            max_items = int(os.environ["DEPTH_MAX_ITEMS"])
+        if max_items is None and backend == "rest":
+            max_items = self.REST_MAX_ITEMS
+        self.max_items = max_items
+
+        if store is None and os.environ.get("ENABLE_ENRICHMENT_STORE", "true").lower() == "true":
+            store = EnrichmentStore()
+        self.store = store
+
+    def enrich_github_item(
+        self,
+        item,
+        fields: Optional[list[str]] = None,
+        priority: Priority = Priority.HIGH
+    ) -> None:
         """
         丰富 GitHub 项目信息
 
         Args:
             item: NewsItem 对象（会被原地修改）
+            fields: 需要获取的字段，默认为存储中已过期的字段
+            priority: API 额度优先级
         """
         try:
             # 从 URL 提取 owner/repo
-            match = re.match(r'https://github\.com/([^/]+)/([^/]+)', item.url)
-            if not match:
+            repo_key = self._repo_of(item)
+            if not repo_key:
+                return
+
+            owner, repo = repo_key
+            if fields is None:
+                fields = self._stale_fields(item, repo_key)
+            if not fields:
                 return
 
-            owner, repo = match.groups()
+            getters = self._field_getters()
 
             # 并发获取多种信息
             with ThreadPoolExecutor(max_workers=3) as executor:
                 futures = {
-                    executor.submit(self._get_readme_summary, owner, repo): "readme",
-                    executor.submit(self._get_languages, owner, repo): "languages",
-                    executor.submit(self._get_recent_commits, owner, repo): "commits",
+                    executor.submit(getters[field], owner, repo, priority): field
+                    for field in fields
                 }
 
                 for future in as_completed(futures, timeout=10):
-                    key = futures[future]
                     try:
-                        result = future.result()
-                        if key == "readme" and result:
-                            item.readme_summary = result
-                        elif key == "languages" and result:
-                            item.tech_stack = result
-                        elif key == "commits" and result:
-                            item.recent_activity = result
+                        self._set_field(item, repo_key, futures[future], future.result())
                     except Exception:
                         pass
 
@@ -83,15 +131,20 @@ class DepthFetcher:
         if source_type != SourceType.GITHUB:
             return  # 目前只支持 GitHub 深度获取
 
-        print(f"  🔍 正在获取 {len(items)} 个仓库的深度信息...")
+        items_to_enrich = items[:self.max_items] if self.max_items else list(items)
+        print(f"  🔍 正在获取 {len(items_to_enrich)} 个仓库的深度信息 ({self.backend})...")
 
-        # 只处理前 N 个（避免太慢）
-        items_to_enrich = items[:10]
+        # 批次按排名顺序提交，额度不足时丢弃的总是排名靠后的条目
+        if self._graphql:
+            for index, batch in self._batches(items_to_enrich):
+                self._enrich_graphql_batch(batch, self._priority_of(index))
+            print(f"  ✅ 深度信息获取完成 ({len(items_to_enrich)}/{len(items_to_enrich)})")
+            return
 
         with ThreadPoolExecutor(max_workers=5) as executor:
             futures = {
-                executor.submit(self.enrich_github_item, item): item
-                for item in items_to_enrich
+                executor.submit(self.enrich_github_item, item, None, self._priority_of(index)): item
+                for index, item in enumerate(items_to_enrich)
             }
 
             done_count = 0
@@ -101,12 +154,163 @@ class DepthFetcher:
 
         print(f"  ✅ 深度信息获取完成 ({done_count}/{len(items_to_enrich)})")
 
-    def _get_readme_summary(self, owner: str, repo: str) -> Optional[str]:
-        """获取 README 摘要"""
+    async def enrich_items_batch_async(self, engine, items: list, source_type) -> None:
+        """
+        批量丰富项目信息（异步引擎版本）
+
+        每个仓库的三个 API 调用都直接提交给引擎，由 api.github.com 的主机并发上限统一控制
+
+        Args:
+            engine: AsyncFetchEngine 实例
+            items: NewsItem 列表
+            source_type: 数据源类型
+        """
+        from models import SourceType
+
+        if source_type != SourceType.GITHUB:
+            return  # 目前只支持 GitHub 深度获取
+
+        items_to_enrich = items[:self.max_items] if self.max_items else list(items)
+        print(f"  🔍 正在获取 {len(items_to_enrich)} 个仓库的深度信息 ({self.backend})...")
+
+        if self._graphql:
+            await asyncio.gather(*(
+                engine.call(self.GITHUB_API, self._enrich_graphql_batch, batch, self._priority_of(index))
+                for index, batch in self._batches(items_to_enrich)
+            ))
+        else:
+            await asyncio.gather(*(
+                self._enrich_github_item_async(engine, item, self._priority_of(index))
+                for index, item in enumerate(items_to_enrich)
+            ))
+
+        print(f"  ✅ 深度信息获取完成 ({len(items_to_enrich)}/{len(items_to_enrich)})")
+
+    async def _enrich_github_item_async(self, engine, item, priority: Priority) -> None:
+        """异步丰富单个 GitHub 项目信息"""
+        repo_key = self._repo_of(item)
+        if not repo_key:
+            return
+
+        fields = self._stale_fields(item, repo_key)
+        if not fields:
+            return
+
+        owner, repo = repo_key
+        getters = self._field_getters()
+        results = await asyncio.gather(
+            *(engine.call(self.GITHUB_API, getters[field], owner, repo, priority) for field in fields),
+            return_exceptions=True
+        )
+
+        for field, result in zip(fields, results):
+            if not isinstance(result, Exception):
+                self._set_field(item, repo_key, field, result)
+
+    def _enrich_graphql_batch(self, items: list, priority: Priority = Priority.HIGH) -> None:
+        """
+        用一次 GraphQL 查询丰富一批项目，失败时该批次退回 REST
+
+        存储中所有字段都新鲜的仓库不参与查询
+
+        Args:
+            items: NewsItem 列表（会被原地修改）
+            priority: API 额度优先级（GraphQL 额度不足时整批跳过）
+        """
+        repos = {}
+        for item in items:
+            repo_key = self._repo_of(item)
+            stale = self._stale_fields(item, repo_key) if repo_key else []
+            if stale:
+                repos[repo_key] = (item, stale)
+        if not repos:
+            return
+        if not github_rate_limiter.acquire(priority, resource="graphql"):
+            return
+
+        try:
+            results = self._graphql.fetch_repos(list(repos))
+        except Exception as e:
+            # 先归还 GraphQL 预留，REST 回退期间不再占用
+            github_rate_limiter.release("graphql")
+            print(f"  ⚠️ GraphQL 获取失败，改用 REST: {e}")
+            for item, stale in repos.values():
+                self.enrich_github_item(item, stale, priority)
+            return
+        github_rate_limiter.release("graphql")
+
+        # 一次查询已经拿到全部字段，新鲜的字段也顺便刷新
+        for repo_key, (item, _) in repos.items():
+            data = results.get(repo_key)
+            if not data:
+                continue
+
+            self._set_field(item, repo_key, "readme", self._summarize_readme(data["readme"] or ""))
+            self._set_field(item, repo_key, "languages", data["languages"][:5])
+            self._set_field(item, repo_key, "commits", self._format_activity(data["commits"]))
+
+    def _field_getters(self) -> dict:
+        """字段 -> REST 获取方法"""
+        return {
+            "readme": self._get_readme_summary,
+            "languages": self._get_languages,
+            "commits": self._get_recent_commits,
+        }
+
+    def _stale_fields(self, item, repo_key: tuple[str, str]) -> list[str]:
+        """
+        用存储中的新鲜字段填充 item，返回仍需获取的字段
+
+        Args:
+            item: NewsItem 对象（会被原地修改）
+            repo_key: (owner, repo)
+        """
+        if self.store is None:
+            return list(EnrichmentStore.FIELDS)
+
+        key = EnrichmentStore.key_of(*repo_key)
+        stale = self.store.stale_fields(key)
+        fresh = [field for field in EnrichmentStore.FIELDS if field not in stale]
+        if fresh:
+            self.store.apply(key, item, fresh)
+        return stale
+
+    def _set_field(self, item, repo_key: tuple[str, str], field: str, value) -> None:
+        """
+        写入 item 并记入存储
+
+        value 为 None 表示获取失败，忽略；空值表示确认为空，只记入存储（新鲜度窗口内不再重复获取）
+        """
+        if value is None:
+            return
+        if value:
+            setattr(item, EnrichmentStore.FIELDS[field], value)
+        if self.store is not None:
+            self.store.put(EnrichmentStore.key_of(*repo_key), field, value)
+
+    def _batches(self, items: list) -> list[tuple[int, list]]:
+        """按 GraphQL 批大小切分，返回 (起始排名, 批次)"""
+        size = self._graphql.batch_size
+        return [(i, items[i:i + size]) for i in range(0, len(items), size)]
+
+    def _priority_of(self, index: int) -> Priority:
+        """按条目在列表中的位置（即排名）决定额度优先级"""
+        return Priority.HIGH if index < self.HIGH_PRIORITY_ITEMS else Priority.LOW
+
+    @staticmethod
+    def _repo_of(item) -> Optional[tuple[str, str]]:
+        """从 URL 提取 (owner, repo)"""
+        match = re.match(r'https://github\.com/([^/]+)/([^/]+)', item.url)
+        return match.groups() if match else None
+
+    def _get_readme_summary(self, owner: str, repo: str, priority: Priority = Priority.HIGH) -> Optional[str]:
+        """获取 README 摘要（没有 README 时返回空字符串，请求失败返回 None）"""
         url = f"{self.GITHUB_API}/repos/{owner}/{repo}/readme"
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=8)
+            response = conditional_get(url, headers=self.headers, timeout=8, priority=priority)
+            if response.status_code == 404:
+                return ""
             if response.status_code != 200:
                 return None
 
@@ -114,7 +318,7 @@ class DepthFetcher:
             content = data.get("content", "")
 
             if not content:
-                return None
+                return ""
 
             # Base64 解码
             try:
@@ -122,26 +326,29 @@ class DepthFetcher:
             except:
                 return None
 
-            # 提取摘要（取前 500 字符，清理 markdown）
-            summary = self._clean_markdown(readme_text)[:500]
-
-            # 如果太短就不返回
-            if len(summary) < 50:
-                return None
-
-            return summary
+            return self._summarize_readme(readme_text)
 
         except Exception:
             return None
 
-    def _get_languages(self, owner: str, repo: str) -> list[str]:
-        """获取仓库使用的语言"""
+    def _summarize_readme(self, readme_text: str) -> str:
+        """提取 README 摘要（取前 500 字符，清理 markdown），太短返回空字符串"""
+        summary = self._clean_markdown(readme_text)[:500]
+
+        # 如果太短就不返回
+        if len(summary) < 50:
+            return ""
+
+        return summary
+
+    def _get_languages(self, owner: str, repo: str, priority: Priority = Priority.HIGH) -> Optional[list[str]]:
+        """获取仓库使用的语言（请求失败返回 None）"""
         url = f"{self.GITHUB_API}/repos/{owner}/{repo}/languages"
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=5)
+            response = conditional_get(url, headers=self.headers, timeout=5, priority=priority)
             if response.status_code != 200:
-                return []
+                return None
 
             languages = response.json()
             # 按使用量排序，返回前 5 个
@@ -149,43 +356,62 @@ class DepthFetcher:
             return [lang for lang, _ in sorted_langs[:5]]
 
         except Exception:
-            return []
+            return None
 
-    def _get_recent_commits(self, owner: str, repo: str) -> Optional[str]:
-        """获取最近的提交活动摘要"""
+    def _get_recent_commits(self, owner: str, repo: str, priority: Priority = Priority.HIGH) -> Optional[str]:
+        """获取最近的提交活动摘要（空仓库返回空字符串，请求失败返回 None）"""
         url = f"{self.GITHUB_API}/repos/{owner}/{repo}/commits"
 
         try:
-            response = requests.get(
+            response = conditional_get(
                 url,
                 headers=self.headers,
                 params={"per_page": 5},
-                timeout=5
+                timeout=5,
+                priority=priority
             )
+            if response.status_code == 409:
+                # 空仓库（Git Repository is empty）
+                return ""
             if response.status_code != 200:
                 return None
 
             commits = response.json()
-            if not commits:
-                return None
+            return self._format_activity([
+                {
+                    "message": commit.get("commit", {}).get("message", ""),
+                    "date": commit.get("commit", {}).get("committer", {}).get("date", "")
+                }
+                for commit in commits
+            ])
 
-            # 检查最近更新时间
-            latest_date = commits[0].get("commit", {}).get("committer", {}).get("date", "")
+        except Exception:
+            return None
 
-            # 获取最近几条 commit message
-            messages = []
-            for commit in commits[:3]:
-                msg = commit.get("commit", {}).get("message", "").split("\n")[0][:50]
-                if msg:
-                    messages.append(msg)
+    def _format_activity(self, commits: list[dict]) -> str:
+        """
+        生成最近活动摘要（没有提交时返回空字符串）
 
-            if messages:
-                return f"最近更新: {latest_date[:10]} | " + " / ".join(messages)
+        Args:
+            commits: 按时间倒序的 [{"message", "date"}]
+        """
+        if not commits:
+            return ""
 
-            return None
+        # 检查最近更新时间
+        latest_date = commits[0].get("date", "")
 
-        except Exception:
-            return None
+        # 获取最近几条 commit message
+        messages = []
+        for commit in commits[:3]:
+            msg = commit.get("message", "").split("\n")[0][:50]
+            if msg:
+                messages.append(msg)
+
+        if messages:
+            return f"最近更新: {latest_date[:10]} | " + " / ".join(messages)
+
+        return ""
 
     def _clean_markdown(self, text: str) -> str:
         """清理 Markdown 格式，提取纯文本"""
@@ -226,6 +452,38 @@ def enrich_results(results: list, github_token: Optional[str] = None) -> None:
         if result.success and result.items:
             fetcher.enrich_items_batch(result.items, result.source)
 
+    _save_store(fetcher)
+
+
+async def enrich_results_async(engine, results: list, github_token: Optional[str] = None) -> None:
+    """
+    丰富所有数据源结果的深度信息（异步引擎版本）
+
+    Args:
+        engine: AsyncFetchEngine 实例
+        results: SourceResult 列表
+        github_token: GitHub Token
+    """
+    fetcher = DepthFetcher(github_token)
+
+    await asyncio.gather(*(
+        fetcher.enrich_items_batch_async(engine, result.items, result.source)
+        for result in results
+        if result.success and result.items
+    ))
+
+    _save_store(fetcher)
+
+
+def _save_store(fetcher: DepthFetcher) -> None:
+    """保存深度信息存储并打印命中情况"""
+    if fetcher.store is None:
+        return
+
+    fetcher.store.save()
+    stats = fetcher.store.get_stats()
+    print(f"深度信息存储: 复用 {stats['hits']} / 重新获取 {stats['misses']} 个字段，共 {stats['repos']} 个仓库")
+
 
 if __name__ == "__main__":
     # 测试
@@ -3,7 +3,6 @@ Dev.to 数据源
 使用 Dev.to 公开 API 获取热门文章
 """
 
-import requests
 from typing import Optional
 from datetime import datetime
 import sys
@@ -13,7 +12,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceType, SourceResult
 from sources.base import BaseSource
-from translator import translate_to_chinese
+from core.http import http
+from translator import translate_batch
 
 
 class DevToSource(BaseSource):
@@ -68,10 +68,21 @@ class DevToSource(BaseSource):
             "User-Agent": "TechDigest/1.0 (github.com/kkkano/github-trending-daily)"
         }
 
-        response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+        response = http.get(self.BASE_URL, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
 
+    def translate_items(self, items: list[NewsItem]):
+        """批量翻译标题和描述（标题和描述合并成一次批量请求）"""
+        translated = translate_batch(
+            [item.title for item in items] + [item.description for item in items]
+        )
+        titles_cn, descriptions_cn = translated[:len(items)], translated[len(items):]
+
+        for item, title_cn, description_cn in zip(items, titles_cn, descriptions_cn):
+            item.extra["title_cn"] = title_cn
+            item.description_cn = description_cn if item.description else title_cn
+
     def _parse_article(self, article: dict, rank: int) -> Optional[NewsItem]:
         """解析单篇文章"""
         try:
@@ -82,10 +93,6 @@ class DevToSource(BaseSource):
             if not title or not url:
                 return None
 
-            # 翻译标题和描述
-            title_cn = translate_to_chinese(title)
-            description_cn = translate_to_chinese(description) if description else title_cn
-
             # 作者
             user = article.get("user", {})
             author = user.get("name", "") or user.get("username", "")
@@ -114,7 +121,6 @@ class DevToSource(BaseSource):
                 title=title,
                 url=url,
                 description=description,
-                description_cn=description_cn,
                 image_url=cover_image,
                 score=reactions,
                 comments=comments,
@@ -122,7 +128,6 @@ class DevToSource(BaseSource):
                 rank=rank,
                 created_at=created_at,
                 extra={
-                    "title_cn": title_cn,
                     "tags": tags,
                     "reading_time": article.get("reading_time_minutes", 0)
                 }
@@ -138,6 +143,7 @@ if __name__ == "__main__":
     result = source.fetch(limit=5)
 
     if result.success:
+        source.translate_items(result.items)
         print(f"获取到 {result.count} 篇文章")
         for item in result.items:
             print(f"#{item.rank} {item.title}")
@@ -0,0 +1,209 @@
+"""
+仓库深度信息存储
+按 owner/repo 保存已计算好的 README 摘要、语言列表和活动摘要，
+每个字段有独立的新鲜度窗口，过期的字段才重新获取
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.disk_cache import DEFAULT_CACHE_DIR
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class EnrichmentStore:
+    """仓库深度信息存储（JSON 持久化）"""
+
+    VERSION = 1
+
+    # 字段 -> NewsItem 属性
+    FIELDS = {
+        "readme": "readme_summary",
+        "languages": "tech_stack",
+        "commits": "recent_activity",
+    }
+
+    # 各字段的新鲜度窗口（秒）
+    DEFAULT_MAX_AGE = {
+        "readme": 3 * DAY,
+        "languages": 7 * DAY,
+        "commits": 6 * HOUR,
+    }
+
+    # 超过这个时间没有更新的字段在 compact 时删除
+    RETENTION_SECONDS = 30 * DAY
+
+    def __init__(self, path: Optional[str | Path] = None, max_age: Optional[dict[str, float]] = None):
+        """
+        初始化
+
+        Args:
+            path: 存储文件路径，默认 data/cache/enrichment.json
+            max_age: 覆盖部分字段的新鲜度窗口（秒）
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / "enrichment.json"
+        self.max_age = dict(self.DEFAULT_MAX_AGE)
+        if max_age:
+            self.max_age.update(max_age)
+
+        self._repos: dict[str, dict] = self._load()
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict:
+        """加载存储文件"""
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return {}
+            return data.get("repos", {})
+        except Exception as e:
+            print(f"加载深度信息存储失败: {e}")
+            return {}
+
+    @staticmethod
+    def key_of(owner: str, repo: str) -> str:
+        """仓库键（GitHub 仓库名不区分大小写）"""
+        return f"{owner}/{repo}".lower()
+
+    def stale_fields(self, key: str) -> list[str]:
+        """返回需要重新获取的字段"""
+        with self._lock:
+            record = self._repos.get(key, {})
+            now = time.time()
+            stale = [
+                field for field in self.FIELDS
+                if field not in record or now - record[field]["fetched_at"] > self.max_age[field]
+            ]
+            self.hits += len(self.FIELDS) - len(stale)
+            self.misses += len(stale)
+            return stale
+
+    def get(self, key: str, field: str) -> Any:
+        """读取字段值（不检查新鲜度）"""
+        entry = self._repos.get(key, {}).get(field)
+        return entry["value"] if entry else None
+
+    def put(self, key: str, field: str, value: Any):
+        """
+        写入字段值
+
+        Args:
+            key: 仓库键
+            field: readme/languages/commits
+            value: 已计算好的值；空字符串 / 空列表表示确认为空（如没有 README），同样按新鲜度窗口保存，
+                   None 表示获取失败，不写入（下次重新获取）
+        """
+        if value is None:
+            return
+        with self._lock:
+            self._repos.setdefault(key, {})[field] = {"value": value, "fetched_at": time.time()}
+            self._dirty = True
+
+    def apply(self, key: str, item, fields: Optional[list[str]] = None):
+        """把已存储的字段填充到 NewsItem"""
+        for field in fields or self.FIELDS:
+            value = self.get(key, field)
+            if value:
+                setattr(item, self.FIELDS[field], value)
+
+    def compact(self) -> int:
+        """
+        删除超过保留期的字段和已经没有字段的仓库
+
+        Returns:
+            删除的字段数
+        """
+        cutoff = time.time() - self.RETENTION_SECONDS
+        removed = 0
+
+        with self._lock:
+            for key in list(self._repos):
+                record = self._repos[key]
+                for field in [f for f, entry in record.items() if entry["fetched_at"] < cutoff]:
+                    del record[field]
+                    removed += 1
+                if not record:
+                    del self._repos[key]
+
+            if removed:
+                self._dirty = True
+        return removed
+
+    def save(self):
+        """压缩后保存到文件（无改动时跳过）"""
+        with self._lock:
+            self.compact()
+            if not self._dirty:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.VERSION, "repos": self._repos}, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                print(f"保存深度信息存储失败: {e}")
+
+    def get_stats(self) -> dict:
+        """获取统计信息"""
+        now = time.time()
+        fresh = {field: 0 for field in self.FIELDS}
+        for record in self._repos.values():
+            for field, entry in record.items():
+                if now - entry["fetched_at"] <= self.max_age.get(field, 0):
+                    fresh[field] += 1
+
+        return {
+            "repos": len(self._repos),
+            "fresh": fresh,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def describe(self, key: str) -> dict:
+        """查看单个仓库的存储内容及各字段年龄"""
+        now = time.time()
+        return {
+            field: {
+                "age_hours": round((now - entry["fetched_at"]) / HOUR, 1),
+                "fresh": now - entry["fetched_at"] <= self.max_age.get(field, 0),
+                "value": entry["value"],
+            }
+            for field, entry in self._repos.get(key, {}).items()
+        }
+
+
+if __name__ == "__main__":
+    # 查看 / 压缩存储
+    #   python sources/enrichment_store.py               统计信息
+    #   python sources/enrichment_store.py owner/repo    查看单个仓库
+    #   python sources/enrichment_store.py --compact     删除过期数据
+    store = EnrichmentStore()
+    args = sys.argv[1:]
+
+    if args == ["--compact"]:
+        print(f"删除 {store.compact()} 个过期字段")
+        store.save()
+    elif args:
+        print(json.dumps(store.describe(args[0].lower()), ensure_ascii=False, indent=2))
+    else:
+        print(f"统计信息: {store.get_stats()}")
@@ -0,0 +1,143 @@
+"""
+GitHub GraphQL 批量深度信息获取
+一次别名查询取回多个仓库的 README、语言占比和最近提交，代替每仓库 3 次 REST 调用
+"""
+
+from typing import Optional
+
+from core.http import http
+
+
+class GitHubGraphQLError(Exception):
+    """GraphQL 请求失败"""
+
+
+class GitHubGraphQLEnricher:
+    """GitHub GraphQL 批量查询器（需要 Token）"""
+
+    GRAPHQL_URL = "https://api.github.com/graphql"
+    DEFAULT_BATCH_SIZE = 10
+
+    # 按顺序尝试的 README 路径（GraphQL 没有 REST /readme 那样的自动查找）
+    README_PATHS = ("README.md", "readme.md", "Readme.md", "README.rst", "README.markdown", "README")
+
+    def __init__(self, token: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        初始化
+
+        Args:
+            token: GitHub Token（GraphQL API 不支持匿名访问）
+            batch_size: 每次查询的仓库数
+        """
+        if not token:
+            raise ValueError("GraphQL 需要 GitHub Token")
+
+        self.batch_size = max(1, batch_size)
+        self.headers = {
+            "Authorization": f"bearer {token}",
+            "User-Agent": "TechDigest/1.0"
+        }
+
+    def fetch_repos(self, repos: list[tuple[str, str]]) -> dict[tuple[str, str], Optional[dict]]:
+        """
+        批量获取仓库深度信息
+
+        Args:
+            repos: (owner, repo) 列表
+
+        Returns:
+            {(owner, repo): {"readme": str|None, "languages": [str], "commits": [{"message", "date"}]}}
+            仓库不存在或无权限时值为 None
+
+        Raises:
+            GitHubGraphQLError: 请求本身失败
+        """
+        results = {}
+        for start in range(0, len(repos), self.batch_size):
+            batch = repos[start:start + self.batch_size]
+            results.update(self._fetch_batch(batch))
+        return results
+
+    def _fetch_batch(self, batch: list[tuple[str, str]]) -> dict:
+        """单次别名查询"""
+        query, variables = self._build_query(batch)
+
+        response = http.post(
+            self.GRAPHQL_URL,
+            headers=self.headers,
+            json={"query": query, "variables": variables},
+            timeout=20
+        )
+        if response.status_code != 200:
+            raise GitHubGraphQLError(f"HTTP {response.status_code}")
+
+        payload = response.json()
+        data = payload.get("data")
+        if data is None:
+            # 部分仓库找不到时 data 仍然存在，只有整体失败才没有 data
+            errors = payload.get("errors") or [{}]
+            raise GitHubGraphQLError(errors[0].get("message", "未知错误"))
+
+        return {
+            repo: self._parse_repo(data.get(f"r{i}"))
+            for i, repo in enumerate(batch)
+        }
+
+    def _build_query(self, batch: list[tuple[str, str]]) -> tuple[str, dict]:
+        """构建别名查询（仓库名通过变量传入）"""
+        params = []
+        fields = []
+        variables = {}
+
+        for i, (owner, name) in enumerate(batch):
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoDepth }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        readme_fields = "\n".join(
+            f'    readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+            for i, path in enumerate(self.README_PATHS)
+        )
+
+        query = f"""query({", ".join(params)}) {{
+{chr(10).join("  " + line for line in fields)}
+}}
+
+fragment RepoDepth on Repository {{
+    languages(first: 5, orderBy: {{field: SIZE, direction: DESC}}) {{ nodes {{ name }} }}
+    defaultBranchRef {{
+      target {{
+        ... on Commit {{ history(first: 5) {{ nodes {{ messageHeadline committedDate }} }} }}
+      }}
+    }}
+{readme_fields}
+}}"""
+        return query, variables
+
+    def _parse_repo(self, repo: Optional[dict]) -> Optional[dict]:
+        """提取单个仓库的字段"""
+        if not repo:
+            return None
+
+        readme = None
+        for i in range(len(self.README_PATHS)):
+            blob = repo.get(f"readme{i}")
+            if blob and blob.get("text"):
+                readme = blob["text"]
+                break
+
+        languages = [
+            node["name"]
+            for node in (repo.get("languages") or {}).get("nodes") or []
+            if node and node.get("name")
+        ]
+
+        target = (repo.get("defaultBranchRef") or {}).get("target") or {}
+        commits = [
+            {"message": node.get("messageHeadline", ""), "date": node.get("committedDate", "")}
+            for node in (target.get("history") or {}).get("nodes") or []
+            if node
+        ]
+
+        return {"readme": readme, "languages": languages, "commits": commits}
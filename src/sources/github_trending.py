@@ -3,8 +3,7 @@ GitHub Trending 数据源
 爬取 GitHub Trending 页面获取热门项目
 """
 
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import sys
 import os
@@ -13,13 +12,35 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceType, SourceResult
 from sources.base import BaseSource
-from translator import translate_to_chinese
+from sources.trending_parser import parse_trending
+from core.http import http
+from core.html_head import fetch_head_metadata
 
 
 class GitHubTrendingSource(BaseSource):
     """GitHub Trending 数据源"""
 
     BASE_URL = "https://github.com/trending"
+    OG_IMAGE_FALLBACK = "https://opengraph.githubassets.com/1/{repo_path}"
+
+    # og:image 获取模式
+    #   stream: 并发流式读取仓库页，读完 <head> 即断开
+    #   static: 不请求仓库页，直接使用 GitHub 默认社交预览图
+    OG_IMAGE_MODES = ("stream", "static")
+    OG_IMAGE_WORKERS = 8
+    OG_IMAGE_MAX_BYTES = 256 * 1024  # og:image 位于 <head>，读到这里还没有就放弃
+
+    def __init__(self, og_image_mode: Optional[str] = None, parser_backend: str = "auto"):
+        """
+        初始化
+
+        Args:
+            og_image_mode: og:image 获取模式（stream/static），默认读取 GITHUB_OG_IMAGE_MODE
+            parser_backend: 页面解析后端（auto/lxml/bs4），auto 时 lxml 失败回退 bs4
+        """
+        self.parser_backend = parser_backend
+        mode = (og_image_mode or os.environ.get("GITHUB_OG_IMAGE_MODE", "stream")).lower()
+        self.og_image_mode = mode if mode in self.OG_IMAGE_MODES else "stream"
 
     @property
     def source_type(self) -> SourceType:
@@ -54,6 +75,21 @@ class GitHubTrendingSource(BaseSource):
             url = self._build_url(language, since)
             html = self._fetch_page(url)
             items = self._parse_items(html, limit)
+            self._resolve_og_images(items)
+            return self._create_success_result(items)
+        except Exception as e:
+            return self._create_error_result(str(e))
+
+    async def fetch_async(self, engine, limit: int = 15) -> SourceResult:
+        """异步获取 GitHub Trending 项目（og:image 请求直接提交给引擎）"""
+        try:
+            html = await engine.call(self.host, self._fetch_page, self._build_url("", "daily"))
+            items = self._parse_items(html, limit)
+            if self.og_image_mode == "stream":
+                images = await engine.map(self.host, self._get_og_image, [item.url for item in items])
+                for item, image in zip(items, images):
+                    if isinstance(image, str) and image:
+                        item.image_url = image
             return self._create_success_result(items)
         except Exception as e:
             return self._create_error_result(str(e))
@@ -73,79 +109,56 @@ class GitHubTrendingSource(BaseSource):
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         return response.text
 
     def _parse_items(self, html: str, limit: int) -> list[NewsItem]:
         """解析 HTML 提取项目信息"""
-        soup = BeautifulSoup(html, "html.parser")
         items = []
 
-        articles = soup.select("article.Box-row")[:limit]
-
-        for rank, article in enumerate(articles, 1):
+        for entry in parse_trending(html, limit, backend=self.parser_backend):
             try:
-                item = self._parse_article(article, rank)
+                item = self._build_item(entry)
                 if item:
                     items.append(item)
             except Exception as e:
-                print(f"解析项目 {rank} 失败: {e}")
+                print(f"解析项目 {entry['rank']} 失败: {e}")
                 continue
 
         return items
 
-    def _parse_article(self, article, rank: int) -> Optional[NewsItem]:
-        """解析单个项目"""
+    def _build_item(self, entry: dict) -> Optional[NewsItem]:
+        """由解析出的字段构建单个项目"""
         # 项目名称和链接
-        name_elem = article.select_one("h2 a")
-        if not name_elem:
+        repo_path = entry["repo_path"]
+        if not repo_path:
             return None
-
-        repo_path = name_elem.get("href", "").strip("/")
         name = repo_path.replace("/", " / ").strip()
         url = f"https://github.com/{repo_path}"
 
-        # 描述
-        desc_elem = article.select_one("p.col-9")
-        description = desc_elem.get_text(strip=True) if desc_elem else ""
-
-        # 翻译描述
-        description_cn = translate_to_chinese(description) if description else ""
-
-        # 编程语言
-        lang_elem = article.select_one("[itemprop='programmingLanguage']")
-        language = lang_elem.get_text(strip=True) if lang_elem else ""
-
-        # 星标数
-        stars_elem = article.select_one("a[href$='/stargazers']")
-        stars = self._format_number(stars_elem.get_text(strip=True)) if stars_elem else "0"
-
-        # Fork 数
-        forks_elem = article.select_one("a[href$='/forks']")
-        forks = self._format_number(forks_elem.get_text(strip=True)) if forks_elem else "0"
+        # 星标数 / Fork 数
+        stars = self._format_number(entry["stars"]) if entry["stars"] is not None else "0"
+        forks = self._format_number(entry["forks"]) if entry["forks"] is not None else "0"
 
         # 今日新增
-        today_elem = article.select_one("span.d-inline-block.float-sm-right")
         stars_today = ""
-        if today_elem:
-            today_text = today_elem.get_text(strip=True)
-            stars_today = today_text.replace("stars today", "").replace("stars this week", "").replace("stars this month", "").strip()
+        if entry["stars_today"] is not None:
+            stars_today = entry["stars_today"].replace("stars today", "").replace("stars this week", "").replace("stars this month", "").strip()
 
-        # 获取 Open Graph 封面图
-        og_image = self._get_og_image(url)
+        # Open Graph 封面图先用默认预览图，stream 模式下稍后并发解析
+        og_image = self.OG_IMAGE_FALLBACK.format(repo_path=repo_path)
 
         return NewsItem(
             source=self.source_type,
             title=name,
             url=url,
-            description=description,
-            description_cn=description_cn,
+            description=entry["description"] or "",
             image_url=og_image,
             score=self._parse_int(stars),
-            rank=rank,
+            rank=entry["rank"],
             extra={
-                "language": language,
+                "language": entry["language"] or "",
                 "stars": stars,
                 "forks": forks,
                 "stars_today": stars_today
@@ -164,22 +177,36 @@ class GitHubTrendingSource(BaseSource):
         except:
             return 0
 
+    def _resolve_og_images(self, items: list[NewsItem]):
+        """并发获取所有项目的 og:image（static 模式下保留默认预览图）"""
+        if self.og_image_mode != "stream" or not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.OG_IMAGE_WORKERS) as executor:
+            images = list(executor.map(self._get_og_image, [item.url for item in items]))
+
+        for item, image in zip(items, images):
+            if image:
+                item.image_url = image
+
     def _get_og_image(self, repo_url: str) -> str:
-        """获取仓库的 Open Graph 封面图"""
-        try:
-            response = requests.get(repo_url, timeout=10, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1)"
-            })
-            soup = BeautifulSoup(response.text, "html.parser")
-            og_image = soup.select_one('meta[property="og:image"]')
-            if og_image:
-                return og_image.get("content", "")
-        except:
-            pass
+        """
+        获取仓库的 Open Graph 封面图
+
+        只流式读取仓库页的 <head>，读到 og:image 即断开，不下载和解析整页
+        """
+        metadata = fetch_head_metadata(
+            repo_url,
+            max_bytes=self.OG_IMAGE_MAX_BYTES,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1)"},
+            stop_when=lambda m: m.image is not None
+        )
+        if metadata and metadata.image:
+            return metadata.image
 
         # 使用 GitHub 默认的社交预览图
         repo_path = repo_url.replace("https://github.com/", "")
-        return f"https://opengraph.githubassets.com/1/{repo_path}"
+        return self.OG_IMAGE_FALLBACK.format(repo_path=repo_path)
 
 
 if __name__ == "__main__":
@@ -188,6 +215,7 @@ if __name__ == "__main__":
     result = source.fetch(limit=3)
 
     if result.success:
+        source.translate_items(result.items)
         print(f"获取到 {result.count} 个项目")
         for item in result.items:
             print(f"#{item.rank} {item.title}")
@@ -3,7 +3,6 @@ Hacker News 数据源
 使用官方 Firebase API 获取热门文章
 """
 
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 import sys
@@ -13,7 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceType, SourceResult
 from sources.base import BaseSource
-from translator import translate_to_chinese
+from core.http import http
 
 
 class HackerNewsSource(BaseSource):
@@ -54,10 +53,22 @@ class HackerNewsSource(BaseSource):
         except Exception as e:
             return self._create_error_result(str(e))
 
+    async def fetch_async(self, engine, limit: int = 10) -> SourceResult:
+        """异步获取 Hacker News 热门文章（单篇文章直接提交给引擎，不再嵌套线程池）"""
+        try:
+            story_ids = await engine.call(self.host, self._get_top_story_ids, limit * 2)
+            stories = await engine.map(self.host, self._fetch_story, story_ids)
+
+            items = [item for item in stories if isinstance(item, NewsItem)]
+            items.sort(key=lambda x: x.score or 0, reverse=True)
+            return self._create_success_result(items[:limit])
+        except Exception as e:
+            return self._create_error_result(str(e))
+
     def _get_top_story_ids(self, limit: int) -> list[int]:
         """获取热门文章 ID 列表"""
         url = f"{self.BASE_URL}/topstories.json"
-        response = requests.get(url, timeout=10)
+        response = http.get(url, timeout=10)
         response.raise_for_status()
         return response.json()[:limit]
 
@@ -92,7 +103,7 @@ class HackerNewsSource(BaseSource):
         url = f"{self.BASE_URL}/item/{story_id}.json"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = http.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -109,9 +120,6 @@ class HackerNewsSource(BaseSource):
             comments = data.get("descendants", 0)
             author = data.get("by", "")
 
-            # 翻译标题
-            title_cn = translate_to_chinese(title)
-
             # HN 讨论链接
             hn_url = f"https://news.ycombinator.com/item?id={story_id}"
 
@@ -119,8 +127,7 @@ class HackerNewsSource(BaseSource):
                 source=self.source_type,
                 title=title,
                 url=story_url,
-                description=title,  # HN 没有描述，用标题代替
-                description_cn=title_cn,
+                description=title,  # HN 没有描述，用标题代替（翻译阶段批量翻译）
                 score=score,
                 comments=comments,
                 author=author,
@@ -140,6 +147,7 @@ if __name__ == "__main__":
     result = source.fetch(limit=5)
 
     if result.success:
+        source.translate_items(result.items)
         print(f"获取到 {result.count} 篇文章")
         for i, item in enumerate(result.items, 1):
             print(f"{i}. {item.title}")
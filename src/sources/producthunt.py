@@ -3,10 +3,9 @@ Product Hunt 数据源
 使用 RSS Feed 获取每日新品（更稳定）
 """
 
-import requests
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import sys
 import os
 import re
@@ -16,13 +15,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import NewsItem, SourceType, SourceResult
 from sources.base import BaseSource
-from translator import translate_to_chinese
+from core.http import http
 
 
 class ProductHuntSource(BaseSource):
     """Product Hunt 数据源 - 使用 RSS Feed"""
 
     RSS_URL = "https://www.producthunt.com/feed"
+    ATOM_NS = "http://www.w3.org/2005/Atom"
     BASE_URL = "https://www.producthunt.com"
 
     @property
@@ -48,44 +48,51 @@ class ProductHuntSource(BaseSource):
     def fetch(self, limit: int = 8) -> SourceResult:
         """获取 Product Hunt 热门产品"""
         try:
-            entries = self._fetch_rss()
-            items = self._parse_entries(entries, limit)
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            }
+            # 流式读取：凑够 limit 条后关闭连接，剩余的 feed 不再下载
+            with http.get(self.RSS_URL, headers=headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                items = self._parse_entries(self._iter_entries(response.raw), limit)
             return self._create_success_result(items)
         except Exception as e:
             print(f"  ⚠️ Product Hunt 获取失败: {e}")
             return self._create_error_result(str(e))
 
-    def _fetch_rss(self) -> list:
-        """获取 RSS Feed"""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        }
-        response = requests.get(self.RSS_URL, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        # Parse XML
-        root = ET.fromstring(response.text)
-
-        # Atom namespace
-        ns = {'atom': 'http://www.w3.org/2005/Atom'}
-
-        entries = root.findall('atom:entry', ns)
-        return entries
-
-    def _parse_entries(self, entries: list, limit: int) -> list[NewsItem]:
-        """解析 RSS 条目"""
+    def _iter_entries(self, stream) -> Iterator[ET.Element]:
+        """
+        增量解析 Atom Feed，逐个产出 <entry> 元素
+
+        元素在被消费后从根元素上摘除，不会在内存中构建整棵 feed 树
+
+        Args:
+            stream: 文件对象（响应流）
+        """
+        entry_tag = f"{{{self.ATOM_NS}}}entry"
+        events = ET.iterparse(stream, events=("start", "end"))
+        _, root = next(events)
+        for event, elem in events:
+            if event == "end" and elem.tag == entry_tag:
+                yield elem
+                # 只 clear() 的话空元素仍挂在根元素上，根的子节点列表会随 feed 增长
+                root.remove(elem)
+
+    def _parse_entries(self, entries: Iterable, limit: int) -> list[NewsItem]:
+        """解析 RSS 条目（凑够 limit 条新品即停止消费）"""
         items = []
 
         # Atom namespace
-        ns = {'atom': 'http://www.w3.org/2005/Atom'}
+        ns = {'atom': self.ATOM_NS}
 
         # 只获取最近 7 天的产品
         cutoff_date = datetime.now() - timedelta(days=7)
 
-        for rank, entry in enumerate(entries, 1):
-            if len(items) >= limit:
-                break
+        if limit <= 0:
+            return items
 
+        for rank, entry in enumerate(entries, 1):
             try:
                 item = self._parse_entry(entry, ns, rank, cutoff_date)
                 if item:
@@ -94,6 +101,10 @@ class ProductHuntSource(BaseSource):
                 print(f"  解析产品 {rank} 失败: {e}")
                 continue
 
+            # 凑够后立即停止，不再从流中多读一个条目
+            if len(items) >= limit:
+                break
+
         return items
 
     def _parse_entry(self, entry, ns: dict, rank: int, cutoff_date: datetime) -> Optional[NewsItem]:
@@ -126,39 +137,21 @@ class ProductHuntSource(BaseSource):
             except:
                 pass
 
-        # 获取内容/描述
+        # 获取内容/描述和图片（一次解析）
         content_elem = entry.find('atom:content', ns)
-        description = ""
+        description, image_url = "", ""
         if content_elem is not None and content_elem.text:
-            # 解析 HTML 内容
-            soup = BeautifulSoup(content_elem.text, 'html.parser')
-
-            # 获取第一个 p 标签作为描述
-            first_p = soup.find('p')
-            if first_p:
-                description = first_p.get_text(strip=True)
+            description, image_url = self._extract_content(content_elem.text)
 
         # 如果没有描述，用标题
         if not description:
             description = title
 
-        # 翻译描述
-        description_cn = translate_to_chinese(description)
-
-        # 获取图片
-        image_url = ""
-        if content_elem is not None and content_elem.text:
-            soup = BeautifulSoup(content_elem.text, 'html.parser')
-            img = soup.find('img')
-            if img:
-                image_url = img.get('src', '')
-
         return NewsItem(
             source=self.source_type,
             title=title,
             url=url,
             description=description,
-            description_cn=description_cn,
             image_url=image_url,
             score=0,  # RSS 没有投票数
             comments=0,
@@ -168,6 +161,23 @@ class ProductHuntSource(BaseSource):
             }
         )
 
+    def _extract_content(self, content_html: str) -> tuple[str, str]:
+        """
+        从条目 HTML 内容中同时提取描述和图片
+
+        Returns:
+            (第一个 <p> 的文本, 第一个 <img> 的 src)
+        """
+        soup = BeautifulSoup(content_html, 'html.parser')
+
+        first_p = soup.find('p')
+        description = first_p.get_text(strip=True) if first_p else ""
+
+        img = soup.find('img')
+        image_url = img.get('src', '') if img else ""
+
+        return description, image_url
+
 
 if __name__ == "__main__":
     # 测试
@@ -175,6 +185,7 @@ if __name__ == "__main__":
     result = source.fetch(limit=8)
 
     if result.success:
+        source.translate_items(result.items)
         print(f"获取到 {result.count} 个产品")
         for item in result.items:
             print(f"#{item.rank} {item.title}")
@@ -0,0 +1,152 @@
+"""
+GitHub Trending 页面解析
+lxml + 预编译 XPath 的快速路径，页面结构变化导致解析不出结果时回退到 BeautifulSoup
+"""
+
+from typing import Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+
+class TrendingParseError(Exception):
+    """页面结构与预期不符"""
+
+
+def _has_class(name: str) -> str:
+    """XPath 类名精确匹配（等价于 CSS 的 .name）"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def _ends_with_href(suffix: str) -> str:
+    """XPath 1.0 没有 ends-with，用 substring 模拟 CSS 的 [href$=...]"""
+    return (
+        f'substring(@href, string-length(@href) - {len(suffix) - 1}) = "{suffix}"'
+    )
+
+
+# 预编译选择器（与 BeautifulSoup 路径的 CSS 选择器一一对应）
+_ARTICLES = etree.XPath(f'//article[{_has_class("Box-row")}]')
+_NAME_HREF = etree.XPath('(.//h2//a)[1]/@href')
+_DESCRIPTION = etree.XPath(f'(.//p[{_has_class("col-9")}])[1]')
+_LANGUAGE = etree.XPath('(.//*[@itemprop="programmingLanguage"])[1]')
+_STARS = etree.XPath(f'(.//a[{_ends_with_href("/stargazers")}])[1]')
+_FORKS = etree.XPath(f'(.//a[{_ends_with_href("/forks")}])[1]')
+_STARS_TODAY = etree.XPath(
+    f'(.//span[{_has_class("d-inline-block")} and {_has_class("float-sm-right")}])[1]'
+)
+
+
+def parse_trending(html: str, limit: int, backend: str = "auto") -> list[dict]:
+    """
+    解析 Trending 页面
+
+    Args:
+        html: 页面 HTML
+        limit: 最多解析的项目数
+        backend: auto（lxml 优先，失败回退）/ lxml / bs4
+
+    Returns:
+        项目字段字典列表，字段见 _make_entry
+    """
+    if backend == "bs4":
+        return parse_trending_bs4(html, limit)
+    if backend == "lxml":
+        return parse_trending_lxml(html, limit)
+
+    try:
+        return parse_trending_lxml(html, limit)
+    except TrendingParseError as e:
+        print(f"lxml 解析失败，回退到 html.parser: {e}")
+        return parse_trending_bs4(html, limit)
+
+
+def parse_trending_lxml(html: str, limit: int) -> list[dict]:
+    """
+    lxml 快速路径
+
+    Raises:
+        TrendingParseError: 找不到项目列表或项目缺少名称链接
+    """
+    try:
+        tree = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        raise TrendingParseError(str(e))
+
+    articles = _ARTICLES(tree)[:limit]
+    if not articles:
+        raise TrendingParseError("未找到 article.Box-row")
+
+    entries = []
+    for rank, article in enumerate(articles, 1):
+        hrefs = _NAME_HREF(article)
+        if not hrefs:
+            raise TrendingParseError(f"项目 {rank} 缺少 h2 a")
+
+        entries.append(_make_entry(
+            rank=rank,
+            href=hrefs[0],
+            description=_first_text(_DESCRIPTION(article)),
+            language=_first_text(_LANGUAGE(article)),
+            stars=_first_text(_STARS(article)),
+            forks=_first_text(_FORKS(article)),
+            stars_today=_first_text(_STARS_TODAY(article)),
+        ))
+
+    return entries
+
+
+def parse_trending_bs4(html: str, limit: int) -> list[dict]:
+    """BeautifulSoup 兼容路径（原实现）"""
+    soup = BeautifulSoup(html, "html.parser")
+    entries = []
+
+    for rank, article in enumerate(soup.select("article.Box-row")[:limit], 1):
+        name_elem = article.select_one("h2 a")
+        if not name_elem:
+            continue
+
+        entries.append(_make_entry(
+            rank=rank,
+            href=name_elem.get("href", ""),
+            description=_bs4_text(article.select_one("p.col-9")),
+            language=_bs4_text(article.select_one("[itemprop='programmingLanguage']")),
+            stars=_bs4_text(article.select_one("a[href$='/stargazers']")),
+            forks=_bs4_text(article.select_one("a[href$='/forks']")),
+            stars_today=_bs4_text(article.select_one("span.d-inline-block.float-sm-right")),
+        ))
+
+    return entries
+
+
+def _make_entry(
+    rank: int,
+    href: str,
+    description: Optional[str],
+    language: Optional[str],
+    stars: Optional[str],
+    forks: Optional[str],
+    stars_today: Optional[str]
+) -> dict:
+    """统一两种路径的输出（缺失字段为 None，文本与 get_text(strip=True) 一致）"""
+    return {
+        "rank": rank,
+        "repo_path": href.strip("/"),
+        "description": description,
+        "language": language,
+        "stars": stars,
+        "forks": forks,
+        "stars_today": stars_today,
+    }
+
+
+def _first_text(elements: list) -> Optional[str]:
+    """取第一个元素的文本（各文本节点去空白后拼接）"""
+    if not elements:
+        return None
+    return "".join(part.strip() for part in elements[0].itertext())
+
+
+def _bs4_text(element) -> Optional[str]:
+    """BeautifulSoup 元素文本"""
+    return element.get_text(strip=True) if element else None
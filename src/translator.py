@@ -3,18 +3,66 @@
 使用 Google Translate 免费 API 将文本翻译为中文
 """
 
-import requests
 from typing import Optional
+import hashlib
+import os
 import time
+from urllib.parse import quote
 
+from core.http import http
+from core.disk_cache import DiskCache, DEFAULT_CACHE_DIR
 
-def translate_to_chinese(text: str, max_retries: int = 3) -> str:
+
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+TARGET_LANGUAGE = "zh-CN"
+
+# 批量翻译：多段文本用换行拼接成一次请求（单段内的换行会先折叠成空格）
+SEGMENT_DELIMITER = "\n"
+# 单次请求的原文上限（按 URL 编码后的长度计算，避免 GET 请求过长）
+MAX_REQUEST_CHARS = 3000
+
+# 翻译缓存：仓库描述等文本每天重复出现，缓存 30 天
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+CACHE_MAX_ENTRIES = 20000
+
+_cache: Optional[DiskCache] = None
+
+
+def get_translation_cache() -> Optional[DiskCache]:
+    """获取全局翻译缓存（ENABLE_TRANSLATION_CACHE=false 时返回 None）"""
+    global _cache
+    if os.environ.get("ENABLE_TRANSLATION_CACHE", "true").lower() != "true":
+        return None
+    if _cache is None:
+        _cache = DiskCache(
+            DEFAULT_CACHE_DIR / "translations.json",
+            ttl_seconds=CACHE_TTL_SECONDS,
+            max_entries=CACHE_MAX_ENTRIES
+        )
+    return _cache
+
+
+def save_translation_cache():
+    """保存翻译缓存到磁盘"""
+    if _cache is not None:
+        _cache.save()
+        stats = _cache.get_stats()
+        print(f"翻译缓存: 命中 {stats['hits']} / 未命中 {stats['misses']}，共 {stats['entries']} 条")
+
+
+def _cache_key(text: str, target: str) -> str:
+    """缓存键：原文哈希 + 目标语言"""
+    return f"{target}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]}"
+
+
+def translate_to_chinese(text: str, max_retries: int = 3, use_cache: bool = True) -> str:
     """
     将文本翻译为中文
 
     Args:
         text: 要翻译的文本
         max_retries: 最大重试次数
+        use_cache: 是否使用翻译缓存
 
     Returns:
         翻译后的中文文本，失败则返回原文
@@ -26,33 +74,59 @@ def translate_to_chinese(text: str, max_retries: int = 3) -> str:
     if _is_chinese(text):
         return text
 
-    url = "https://translate.googleapis.com/translate_a/single"
+    cache = get_translation_cache() if use_cache else None
+    key = _cache_key(text, TARGET_LANGUAGE)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    translated = _request_translation(text, max_retries)
+    if translated is None:
+        return text  # 翻译失败返回原文
+
+    # 只缓存成功的翻译，失败时返回的原文不入缓存
+    if cache is not None:
+        cache.set(key, translated)
+    return translated
+
+
+def _request_translation(text: str, max_retries: int = 3) -> Optional[str]:
+    """
+    调用翻译接口
+
+    Args:
+        text: 要翻译的文本
+        max_retries: 最大重试次数
+
+    Returns:
+        翻译结果，失败返回 None
+    """
     params = {
         "client": "gtx",
         "sl": "auto",  # 自动检测源语言
-        "tl": "zh-CN",  # 目标语言：简体中文
+        "tl": TARGET_LANGUAGE,  # 目标语言：简体中文
         "dt": "t",
         "q": text
     }
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http.get(TRANSLATE_URL, params=params, timeout=10)
             if response.status_code == 200:
                 result = response.json()
                 # 提取翻译结果
                 if result and result[0]:
-                    translated = "".join(
+                    return "".join(
                         part[0] for part in result[0] if part[0]
                     )
-                    return translated
         except Exception as e:
             if attempt < max_retries - 1:
                 time.sleep(0.5 * (attempt + 1))  # 递增延迟
                 continue
             print(f"翻译失败: {e}")
 
-    return text  # 翻译失败返回原文
+    return None
 
 
 def _is_chinese(text: str) -> bool:
@@ -64,23 +138,123 @@ def _is_chinese(text: str) -> bool:
     return chinese_count > len(text) * 0.3
 
 
+def translate_batch(
+    texts: list[str],
+    max_chars: int = MAX_REQUEST_CHARS,
+    use_cache: bool = True
+) -> list[str]:
+    """
+    批量翻译：把多段文本打包成尽量少的请求，再按分隔符拆回
+
+    空文本和中文原样返回；缓存命中的不再请求；重复文本只翻译一次。
+    某个分块返回的段数对不上时，该分块退回逐条翻译。
+
+    Args:
+        texts: 文本列表
+        max_chars: 单次请求的原文上限（URL 编码后）
+        use_cache: 是否使用翻译缓存
+
+    Returns:
+        与输入一一对应的翻译结果，失败的条目返回原文
+    """
+    cache = get_translation_cache() if use_cache else None
+    results = list(texts)
+
+    # 待翻译的去重文本 -> 在 texts 中的位置
+    pending: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        if not text or not text.strip() or _is_chinese(text):
+            continue
+        if cache is not None:
+            cached = cache.get(_cache_key(text, TARGET_LANGUAGE))
+            if cached is not None:
+                results[i] = cached
+                continue
+        pending.setdefault(text, []).append(i)
+
+    if not pending:
+        return results
+
+    sources = list(pending)
+    for chunk in chunk_segments([_normalize_segment(t) for t in sources], max_chars):
+        segments = [_normalize_segment(sources[i]) for i in chunk]
+        translated = _request_translation(SEGMENT_DELIMITER.join(segments))
+        parts = _split_translation(translated, len(segments))
+
+        if parts is None:
+            # 分隔符被翻译接口吞掉或合并，退回逐条翻译
+            parts = [_request_translation(segment) for segment in segments]
+
+        for source_index, part in zip(chunk, parts):
+            if not part:
+                continue
+            text = sources[source_index]
+            for i in pending[text]:
+                results[i] = part
+            if cache is not None:
+                cache.set(_cache_key(text, TARGET_LANGUAGE), part)
+
+    return results
+
+
+def chunk_segments(segments: list[str], max_chars: int = MAX_REQUEST_CHARS) -> list[list[int]]:
+    """
+    按请求大小把文本段分块
+
+    Args:
+        segments: 文本段列表（不含换行）
+        max_chars: 每块的上限（URL 编码后长度，含分隔符）
+
+    Returns:
+        分块列表，每块是 segments 的下标列表；超长的单段独占一块
+    """
+    delimiter_size = len(quote(SEGMENT_DELIMITER))
+    chunks = []
+    current: list[int] = []
+    current_size = 0
+
+    for i, segment in enumerate(segments):
+        size = len(quote(segment))
+        extra = size + (delimiter_size if current else 0)
+        if current and current_size + extra > max_chars:
+            chunks.append(current)
+            current, current_size = [], 0
+            extra = size
+        current.append(i)
+        current_size += extra
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _normalize_segment(text: str) -> str:
+    """折叠段内空白，保证分隔符唯一"""
+    return " ".join(text.split())
+
+
+def _split_translation(translated: Optional[str], expected: int) -> Optional[list[str]]:
+    """按分隔符拆分批量翻译结果，段数不符时返回 None"""
+    if translated is None:
+        return None
+    parts = [part.strip() for part in translated.strip("\n").split(SEGMENT_DELIMITER)]
+    if len(parts) != expected:
+        return None
+    return parts
+
+
 def batch_translate(texts: list[str], delay: float = 0.1) -> list[str]:
     """
-    批量翻译文本
+    批量翻译文本（兼容旧接口，等同于 translate_batch）
 
     Args:
         texts: 文本列表
-        delay: 请求间隔（秒），避免触发频率限制
+        delay: 已废弃，批量请求不再需要逐条间隔
 
     Returns:
         翻译后的文本列表
     """
-    results = []
-    for text in texts:
-        results.append(translate_to_chinese(text))
-        if delay > 0:
-            time.sleep(delay)
-    return results
+    return translate_batch(texts)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,13 @@ GitHub Trending 爬取模块
 """
 
 import requests
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from typing import Optional
 import re
 
+from translator import translate_batch
+from sources.trending_parser import parse_trending
+
 
 @dataclass
 class TrendingRepo:
@@ -47,93 +49,28 @@ def get_trending(language: str = "", since: str = "daily", limit: int = 25) -> l
     response = requests.get(url, headers=headers, timeout=30)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
     repos = []
 
-    articles = soup.select("article.Box-row")[:limit]
-
-    for rank, article in enumerate(articles, 1):
-        # 项目名称和链接
-        h2 = article.select_one("h2 a")
-        if not h2:
-            continue
-
-        repo_path = h2.get("href", "").strip("/")
-        repo_url = f"https://github.com/{repo_path}"
-
-        # 描述
-        desc_elem = article.select_one("p.col-9")
-        description = desc_elem.get_text(strip=True) if desc_elem else ""
-
-        # 编程语言
-        lang_elem = article.select_one("[itemprop='programmingLanguage']")
-        language_name = lang_elem.get_text(strip=True) if lang_elem else None
-
-        # 星标数
-        stars_elem = article.select_one("a[href$='/stargazers']")
-        stars = stars_elem.get_text(strip=True) if stars_elem else "0"
-
-        # Fork 数
-        forks_elem = article.select_one("a[href$='/forks']")
-        forks = forks_elem.get_text(strip=True) if forks_elem else "0"
-
-        # 今日新增星标
-        stars_today_elem = article.select_one("span.d-inline-block.float-sm-right")
-        stars_today = ""
-        if stars_today_elem:
-            stars_today = stars_today_elem.get_text(strip=True)
-
-        # Open Graph 封面图 URL
-        og_image = f"https://opengraph.githubassets.com/1/{repo_path}"
-
-        # 翻译描述为中文
-        description_cn = translate_to_chinese(description)
-
+    for entry in parse_trending(response.text, limit):
+        repo_path = entry["repo_path"]
         repos.append(TrendingRepo(
-            rank=rank,
+            rank=entry["rank"],
             name=repo_path,
-            url=repo_url,
-            description=description,
-            description_cn=description_cn,
-            language=language_name,
-            stars=stars,
-            forks=forks,
-            stars_today=stars_today,
-            og_image=og_image,
+            url=f"https://github.com/{repo_path}",
+            description=entry["description"] or "",
+            description_cn="",
+            language=entry["language"],
+            stars=entry["stars"] or "0",
+            forks=entry["forks"] or "0",
+            stars_today=entry["stars_today"] or "",
+            og_image=f"https://opengraph.githubassets.com/1/{repo_path}",  # Open Graph 封面图 URL
         ))
 
-    return repos
-
+    # 翻译描述为中文（一次批量请求）
+    for repo, description_cn in zip(repos, translate_batch([r.description for r in repos])):
+        repo.description_cn = description_cn
 
-def translate_to_chinese(text: str) -> str:
-    """
-    使用免费翻译 API 将英文翻译为中文
-    使用 Google Translate 免费接口
-    """
-    if not text:
-        return ""
-
-    try:
-        # 使用 Google Translate 免费 API
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": "auto",
-            "tl": "zh-CN",
-            "dt": "t",
-            "q": text
-        }
-
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            result = response.json()
-            if result and result[0]:
-                translated = "".join([item[0] for item in result[0] if item[0]])
-                return translated
-    except Exception:
-        pass
-
-    return text  # 翻译失败返回原文
+    return repos
 
 
 def format_number(num_str: str) -> str: